@@ -3,6 +3,9 @@
 Author Alexander Gilje
 title: Get Area Filled Regions
 Date: 05.06.2025
+
+Shift-klikk: alle plan- og teikningsview med filled regions i prosjektet
+(éin collector for heile dokumentet, éin transaksjon per view i éi TransactionGroup).
 """
 #  _  _      ____  ____  ____  _____ 
 # / \/ \__/|/  __\/  _ \/  __\/__ __\
@@ -10,15 +13,18 @@ Date: 05.06.2025
 # | || |  |||  __/| \_/||    /  | |  
 # \_/\_/  \|\_/   \____/\_/\_\  \_/ IMPORTS
 #----------------------------------STANDARD LIBRARY IMPORTS----------------------------------#
+import os
 
 #---------------------------- AUTODESK REVIT AND PYREVIT IMPORTS ----------------------------#
-from pyrevit import revit, DB
+from pyrevit import revit, forms
 
-from Autodesk.Revit.DB import BuiltInCategory, BuiltInParameter, FilteredElementCollector, StorageType, UnitUtils, UnitTypeId
 from Autodesk.Revit.UI import TaskDialog
 #---------------------------------------CUSTOM IMPORTS---------------------------------------#
 from formsWindow._forms import dialogwindow_TextInput
-from tools._transactions import revit_transaction
+from muaUtils._aggregate import MuaTotals, export_report
+from muaUtils._mua import ALL, SETTINGS, MuaEngine, collect_filled_regions, collect_filled_regions_by_view
+from tools._logger import ScriptLogger
+from tools._sidecar import SidecarCache
 
 #  _     ____  ____  _  ____  ____  _     _____ ____ 
 # / \ |\/  _ \/  __\/ \/  _ \/  __\/ \   /  __// ___\
@@ -30,101 +36,72 @@ doc = revit.doc
 uidoc = revit.uidoc
 view = doc.ActiveView
 
+logger = ScriptLogger(name='SetMUA', log_to_file=True)
+
+REPORT_FILTER = "Excel (*.xlsx)|*.xlsx|CSV (*.csv)|*.csv"
+
 #  _____ _     _      ____  _____  _  ____  _      ____ 
 # /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
 # |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
 # | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
 # \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
 
+def ask_export(result):
+    """Vis summane per kommentar og spør om rapporten skal eksporterast. Returnerer filnamnet eller None."""
+    message = u"{}\n\n{}\n\nEksportere MUA-rapport (per kommentar, etasje og view)?".format(
+        result.summary(), u"\n".join(result.totals.lines()))
+    if not forms.alert(message, title="Success", yes=True, no=True):
+        return None
+    default_name = u"MUA_{}".format(doc.Title or u"")
+    return forms.save_file(file_ext="xlsx", files_filter=REPORT_FILTER, default_name=default_name)
+
 #----------------------------------------MAIN------------------------------------------------#
-def main():
-    filled_regions_in_view = FilteredElementCollector(doc, view.Id).OfCategory(BuiltInCategory.OST_DetailComponents).WhereElementIsNotElementType()
-    
-    if filled_regions_in_view:
-        filled_regions_in_view_length = len(list(filled_regions_in_view))
-        if filled_regions_in_view_length > 1:
-            search_word = dialogwindow_TextInput("MUA", "Skriv inn hele eller deler av ordet fra kommentarfeltet (Comments).\n For eksempel: Skriv 'MUA' for å hente alle med 'MUA' i kommentaren (som 'MUA 1', 'MUA 2'),\n eller skriv 'MUA 1' for å hente kun de med nøyaktig 'MUA 1'. Ved tomt felt blir alle hentet:", "Hva skal du ha arealet av")
-            if not search_word or search_word.lower() == "alle":
-                search_word = "Alle"
-
-            filled_regions = [el for el in filled_regions_in_view if isinstance(el, DB.FilledRegion)]
-
-            length_count = 0
-            area_count = 0
-
-            if search_word == "Alle":
-                for fr in filled_regions:
-                    comments = check_comments(fr)
-                    if not "demo" in comments.lower():
-
-                        areal_param = fr.LookupParameter("Areal")
-                        length_param = fr.LookupParameter("Omkrets")
-
-                        if areal_param and length_param:
-
-                            with revit_transaction(doc,"Sett areal og omkrets"):
-                                areal_param.Set(get_total_area(fr))
-                                length_param.Set(get_total_length(fr))
-                                length_count += 1
-                                area_count += 1
-
-                        elif length_param:    
-                            with revit_transaction(doc,"Sett omkrets"):
-                                length_param.Set(get_total_length(fr))
-                                length_count += 1
-
-                        elif areal_param:
-                            with revit_transaction(doc,"Sett areal"):
-                                areal_param.Set(get_total_area(fr))
-                                area_count += 1
-
-            else:
-                for fr in filled_regions:
-                    comments = check_comments(fr)
-                    if not "demo" in comments.lower() and str(search_word).lower() in comments.lower():
-                        areal_param = fr.LookupParameter("Areal")
-                        length_param = fr.LookupParameter("Omkrets")
-
-                        if areal_param and length_param:
-
-                            with revit_transaction(doc,"Sett areal og omkrets"):
-                                areal_param.Set(get_total_area(fr))
-                                length_param.Set(get_total_length(fr))
-                                length_count += 1
-                                area_count += 1
-
-                        elif length_param:    
-                            with revit_transaction(doc,"Sett omkrets"):
-                                length_param.Set(get_total_length(fr))
-                                length_count += 1
-
-                        elif areal_param:
-                            with revit_transaction(doc,"Sett areal"):
-                                areal_param.Set(get_total_area(fr))
-                                area_count += 1
-
-            TaskDialog.Show("Success","Satt areal på {}, og omkrets på {} filled regions.".format(area_count, length_count))
+def main(project=False):
+    with logger.timed("collect"):
+        if project:
+            groups = collect_filled_regions_by_view(doc)
         else:
-            TaskDialog.Show("Feil","Ingen filled regions i viewet.") 
-    else:
+            filled_regions = collect_filled_regions(doc, view)
+    if project and not groups:
+        TaskDialog.Show("Feil", "Ingen filled regions i plan- eller teikningsview.")
+        return
+    if not project and not filled_regions:
         TaskDialog.Show("Feil","Ingen filled regions i viewet.")
-   
-
-
-def get_total_length(filled_region):
-    total_length = 0.0
-    for loop in filled_region.GetBoundaries():
-        total_length += loop.GetExactLength()
-    return total_length
+        return
+
+    search_word = dialogwindow_TextInput("MUA", "Skriv inn hele eller deler av ordet fra kommentarfeltet (Comments).\n For eksempel: Skriv 'MUA' for å hente alle med 'MUA' i kommentaren (som 'MUA 1', 'MUA 2'),\n eller skriv 'MUA 1' for å hente kun de med nøyaktig 'MUA 1'. Ved tomt felt blir alle hentet:", "Hva skal du ha arealet av")
+    if not search_word or search_word.lower() == ALL.lower():
+        search_word = ALL
+
+    # Areal/omkrets for uendra regionar kjem frå cachen utan GetBoundaries
+    cache = SidecarCache.for_document(doc, "SetMUA_geometry", settings=SETTINGS)
+    totals = MuaTotals(doc)
+    engine = MuaEngine(doc, view, logger, cache, totals=totals)
+    with logger.timed("filter, compute and write"):
+        if project:
+            result = engine.run_project(groups, search_word)
+        else:
+            result = engine.run(filled_regions, search_word)
+
+    if project:
+        logger.count("views", result.views)
+    logger.count("filled regions", result.regions)
+    logger.count("matched", result.matched)
+    logger.count("measured", result.measured)
+    logger.count("from cache", result.cached)
+    logger.emit_summary()
+    if not len(totals):
+        TaskDialog.Show("Success", result.summary())
+        return
+
+    filename = ask_export(result)
+    if filename:
+        with logger.timed("export"):
+            export_report(totals, filename)
+        logger.info(u"MUA-rapport: {}".format(filename))
+        TaskDialog.Show("Success", u"Rapport lagra i {}".format(os.path.dirname(filename)))
 
-def get_total_area(filled_region):
-    area_param = filled_region.get_Parameter(BuiltInParameter.HOST_AREA_COMPUTED)
-    if area_param and area_param.StorageType == StorageType.Double:
-        return UnitUtils.ConvertFromInternalUnits(area_param.AsDouble(), UnitTypeId.SquareMeters)
 
-def check_comments(filled_region):
-    comment = filled_region.get_Parameter(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS)
-    return comment.AsString() if comment else None
 #  _      ____  _  _     
 # / \__/|/  _ \/ \/ \  /|
 # | |\/||| / \|| || |\ ||
@@ -133,4 +110,5 @@ def check_comments(filled_region):
 
 if __name__ == "__main__":
     
-    main()
\ No newline at end of file
+    main(project=globals().get("__shiftclick__", False))
+    logger.close()
\ No newline at end of file
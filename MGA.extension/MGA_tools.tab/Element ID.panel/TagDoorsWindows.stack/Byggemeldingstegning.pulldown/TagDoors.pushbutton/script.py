@@ -1,43 +1,35 @@
-def add_tags(doc, element, views, tag_family, wall_normal, element_type):
+from parameterUtils._bulk_writer import element_id_value
+from tagUtils._batch_tagger import BatchTagger
+
+
+# Éin tagger per (dokument, views): level -> views, synlege element og eksisterande tags per view
+# blir lest éin gong, og nye tags unngår dei som alt er plasserte.
+_taggers = {}
+
+
+def get_tagger(doc, views):
+    key = (doc, tuple(element_id_value(view.Id) for view in views))
+    tagger = _taggers.get(key)
+    if tagger is None:
+        tagger = _taggers[key] = BatchTagger(doc, views)
+    return tagger
+
+
+def add_tags(doc, element, views, tag_family, wall_normal, element_type, tagger=None):
+    """Tag element in every view of its level, right away (inside the caller's transaction).
+
+    Pass the same BatchTagger for all elements of a run, otherwise one is shared per (doc, views).
+    """
     if not tag_family:
         logging.debug("❌Tag family not found")
-        return
-    
-    tag_offset_distance =  4.3
+        return []
     
+    tagger = tagger or get_tagger(doc, views)
+    tagger.add(element, tag_family, wall_normal)
+    tags = tagger.flush()
+    logging.debug("{} tags added for {}".format(len(tags), element_type))
+    return tags
 
-    for view in views:
-        view_name = view.Name.lower()
-        level_name = doc.GetElement(element.LevelId).Name.lower()
-        
-        if elements_visible_in_view(doc, view, element) and level_name in view_name:
-            tag_offset = wall_normal.Multiply(1.2)
-            tag_location = element.Location.Point.Add(tag_offset)
-
-            if view.Id not in placed_tag_positions:
-                placed_tag_positions[view.Id] = []
-
-            
-            for placed_tag in placed_tag_positions[view.Id]:
-                
-                if tag_location.DistanceTo(placed_tag) < tag_offset_distance:
-                    tag_location = tag_location.Add(XYZ(0, -(tag_offset_distance/5), 0))
-            
-            ref = Reference(element)
-            
-            tag =IndependentTag.Create(
-                doc,
-                tag_family.Id,
-                view.Id,
-                ref,
-                False,
-                TagOrientation.Horizontal,
-                tag_location
-
-            )
-            
-            placed_tag_positions[view.Id].append(tag_location)
-            logging.debug("Tag added to {} for {}".format(view_name, element_type))
 
 # Get all tags of a category🏷️
 def get_tags(category):
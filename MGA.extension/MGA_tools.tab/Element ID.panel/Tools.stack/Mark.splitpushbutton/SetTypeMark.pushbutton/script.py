@@ -1,19 +1,83 @@
 # encoding: utf-8
-import os
+"""
+Author Alexander Gilje
+Title: Door/Window Type Mark
+Date: 06.08.2025
 
+Dører og vinduer i éin omgang: éin collector for begge kategoriane,
+éin transaksjon og éin dialog. Reglane er dei same som i DoorID og WindowID
+(markUtils._type_marks).
+"""
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/ IMPORTS
 
-this_dir = os.path.dirname(__file__)
+#---------------------------- AUTODESK REVIT AND PYREVIT IMPORTS ----------------------------#
 
+from Autodesk.Revit.DB import BuiltInCategory
+from Autodesk.Revit.UI import TaskDialog
 
-# Go up one folder (to Mark.splitpushbutton) then into DoorID.pushbutton
-door_script = os.path.abspath(os.path.join(this_dir, '..', 'DoorID.pushbutton', 'script.py'))
-window_script = os.path.abspath(os.path.join(this_dir, '..', 'WindowID.pushbutton', 'script.py'))
+#---------------------------------------CUSTOM IMPORTS---------------------------------------#
 
+from markUtils._type_marks import assign_type_marks
+from tools._logger import ScriptLogger
 
+#  _     ____  ____  _  ____  ____  _     _____ ____
+# / \ |\/  _ \/  __\/ \/  _ \/  __\/ \   /  __// ___\
+# | | //| / \||  \/|| || / \|| | //| |   |  \  |    \
+# | \// | |-|||    /| || |-||| |_\\| |_/\|  /_ \___ |
+# \__/  \_/ \|\_/\_\\_/\_/ \|\____/\____/\____\\____/ VARIABLES
 
+doc    = __revit__.ActiveUIDocument.Document
 
-# Kjøre dem med execfile (IronPython)
-exec(open(door_script).read())
-exec(open(window_script).read()) 
+CATEGORIES = [BuiltInCategory.OST_Doors, BuiltInCategory.OST_Windows]
 
 
+#  _     ____  _____ _____ _  _      _____
+# / \   /  _ \/  __//  __// \/ \  /|/  __/
+# | |   | / \|| |  _| |  _| || |\ ||| |  _
+# | |_/\| \_/|| |_//| |_//| || | \||| |_//
+# \____/\____/\____\\____\\_/\_/  \|\____\ LOGGING
+
+logger = ScriptLogger(name='TypeMark', log_to_file=True, queued=True)
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+
+#----------------------------------------MAIN------------------------------------------------#
+
+def main():
+    # Shift-klikk: nummerer alle typar på nytt frå 01. Elles beheld eksisterande merke.
+    renumber = globals().get("__shiftclick__", False)
+    try:
+        types, report = assign_type_marks(doc, logger, CATEGORIES, renumber=renumber,
+                                          description="Assign Type Mark to Doors and Windows")
+    except Exception as e:
+        logger.error("Error during transaction: {}".format(e))
+        TaskDialog.Show("❌ Error", "An error occurred while assigning type marks.")
+        return
+
+    if not types:
+        TaskDialog.Show("❌ Error", "No doors or windows found.")
+        return
+
+    doors = len(types.get(int(BuiltInCategory.OST_Doors), []))
+    windows = len(types.get(int(BuiltInCategory.OST_Windows), []))
+    TaskDialog.Show("✅ Success", "{} door types, {} window types\n{}".format(doors, windows, report.summary()))
+
+
+#  _      ____  _  _
+# / \__/|/  _ \/ \/ \  /|
+# | |\/||| / \|| || |\ ||
+# | |  ||| |-||| || | \||
+# \_/  \|\_/ \|\_/\_/  \| MAIN SCRIPT
+
+if __name__ == "__main__":
+    main()
+    logger.close()
@@ -15,7 +15,7 @@ import os
 
 #---------------------------- AUTODESK REVIT AND PYREVIT IMPORTS ----------------------------#
 
-from Autodesk.Revit.DB import Transaction, BuiltInCategory, BuiltInParameter, FilteredElementCollector
+from Autodesk.Revit.DB import BuiltInCategory
 from Autodesk.Revit.UI import TaskDialog
 from tools._logger import ScriptLogger
 
@@ -23,7 +23,7 @@ from tools._logger import ScriptLogger
 
 #---------------------------------------CUSTOM IMPORTS---------------------------------------#
 
-from tools._transactions import revit_transaction
+from markUtils._type_marks import assign_type_marks
 
 #  _     ____  _____ _____ _  _      _____
 # / \   /  _ \/  __//  __// \/ \  /|/  __/
@@ -33,7 +33,7 @@ from tools._transactions import revit_transaction
                                   
 
 
-logger = ScriptLogger(name='WindowTypeMark', log_to_file=True)
+logger = ScriptLogger(name='WindowTypeMark', log_to_file=True, queued=True)
 
 
 #  _     ____  ____  _  ____  ____  _     _____ ____ 
@@ -59,29 +59,21 @@ doc    = __revit__.ActiveUIDocument.Document
 #----------------------------------------MAIN------------------------------------------------#
 
 def main():
-
-    collector = WindowCollector(doc, logger)
-    window_types = collector.get_unique_window_types()
-
-
-    if not window_types:
-        TaskDialog.Show("❌ Error", "No windows found.")
-        return
-
-    # Sort alphabetically by type name for consistency
-    sorted_types = sorted(
-        window_types,
-        key=lambda x: x.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString()
-    )
-
-    assigner = WindowTypeMarkAssigner(doc, logger)
+    # Shift-klikk: nummerer alle typar på nytt frå 01. Elles beheld eksisterande merke.
+    # Nye typar blir nummererte alfabetisk etter typenamn.
+    renumber = globals().get("__shiftclick__", False)
     try:
-        assigner.assign_type_marks(sorted_types)
-        logger.info("Window type marks were assigned successfully.")
-        TaskDialog.Show("✅ Success", "Window type marks were assigned successfully.")
+        types, report = assign_type_marks(doc, logger, [BuiltInCategory.OST_Windows], renumber=renumber,
+                                          description="Assign Type Mark to Windows")
     except Exception as e:
         logger.error("Error: {}".format(e))
         TaskDialog.Show("❌ Error", "An error occurred while assigning type marks.")
+        return
+
+    if not types:
+        TaskDialog.Show("❌ Error", "No windows found.")
+        return
+    TaskDialog.Show("✅ Success", "Window type marks: {}".format(report.summary()))
 
 
 
@@ -90,51 +82,6 @@ def main():
 
 
 
-class WindowCollector(object):
-    def __init__(self, doc, logger):
-        self.doc = doc
-        self.logger = logger
-    
-    def get_unique_window_types(self):
-        """Collects all unique window types in the document."""
-        windows = FilteredElementCollector(self.doc)\
-            .OfCategory(BuiltInCategory.OST_Windows)\
-            .WhereElementIsNotElementType()\
-            .ToElements()
-
-        unique_types = {}
-        for win in windows:
-            try:
-                symbol = win.Symbol
-                if symbol and symbol.Id not in unique_types:
-                    unique_types[symbol.Id] = symbol
-            except AttributeError as e:
-                self.logger.error("Skipped element due to AttributeError: {}".format(e))
-        return list(unique_types.values())
-
-class WindowTypeMarkAssigner(object):
-    def __init__(self, doc, logger):
-        self.doc = doc
-        self.logger = logger
-
-    def assign_type_marks(self, symbols):
-        """Assigns sequential type marks with prefix V-01, V-02, ..."""
-        prefix = "V-"
-        t = Transaction(self.doc, "Assign Type Mark to Windows")
-        t.Start()
-        try:
-            for i, symbol in enumerate(symbols, start=1):
-                type_mark = "{}{:02d}".format(prefix, i)
-                param = symbol.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_MARK)
-                if param and not param.IsReadOnly:
-                    param.Set(type_mark)
-                    self.logger.info("Assigned {} to {}".format(type_mark, symbol.FamilyName))
-                else:
-                    self.logger.error("Could not assign Type Mark to {}".format(symbol.FamilyName))
-            t.Commit()
-        except Exception as e:
-            self.logger.error("Error during transaction: {}".format(e))
-            t.RollBack()
 # / \__/|/  _ \/ \/ \  /|
 # | |\/||| / \|| || |\ ||
 # | |  ||| |-||| || | \||
@@ -142,4 +89,5 @@ class WindowTypeMarkAssigner(object):
 
 if __name__ == "__main__":
     
-    main() 
\ No newline at end of file
+    main()
+    logger.close()
@@ -10,20 +10,16 @@ doc    = Version = 1.0
 # | || |  |||  __/| \_/||    /  | |  
 # \_/\_/  \|\_/   \____/\_/\_\  \_/ IMPORTS
 #----------------------------------STANDARD LIBRARY IMPORTS----------------------------------#
-#.NET Imports
-import clr
-clr.AddReference('System')
-from System.Collections.Generic import List
-from collections import defaultdict
 
 #---------------------------- AUTODESK REVIT AND PYREVIT IMPORTS ----------------------------#
-from Autodesk.Revit.UI import TaskDialog, TaskDialogCommonButtons, TaskDialogResult, TaskDialogCommandLinkId
-from Autodesk.Revit.UI.Selection import ObjectType
+from Autodesk.Revit.UI import TaskDialog
 from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory
+from pyrevit import forms
 
 #---------------------------------------CUSTOM IMPORTS---------------------------------------#
+from markUtils._mark_groups import MarkGrouper, GROUP_KEYS
+from parameterUtils._bulk_writer import element_id_value
 from tools._logger import ScriptLogger
-from tools._transactions import revit_transaction
 
 #  _     ____  ____  _  ____  ____  _     _____ ____ 
 # / \ |\/  _ \/  __\/ \/  _ \/  __\/ \   /  __// ___\
@@ -35,13 +31,17 @@ app    = __revit__.Application
 uidoc  = __revit__.ActiveUIDocument
 doc    = __revit__.ActiveUIDocument.Document
 
+GROUP_BY   = ("type", "length")     # Shift-klikk: vel sjølv blant GROUP_KEYS
+PRECISION  = 2                      # desimalar på lengde i meter
+CHUNK_SIZE = None                   # None = éin transaksjon. Sett t.d. 5000 for svært store modellar
+
 #  _     ____  _____ _____ _  _      _____
 # / \   /  _ \/  __//  __// \/ \  /|/  __/
 # | |   | / \|| |  _| |  _| || |\ ||| |  _
 # | |_/\| \_/|| |_//| |_//| || | \||| |_//
 # \____/\____/\____\\____\\_/\_/  \|\____\ LOGGING
 
-logger = ScriptLogger(name='Renumber Framing Elements ID', log_to_file=True)
+logger = ScriptLogger(name='Renumber Framing Elements ID', log_to_file=True, queued=True)
 
 
 #  _____ _     _      ____  _____  _  ____  _      ____ 
@@ -51,28 +51,6 @@ logger = ScriptLogger(name='Renumber Framing Elements ID', log_to_file=True)
 # \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
 
 #----------------------------------------MAIN------------------------------------------------#
-def _feet_to_m(feet_value):
-    return feet_value * 0.3048
-
-
-def _round_len_m(val_m, precision):
-    # python 2.7 round returns float; ensure stable string sorting later
-    return round(val_m, precision)
-
-
-def _get_elem_length_m(elem):
-    # Try localized "Pre-cut Lengde" first, then "Cut Length"
-    p = elem.LookupParameter("Pre-cut Lengde")
-    if p is None:
-        p = elem.LookupParameter("Cut Length")
-    if p and p.HasValue:
-        try:
-            return _feet_to_m(p.AsDouble())
-        except:
-            return None
-    return None
-
-
 def _collect_selected_or_all_framing():
     sel_ids = uidoc.Selection.GetElementIds()
     elements = []
@@ -80,7 +58,7 @@ def _collect_selected_or_all_framing():
         # Use only Structural Framing from current selection
         for eid in sel_ids:
             e = doc.GetElement(eid)
-            if e and e.Category and e.Category.Id.IntegerValue == int(BuiltInCategory.OST_StructuralFraming):
+            if e and e.Category and element_id_value(e.Category.Id) == int(BuiltInCategory.OST_StructuralFraming):
                 elements.append(e)
     else:
         # Nothing selected: get all Structural Framing instances in model
@@ -91,48 +69,9 @@ def _collect_selected_or_all_framing():
     return elements
 
 
-def _group_by_type_and_length(elements, precision):
-    # { type_name: { rounded_length_m: [elements...] } }
-    grouped = {}
-    for e in elements:
-        # Skip invalids
-        if e is None:
-            continue
-        length_m = _get_elem_length_m(e)
-        if length_m is None:
-            continue
-        # Type name: use element type name (FamilySymbol.Name)
-        try:
-            t = e.Symbol
-            if t:
-                type_name = t.Name
-            else:
-                type_name = e.Name
-        except:
-            type_name = e.Name
-        rlen = _round_len_m(length_m, precision)
-        if type_name not in grouped:
-            grouped[type_name] = {}
-        if rlen not in grouped[type_name]:
-            grouped[type_name][rlen] = []
-        grouped[type_name][rlen].append(e)
-    return grouped
-
-
-def _assign_mark_values(grouped):
-    # Sequential Mark per (type, rounded length) group
-    mark_val = 1
-    # Sort type names alphabetically; lengths numerically
-    for type_name in sorted(grouped.keys()):
-        length_map = grouped[type_name]
-        # sorted keys of lengths; ensure numeric sort
-        for rlen in sorted(length_map.keys()):
-            elems = length_map[rlen]
-            for e in elems:
-                p = e.LookupParameter("Mark")
-                if p and not p.IsReadOnly:
-                    p.Set(str(mark_val))
-            mark_val += 1
+def _choose_group_keys():
+    picked = forms.SelectFromList.show(list(GROUP_KEYS), title="Grupper etter", multiselect=True)
+    return tuple(k for k in GROUP_KEYS if k in picked) if picked else None
 
 
 def main():
@@ -140,13 +79,28 @@ def main():
     if not elements:
         TaskDialog.Show("Renumber Framing Elements ID", "Ingen bjelker funnet (Structural Framing).")
         return
-    with revit_transaction(doc,"Renumber Framing Elements ID"):
-        grouped = _group_by_type_and_length(elements, precision=2)
-        if not grouped:
-            TaskDialog.Show("Renumber Framing Elements ID", "Fant ingen elementer med gyldig lengde.")
+
+    keys = GROUP_BY
+    if globals().get("__shiftclick__", False):
+        keys = _choose_group_keys()
+        if not keys:
             return
-        _assign_mark_values(grouped)
-    TaskDialog.Show("Renumber Framing Elements ID", "Nummerering fullført.")
+
+    grouper = MarkGrouper(doc, keys=keys, precision=PRECISION, logger=logger)
+    with logger.timed("group"):
+        groups = grouper.group(elements)
+    if not groups:
+        TaskDialog.Show("Renumber Framing Elements ID", "Fant ingen elementer med gyldig lengde.")
+        return
+
+    with logger.timed("write marks"):
+        report = grouper.write(groups, "Renumber Framing Elements ID", chunk_size=CHUNK_SIZE)
+    logger.count("elements", len(elements))
+    logger.count("groups", len(groups))
+    logger.count("skipped (no length)", grouper.skipped)
+    logger.emit_summary()
+    TaskDialog.Show("Renumber Framing Elements ID",
+                    "Nummerering fullført.\n{} grupper ({})\n{}".format(len(groups), ", ".join(keys), report.summary()))
 
 #  _      ____  _  _     
 # / \__/|/  _ \/ \/ \  /|
@@ -157,4 +111,5 @@ def main():
 # Run the script
 if __name__ == "__main__":
     main()
+    logger.close()
 
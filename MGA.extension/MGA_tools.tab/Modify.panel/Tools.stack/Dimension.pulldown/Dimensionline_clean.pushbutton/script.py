@@ -23,17 +23,27 @@ from System.Globalization import CultureInfo
 from pyrevit import revit
 from Autodesk.Revit.DB import \
     BuiltInCategory, \
-    BuiltInParameter, \
     Dimension, \
     DimensionStyleType, \
     FilteredElementCollector,\
-    LabelUtils, \
     SpotDimension, \
-    Transaction, \
     UnitTypeId, \
     UnitUtils
 from Autodesk.Revit.UI import TaskDialog
 
+#---------------------------------------CUSTOM IMPORTS---------------------------------------#
+from dimensionUtils._fingerprint import dimension_fingerprint
+from dimensionUtils._frame import DimFrames, MM_PER_FOOT
+from dimensionUtils._overlap import OverlapLayout, overlap_clusters
+from dimensionUtils._probe import DefaultTextPositions, text_key
+from dimensionUtils._text_width import TextWidthEstimator
+from dimensionUtils._type_info import DimensionTypeCache
+from parameterUtils._bulk_writer import element_id_value
+from tools._logger import ScriptLogger
+from tools._sidecar import FingerprintStore
+from tools._transactions import revit_groupTransaction
+from tools._views import choose_views, progress_bar
+
 
 #  _     ____  ____  _  ____  ____  _     _____ ____ 
 # / \ |\/  _ \/  __\/ \/  _ \/  __\/ \   /  __// ___\
@@ -45,19 +55,27 @@ from Autodesk.Revit.UI import TaskDialog
 uidoc = __revit__.ActiveUIDocument
 doc = uidoc.Document
 view = uidoc.ActiveView
-view_scale = view.Scale   
 
 CI = CultureInfo.CurrentCulture
 
+logger = ScriptLogger(name='Dimensionline_clean', log_to_file=True)
+defaults = DefaultTextPositions(doc, logger)   # default tekstposisjonar, proba éin gong
+frames = {}                                    # view id -> DimFrames (origin/along/up per mållinje)
+widths = TextWidthEstimator()                  # tegnbreidder per font, lagra i TEMP
+dim_types = DimensionTypeCache(doc)            # eining/format/teksthøgde per måltype
+
 #--------------------------------- USER SETTINGS VARIABLES ---------------------------------#
 
 PADDING_MM = 2.0              # ekstra luft når vi sjekkar "passar i segment"
-CHAR_FACTOR = 0.68              # ca snitt bokstavbreidde = CHAR_FACTOR * teksthøgde
-ROW_TOL_MM_MIN = 1.0            # toleranse for å gruppere tekstar på same "rad"
+CHAR_FACTOR = 0.68              # ca snitt bokstavbreidde = CHAR_FACTOR * teksthøgde (når fonten er ukjend)
 MOVED_THR_MIN_MM = 1.0          # minste terskel for å rekne tekst som "flytta"
 MOVED_THR_TEXT_FRAC = 0.15      # terskel som del av text_height_mm
 OVERLAP_STEP_TEXT_FRAC = 1.20   # ekstra "ut" ved overlap, som del av text_height_mm
-MAX_OVERLAP_ITERS = 10
+
+# Fingeravtrykk frå førre køyring blir forkasta når desse endrar seg
+SETTINGS = {"version": 2, "padding_mm": PADDING_MM, "char_factor": CHAR_FACTOR,
+            "moved_thr_mm": MOVED_THR_MIN_MM, "moved_thr_frac": MOVED_THR_TEXT_FRAC,
+            "overlap_step_frac": OVERLAP_STEP_TEXT_FRAC}
 
 
 #  _____ _     _      ____  _____  _  ____  _      ____ 
@@ -67,20 +85,94 @@ MAX_OVERLAP_ITERS = 10
 # \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
 
 #----------------------------------------MAIN------------------------------------------------#
-def main():
+def main(views=None):
+    """
+    Default: selected dimensions, or all dimensions in the active view.
+    Shift-click: choose views (picked views or all views on sheets).
+    views: run directly on these views (no dialog).
+    """
+    if views is None and globals().get("__shiftclick__", False):
+        views = choose_views(doc, view, u"Rydd mållinjer")
+        if not views:
+            return
+
+    # Éin collector per view
+    with logger.timed("collect dimensions"):
+        if views is None:
+            work = [(view, get_element(doc, view, uidoc))]
+        else:
+            work = [(v, get_view_dimensions(doc, v)) for v in views]
+        work = [(v, [d for d in dims if f_can_touch_dimension(d)]) for v, dims in work]
+        # Alle mållinjer i viewet, også uendra, er hinder i pass C. Med utval blir viewet henta der.
+        selection = views is None and bool(list(uidoc.Selection.GetElementIds()))
+        view_dims = {} if selection else dict((element_id_value(v.Id), dims) for v, dims in work)
+
+    # Hopp over mållinjer som er uendra sidan førre køyring (sidecar JSON i TEMP)
+    store = FingerprintStore.for_document(doc, "Dimensionline_clean", settings=SETTINGS)
+    prints = {}
+    with logger.timed("fingerprints"):
+        for v, dims in work:
+            for d in dims:
+                prints[d.UniqueId] = dimension_fingerprint(d, v, dim_types.get(d).text_size_mm)
+        work = [(v, [d for d in dims if not store.is_unchanged(d.UniqueId, prints[d.UniqueId])]) for v, dims in work]
+        work = [(v, dims) for v, dims in work if dims]
+    logger.count("dimensions unchanged (skipped)", store.skipped)
 
-    dimension_lines = get_element(doc, view, uidoc)
     error = set()
+    plans = []
+    done = 0
+    steps = 2 * len(work)
+    with progress_bar(len(work)) as pb:
+        # Éin rulla-tilbake transaksjon for alle default-posisjonar (brukt i pass A og C)
+        with logger.timed("probe default text positions"):
+            defaults.probe([d for v, dims in work for d in dims])
+
+        # PASS A: plan moves for all views before anything is changed
+        for v, dims in work:
+            if pb.cancelled:
+                break
+            plan = plan_view(v, dims)
+            plan["view_dims"] = view_dims.get(element_id_value(v.Id))
+            plans.append(plan)
+            done += 1
+            pb.update_progress(done, steps)
+
+        # PASS B + C: one TransactionGroup, one transaction per view
+        applied = 0
+        if plans and not pb.cancelled:
+            with revit_groupTransaction(doc, "Clean dimension lines"):
+                for plan in plans:
+                    if pb.cancelled:
+                        break
+                    apply_view(plan, error)
+                    applied += 1
+                    remember_view(plan, store, prints, error)
+                    done += 1
+                    pb.update_progress(done, steps)
+        cancelled = pb.cancelled
+
+    store.save()
+    widths.save()
+    logger.count("views", applied)
+    logger.count("moves planned", sum(len(p["move_jobs"]) for p in plans))
+    logger.emit_summary()
+
+    if cancelled:
+        TaskDialog.Show("Avbrutt", "Stoppa etter {} av {} views.".format(applied, len(work)))
+    if len(list(error)) > 0:
+        TaskDialog.Show("Error","Kan ikke flytte {} tekster. NB! Denne virker ikke på summasjons-mållinjer.".format(len(list(error))))
+
+@logger.timed("pass A: plan")
+def plan_view(view, dimension_lines):
+    """PASS A: plan moves for "does not fit" in one view. Nothing is changed here."""
     move_jobs = []
     overlap_dims = []
     moved_this_run = set()
-    # PASS A: plan moves for "does not fit"
+    owners = {}     # id(segment) -> mållinja, for å finne mållinja til ein feila flytting
+
     for dim in dimension_lines:
-        if not f_can_touch_dimension(dim):
-            continue
-        
-        accuracy, unit_symbol, text_height_mm, unit_label = get_dim_units(dim)
-        count_decimals = decimals_from_accuracy(accuracy) if accuracy else None
+        accuracy, unit_symbol, text_height_mm, unit_label = get_dim_units(dim, view)
+        count_decimals = dim_types.get(dim).decimals
 
         seg_count = f_get_seg_count(dim)
 
@@ -91,9 +183,11 @@ def main():
 
             # Planlegg flytting basert på overlapp-klynger + "ikkje får plass"
             planned = plan_multiseg_moves(dim, view, text_height_mm, items, padding_mm=PADDING_MM)
+            key_by_seg = dict((id(it["seg"]), it["key"]) for it in items)
             for obj, target in planned:
-                moved_this_run.add(id(obj))   # obj er DimensionSegment
-                move_jobs.extend(planned)
+                moved_this_run.add(key_by_seg[id(obj)])   # obj er DimensionSegment
+                owners[id(obj)] = dim
+            move_jobs.extend(planned)
 
             # valfritt: køyr resolve_overlaps etterpå som "safety"
             overlap_dims.append(dim)
@@ -102,7 +196,8 @@ def main():
             if is_single_dim_manually_moved(dim):
                 continue
 
-            dim_text, text_width_mm, dim_length_mm = collect_dim_seg_info(dim, text_height_mm, count_decimals, unit_label, unit_symbol)
+            dim_text, text_width_mm, dim_length_mm = collect_dim_seg_info(dim, text_height_mm, count_decimals, unit_label, unit_symbol,
+                                                                          dim_type=dim_types.get(dim).dim_type)
 
             if text_width_mm > dim_length_mm:
                 base = get_dimension_base_point(dim)
@@ -112,35 +207,71 @@ def main():
                 target = base + v
                 move_jobs.append((dim, target))
 
-    # PASS B: apply moves (one transaction)
-    if move_jobs:
-        with revit.Transaction("Auto-fit dimension text"):
-            for obj, target in move_jobs:
+    return {"view": view, "dims": dimension_lines, "move_jobs": move_jobs, "overlap_dims": overlap_dims,
+            "moved": moved_this_run, "owners": owners}
+
+def remember_view(plan, store, prints, error):
+    """Store fingerprints as the dims look after this run, so the next run can skip them.
+
+    Dims with a failed move (in error, directly or through a segment) are forgotten so they are retried.
+    """
+    view = plan["view"]
+    owners = plan["owners"]
+    # Segment frå andre views finst ikkje i owners og har ingen UniqueId
+    failed = set(getattr(owners.get(id(obj), obj), "UniqueId", None) for obj in error)
+    for dim in plan["dims"]:
+        uid = dim.UniqueId
+        if uid in failed:
+            store.forget(uid)
+            continue
+        fp = dimension_fingerprint(dim, view, dim_types.get(dim).text_size_mm) if plan["move_jobs"] else prints[uid]
+        store.update(uid, fp)
+
+def apply_view(plan, error):
+    """PASS B (apply moves) and PASS C (resolve overlaps) for one view, in one transaction."""
+    view = plan["view"]
+    if not plan["move_jobs"]:
+        return      # pass C only looks at texts moved in this run
+
+    logger.count("transactions")
+    with revit.Transaction("Clean dimension lines - {}".format(view.Name)):
+        # PASS B: apply moves
+        with logger.timed("pass B: apply moves"):
+            for obj, target in plan["move_jobs"]:
                 try:
                     move_text(obj, target)
                 
                 except:
                     error.add(obj)              
-    
-    # PASS C: resolve overlaps (text-text) (second transaction)
-    # Only on multi-segment dims (and only those we may have modified)
-    if overlap_dims:
-        with revit.Transaction("Resvolve dimension text overlaps"):
-            
-            for dim in overlap_dims:
+
+        # PASS C: resolve overlaps (text-text)
+        # Only texts moved in this run may move again. Every other text in the view
+        # (unchanged dims, texts that stay) is a fixed obstacle where it is now.
+        with logger.timed("pass C: resolve overlaps"):
+            layout = OverlapLayout()
+            placed = []
+            for dim in plan["overlap_dims"]:
                 try:
-                    accuracy, unit_symbol, text_height_mm, unit_label = get_dim_units(dim)
-                    count_decimals = decimals_from_accuracy(accuracy) if accuracy else None
+                    accuracy, unit_symbol, text_height_mm, unit_label = get_dim_units(dim, view)
+                    count_decimals = dim_types.get(dim).decimals
                     items = build_text_items(dim, view, text_height_mm, count_decimals, unit_label, unit_symbol)
-                    items = [it for it in items if id(it["seg"]) in moved_this_run]
-                    if len(items) >= 2:
-                        resolve_overlaps(dim, view, text_height_mm, items, padding_mm=PADDING_MM)
-                    
+                    items = [it for it in items if it["key"] in plan["moved"]]
+                    placed.extend(collect_overlap_items(dim, view, text_height_mm, items, layout, padding_mm=PADDING_MM))
                 except:
                     error.add(dim)
-    
-    if len(list(error)) > 0:
-        TaskDialog.Show("Error","Kan ikke flytte {} tekster. NB! Denne virker ikke på summasjons-mållinjer.".format(len(list(error))))
+
+            view_dims = plan.get("view_dims")
+            if view_dims is None:
+                view_dims = [d for d in get_view_dimensions(doc, view) if f_can_touch_dimension(d)]
+            for dim in view_dims:
+                try:
+                    collect_fixed_texts(dim, view, layout, plan["moved"], padding_mm=PADDING_MM)
+                except:
+                    logger.count("overlap obstacles skipped")
+
+            levels = layout.solve()
+            logger.count("overlap labels moved", layout.moved)
+            resolve_overlaps(placed, levels)
 
 # ---------------------------------------- SELECTION ---------------------------------------- #
 def get_element(doc, view, uidoc):
@@ -157,71 +288,43 @@ def get_element(doc, view, uidoc):
         return dims
 
     # Case 2: nothing selected -> all dimensions in active view
+    return get_view_dimensions(doc, view)
+
+def get_view_dimensions(doc, view):
+    logger.count("collectors")
     return (FilteredElementCollector(doc, view.Id)  # view-scoped collector :contentReference[oaicite:0]{index=0}
             .OfCategory(BuiltInCategory.OST_Dimensions)
             .WhereElementIsNotElementType()
             .ToElements())
 #----------------------------------GEOMETRY HELPERS------------------------------------------#
 
+def get_frame(dim, view):
+    """DimFrame for dim in view, cached per dimension."""
+    key = element_id_value(view.Id)
+    if key not in frames:
+        frames[key] = DimFrames(view)
+    return frames[key].get(dim)
+
 def get_dim_frame(dim, view):
-    along = dim.Curve.Direction.Normalize()
-    view_dir = view.ViewDirection.Normalize()
-    up = view_dir.CrossProduct(along).Normalize()
-    origin = dim.Curve.Origin
-    return origin, along, up
+    """(origin, along, up) as XYZ, for building target points. Cached per dimension."""
+    return get_frame(dim, view).xyz
 
 def _up_pos_mm(dim, view, p):
-    origin, along, up = get_dim_frame(dim, view)
-    u_ft = _dot(p-origin, up)
-    return UnitUtils.ConvertFromInternalUnits(u_ft, UnitTypeId.Millimeters)
+    return get_frame(dim, view).up_mm(p)
 
 def along_pos_mm(dim, view, p):
-    origin, along, up = get_dim_frame(dim, view)
-    x_ft = _dot(p - origin, along)
-    return UnitUtils.ConvertFromInternalUnits(x_ft, UnitTypeId.Millimeters)
-
-def _dot(a, b):
-    return a.X * b.X + a.Y * b.Y + a.Z * b.Z
+    return get_frame(dim, view).along_mm(p)
 
 def mm_to_internal(mm):
-    return UnitUtils.ConvertToInternalUnits(mm, UnitTypeId.Millimeters)
+    return mm / MM_PER_FOOT
 
 def _points_close(p1, p2, tol_mm=0.5):
-    dist_ft = p1.DistanceTo(p2)
-    dist_mm = UnitUtils.ConvertFromInternalUnits(dist_ft, UnitTypeId.Millimeters)
-    return dist_mm < tol_mm
-
-def get_stable_p_line_for_seg(seg, dim):
-    """Project the segment's DEFAULT text position (not current) to the dim line."""
-    base = None
-    t = Transaction(doc, "Probe seg default text")
-    t.Start()
-    try:
-        try:
-            seg.ResetTextPosition()   # get default/unmoved text pos
-            base = getattr(seg, "TextPosition", None)
-        except:
-            base = None
-    finally:
-        t.RollBack()  # never commit, we only probe
-
-    if base is None:
-        try:
-            base = dim.Curve.Origin
-        except:
-            return None
-
-    try:
-        pr = dim.Curve.Project(base)
-        if pr:
-            return pr.XYZPoint
-    except:
-        pass
+    return p1.DistanceTo(p2) * MM_PER_FOOT < tol_mm
 
-    try:
-        return dim.Curve.Origin
-    except:
-        return None
+def get_stable_p_line_for_seg(dim, index):
+    """Project the segment's DEFAULT text position (not current) to the dim line.
+    Default positions come from the shared probe (one rolled-back transaction)."""
+    return defaults.line_point(dim, index)
 
 #---------------------------------FILTERING / GUARDS-----------------------------------------#
 
@@ -232,7 +335,7 @@ def f_can_touch_dimension(dim):
     
     # Skip Ordinate dimensions    
     try:
-        dt = doc.GetElement(dim.GetTypeId())
+        dt = dim_types.get(dim).dim_type
         if dt and dt.StyleType == DimensionStyleType.Ordinate:
             return False
     except:
@@ -275,61 +378,24 @@ def f_get_seg_count(dim):
 
 #------------------------------UNIT / FORMAT HELPERS--------------------------------------#
 
-def decimals_from_accuracy(acc, max_dec = 12):
-    if acc  is None or acc <= 0:
-        return None
-    acc = round(float(acc), 12)
-    for n in range(0, max_dec + 1):
-        target = 10.0 ** (-n)
-        if abs(n - round(n)) < 1e-8:
-            return int(round(n))
-    return None
-
-def get_dim_units(dim):
+@logger.timed("get_dim_units")
+def get_dim_units(dim, view):
     """
     Returns: (accuracy, unit_symbol, text_height_mm_in_model, unit_label)
     - text_height_mm_in_model already multiplied by view scale
+    - type settings are read once per DimensionType (dim_types)
     """
+    info = dim_types.get(dim)
+    return info.accuracy, info.unit_symbol, info.text_size_mm * view.Scale, info.unit_label
 
-    dim_type = doc.GetElement(dim.GetTypeId())
-    spec_id = dim_type.GetSpecTypeId()
-
-    text_height_in_model = _text_type_size_mm(dim_type) * view_scale
-
-    fo = dim_type.GetUnitsFormatOptions()
-    if fo is None or fo.UseDefault:
-        fo = doc.GetUnits().GetFormatOptions(spec_id)
-    
-    accuracy = None
-    unit_symbol = None
-
-    try:
-        accuracy = fo.Accuracy
-    except:
-        accuracy = None
-    
-    try:
-        sym_id = fo.GetSymbolTypeId()
-        unit_symbol = LabelUtils.GetLabelForSymbol(sym_id)
-    except:
-        unit_symbol = None
-    
-    unit_id = fo.GetUnitTypeId()
-    unit_label = LabelUtils.GetLabelForUnit(unit_id)
-
-    return accuracy, unit_symbol, text_height_in_model, unit_label
-
-def _text_type_size_mm(dim_type):
-    p = dim_type.get_Parameter(BuiltInParameter.TEXT_SIZE)
-    return UnitUtils.ConvertFromInternalUnits(p.AsDouble(), UnitTypeId.Millimeters)
-
-def collect_dim_seg_info(dim_like, text_height_mm, count_decimals, unit_label, unit_symbol):
+def collect_dim_seg_info(dim_like, text_height_mm, count_decimals, unit_label, unit_symbol, dim_type=None):
     """
     Works for DimensionSegment or Dimension (single)
+    dim_type: DimensionType, gives the font for the width estimate
     Returns: (display_text, text_width_mm, length_mm)
     """
     
-    length_mm = UnitUtils.ConvertFromInternalUnits(getattr(dim_like, "Value", 0.0), UnitTypeId.Millimeters)
+    length_mm = getattr(dim_like, "Value", 0.0) * MM_PER_FOOT
 
     v_disp = _unit_value(getattr(dim_like, "Value", 0.0), unit_label)
     if count_decimals is None:
@@ -341,7 +407,7 @@ def collect_dim_seg_info(dim_like, text_height_mm, count_decimals, unit_label, u
     if unit_symbol:
         txt = txt + unit_symbol
 
-    w_mm = _estimate_text_width_mm(text_height_mm, txt, count_decimals = count_decimals)
+    w_mm = _estimate_text_width_mm(text_height_mm, txt, count_decimals = count_decimals, dim_type = dim_type)
     return txt, w_mm, length_mm
 
 def _unit_value(value_internal, unit_label):
@@ -357,8 +423,11 @@ def _format_number(value, decimals):
         return str(int(round(float(value))))
     return float(value).ToString("F{}".format(int(decimals)), CI)
 
-def _estimate_text_width_mm(text_height_mm, value_string, count_decimals = None, char_factor = CHAR_FACTOR):
+def _estimate_text_width_mm(text_height_mm, value_string, count_decimals = None, char_factor = CHAR_FACTOR, dim_type = None):
     s = (value_string or "").strip()
+    if dim_type is not None:
+        # per-tegn breidde frå fonten (separator er allereie med i teksten)
+        return widths.width_mm(s, dim_type, text_height_mm)
     # add 1 char for decimal separator if we know we have decimals (conservative)
     if count_decimals and count_decimals > 0:
         return text_height_mm * char_factor * (len(s) + 1)
@@ -371,15 +440,14 @@ def compute_baseline_nearest_line(dim, view):
     Baseline for 'default/auto' text offset.
     Robust even if many texts are already moved: we use the half closest to the dim line (smallest |u|).
     """
-    ups = []
+    points = []
     for seg in dim.Segments:
         try:
-            tp = seg.TextPosition
+            points.append(seg.TextPosition)
         except:
             continue
-        if tp is not None:
-            ups.append(_up_pos_mm(dim, view, tp))
-    
+    ups = [xu[1] for xu in get_frame(dim, view).project_many(points) if xu is not None]
+
     if not ups:
         return 0.0
     
@@ -467,37 +535,18 @@ def offset_vector_up_side(dim, view, text_height_mm, text_width_mm, side_sign):
 def is_single_dim_manually_moved(dim, tol_mm=0.5):
     """
     If ResetTextPosition would change the text position => it was manually moved.
-    Probe by resetting in a transaction and rolling back.
+    The default position comes from the shared probe (see DefaultTextPositions).
     """
-    tp_before = getattr(dim, "TextPosition", None)
-
-    t = Transaction(doc, "Probe ResetTextPosition")
-    t.Start()
-    try:
-        try:
-            dim.ResetTextPosition()
-        except:
-            t.RollBack()
-            return True
-        tp_after = getattr(dim, "TextPosition", None)
-    finally:
-        t.RollBack()
-
-    if tp_before is None or tp_after is None:
-        return not (tp_before is None and tp_after is None)
-
-    return not _points_close(tp_before, tp_after, tol_mm=tol_mm)
-
-def _points_close(p1, p2, tol_mm=0.5):
-    dist_ft = p1.DistanceTo(p2)
-    dist_mm = UnitUtils.ConvertFromInternalUnits(dist_ft, UnitTypeId.Millimeters)
-    return dist_mm < tol_mm
+    return defaults.is_moved(dim, mm_to_internal(tol_mm))
 
+@logger.timed("build_text_items")
 def build_text_items(dim, view, text_height_mm, count_decimals, unit_label, unit_symbol):
     baseline = compute_baseline_nearest_line(dim, view)
-    
+    dim_type = dim_types.get(dim).dim_type
+
     items = []
-    for seg in dim.Segments:
+    bases = []
+    for seg_index, seg in enumerate(dim.Segments):
         if not f_can_touch_segment(seg):
             continue
 
@@ -506,49 +555,34 @@ def build_text_items(dim, view, text_height_mm, count_decimals, unit_label, unit
             continue
 
         dim_text, text_width_mm, seg_len_mm = collect_dim_seg_info(
-            seg, text_height_mm, count_decimals, unit_label, unit_symbol
+            seg, text_height_mm, count_decimals, unit_label, unit_symbol, dim_type=dim_type
         )
 
         moved = seg_is_moved_relative(dim, view, seg, baseline, text_height_mm)
+        bases.append(base)
         items.append({
             "seg": seg,
+            "key": text_key(dim, seg_index),
             "val": getattr(seg, "Value", 1e99),
             "text": dim_text,
             "w": text_width_mm,
             "seg_len_mm": seg_len_mm,   # <-- NY
-            "x": along_pos_mm(dim, view, base),
-            "u": _up_pos_mm(dim, view, base),
             "moved": moved,          # <-- NY
             "baseline_u": baseline    # <-- NY (kan vere nyttig)
         })
+
+    # x/u for alle segment i éin omgang
+    for it, (x_mm, u_mm) in zip(items, get_frame(dim, view).project_many(bases)):
+        it["x"] = x_mm
+        it["u"] = u_mm
     return items
 
 def build_overlap_clusters(items):
     """Return list of clusters of overlapping [x0,x1] intervals (sorted along dim line)."""
-    its = sorted(items, key=lambda it: it["x0"])
-    clusters = []
-    cur = []
-    cur_max = None
-
-    for it in its:
-        if not cur:
-            cur = [it]
-            cur_max = it["x1"]
-            continue
-
-        # overlap test: start before current cluster end
-        if it["x0"] < cur_max:
-            cur.append(it)
-            cur_max = max(cur_max, it["x1"])
-        else:
-            clusters.append(cur)
-            cur = [it]
-            cur_max = it["x1"]
-
-    if cur:
-        clusters.append(cur)
-    return clusters
+    spans = [(it["x0"], it["x1"]) for it in items]
+    return [[items[i] for i in cl] for cl in overlap_clusters(spans)]
 
+@logger.timed("plan_multiseg_moves")
 def plan_multiseg_moves(dim, view, text_height_mm, items, padding_mm=PADDING_MM):
     if not items:
         return []
@@ -564,7 +598,7 @@ def plan_multiseg_moves(dim, view, text_height_mm, items, padding_mm=PADDING_MM)
         it["index"] = index
 
         # >>> CHANGED: use stable default-based projection, not current TextPosition
-        p_line = get_stable_p_line_for_seg(seg, dim)
+        p_line = get_stable_p_line_for_seg(dim, it["key"][1])
         if p_line is None:
             continue
 
@@ -631,11 +665,15 @@ def plan_multiseg_moves(dim, view, text_height_mm, items, padding_mm=PADDING_MM)
 
     return jobs
 
-def resolve_overlaps(dim, view, text_height_mm, items, padding_mm=PADDING_MM, max_iter=MAX_OVERLAP_ITERS):
-    if len(items) < 2:
-        return
+@logger.timed("collect_overlap_items")
+def collect_overlap_items(dim, view, text_height_mm, items, layout, padding_mm=PADDING_MM):
+    """Add the texts of one dimension to the view-wide OverlapLayout. Returns the added items."""
+    if not items:
+        return []
 
-    origin, along, up = get_dim_frame(dim, view)
+    frame = get_frame(dim, view)
+    row = frame.axis_key()
+    half_band = 0.5 * text_height_mm + padding_mm
     step_mm = max(2.0, OVERLAP_STEP_TEXT_FRAC * text_height_mm)
 
     active = []
@@ -645,12 +683,14 @@ def resolve_overlaps(dim, view, text_height_mm, items, padding_mm=PADDING_MM, ma
         seg = it["seg"]
 
         # >>> CHANGED: stable p_line
-        p_line = get_stable_p_line_for_seg(seg, dim)
+        p_line = get_stable_p_line_for_seg(dim, it["key"][1])
         if p_line is None:
             it["skip"] = True
             continue
 
         it["skip"] = False
+        it["dim"] = dim
+        it["view"] = view
         it["p_line"] = p_line
         it["x"] = along_pos_mm(dim, view, p_line)
 
@@ -661,47 +701,64 @@ def resolve_overlaps(dim, view, text_height_mm, items, padding_mm=PADDING_MM, ma
         it["x0"] = it["x"] - half - padding_mm
         it["x1"] = it["x"] + half + padding_mm
 
+        # x langs og v på tvers av retninga (felles for alle parallelle mållinjer)
+        x_row = frame.row_x_mm(p_line)
+        v_row = frame.row_v_mm(base_now if base_now is not None else p_line)
+        layout.add(it["key"], row, x_row - half - padding_mm, x_row + half + padding_mm,
+                   v_row - half_band, v_row + half_band)
+
         active.append(it)
         ups.append(it["u"])
 
-    if len(active) < 2:
-        return
-
     ups_sorted = sorted(ups, key=lambda u: abs(u))
     take = max(1, int(len(ups) * 0.5))
     baseline_u = median(ups_sorted[:take]) if ups_sorted else 0.0
-
-    active.sort(key=lambda it: (it["x0"], it["x1"]))
-    levels_last_x1 = []
-    level_by_key = {}
-
-    for it in active:
-        key = id(it["seg"])
-        placed = False
-        for lvl in range(len(levels_last_x1)):
-            if it["x0"] >= levels_last_x1[lvl]:
-                level_by_key[key] = lvl
-                levels_last_x1[lvl] = it["x1"]
-                placed = True
-                break
-        if not placed:
-            lvl = len(levels_last_x1)
-            levels_last_x1.append(it["x1"])
-            level_by_key[key] = lvl
-
     for it in active:
-        seg = it["seg"]
-        key = id(seg)
-        lvl = level_by_key.get(key, 0)
-        if lvl <= 0:
+        it["baseline_u"] = baseline_u
+        it["step_mm"] = step_mm
+    return active
+
+@logger.timed("collect_fixed_texts")
+def collect_fixed_texts(dim, view, layout, moved, padding_mm=PADDING_MM):
+    """Add the texts of dim that are not in moved as fixed obstacles (level 0), where they are now."""
+    accuracy, unit_symbol, text_height_mm, unit_label = get_dim_units(dim, view)
+    info = dim_types.get(dim)
+    frame = get_frame(dim, view)
+    row = frame.axis_key()
+    half_band = 0.5 * text_height_mm + padding_mm
+
+    # fleirsegment: éin tekst per segment, elles teksten til sjølve mållinja
+    texts = [(text_key(dim, i), seg) for i, seg in enumerate(dim.Segments)] if f_get_seg_count(dim) > 0 else []
+    texts = texts or [(text_key(dim), dim)]
+    added = 0
+    for key, obj in texts:
+        if key in moved:
             continue
-        p_line = it.get("p_line", None)
-        if p_line is None:
+        pos = get_segment_base_point(obj, dim)
+        if pos is None:
+            continue
+        dim_text, text_width_mm, length_mm = collect_dim_seg_info(obj, text_height_mm, info.decimals, unit_label,
+                                                                  unit_symbol, dim_type=info.dim_type)
+        half = 0.5 * text_width_mm
+        x_row = frame.row_x_mm(pos)
+        v_row = frame.row_v_mm(pos)
+        layout.add_fixed(row, x_row - half - padding_mm, x_row + half + padding_mm,
+                         v_row - half_band, v_row + half_band)
+        added += 1
+    return added
+
+@logger.timed("resolve_overlaps")
+def resolve_overlaps(items, levels):
+    """Move texts with level > 0 out from the line. levels: {key: level} from OverlapLayout.solve()."""
+    for it in items:
+        lvl = levels.get(it["key"], 0)
+        if lvl <= 0:
             continue
-        sign = 1.0 if it["u"] >= baseline_u else -1.0
-        u_target_mm = baseline_u + sign * (lvl * step_mm)
-        u_ft = mm_to_internal(u_target_mm)
-        p_target = p_line + up * u_ft
+        seg = it["seg"]
+        origin, along, up = get_dim_frame(it["dim"], it["view"])
+        sign = 1.0 if it["u"] >= it["baseline_u"] else -1.0
+        u_target_mm = it["baseline_u"] + sign * (lvl * it["step_mm"])
+        p_target = it["p_line"] + up * mm_to_internal(u_target_mm)
 
         # idempotency guard
         cur = getattr(seg, "TextPosition", None)
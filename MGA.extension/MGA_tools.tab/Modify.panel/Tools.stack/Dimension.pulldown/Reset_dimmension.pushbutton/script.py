@@ -1,4 +1,3 @@
-
 # encoding: utf-8
 """
 pyRevit (Revit 2026)  Reset dimensjonstekst
@@ -6,44 +5,110 @@ pyRevit (Revit 2026)  Reset dimensjonstekst
 Mål:
 1) Flytt tekster på mållinjer tilbake til orinal posisjon
 
+Valde mållinjer, eller alle i aktivt view. Shift-klikk: velg views / alle views på ark.
+Tekster som allereie står i default posisjon blir ikkje rørt.
 """
 
 
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, Dimension
 
 
-from tools._transactions import revit_groupTransaction, revit_transaction
+from dimensionUtils._probe import DefaultTextPositions
+from tools._logger import ScriptLogger
+from tools._transactions import TransactionBatcher
+from tools._views import choose_views
 
 
 uidoc = __revit__.ActiveUIDocument
 doc   = uidoc.Document
 view  = uidoc.ActiveView
-view_scale = view.Scale
 
+logger = ScriptLogger(name='Reset_dimmension', log_to_file=True)
+
+CHUNK_SIZE = None       # None = éin transaksjon. Sett t.d. 2000 for svært store prosjekt
+TOL_FT = 0.5 / 304.8    # 0.5 mm
+
+
+def main(views=None):
+    if views is None and globals().get("__shiftclick__", False):
+        views = choose_views(doc, view, u"Reset mållinjetekst")
+        if not views:
+            return
+
+    with logger.timed("collect dimensions"):
+        if views is None:
+            dims = get_element(doc, view, uidoc)
+        else:
+            dims = [d for v in views for d in get_view_dimensions(doc, v)]
+
+    # Default posisjonar for alle tekster i éin rulla-tilbake transaksjon
+    defaults = DefaultTextPositions(doc, logger)
+    with logger.timed("probe default text positions"):
+        defaults.probe(dims)
+
+    with logger.timed("plan"):
+        resets, total = plan_resets(dims, defaults)
+
+    with logger.timed("reset"):
+        with TransactionBatcher(doc, "Reset", chunk_size=CHUNK_SIZE, logger=logger) as batch:
+            batch.extend(resets)
 
-def main():
-    dims = (FilteredElementCollector(doc, view.Id)
+    for edit, e in batch.failed:
+        print(e)
+    logger.count("texts", total)
+    logger.count("texts reset", batch.applied)
+    logger.info("Reset {} av {} tekster ({} feila)".format(batch.applied, total, len(batch.failed)))
+    logger.emit_summary()
+
+
+def get_element(doc, view, uidoc):
+    """Selected dimensions, or all dimensions in the view if nothing is selected."""
+    sel_ids = list(uidoc.Selection.GetElementIds())
+    if sel_ids:
+        return [el for el in (doc.GetElement(eid) for eid in sel_ids) if isinstance(el, Dimension)]
+    return get_view_dimensions(doc, view)
+
+
+def get_view_dimensions(doc, view):
+    logger.count("collectors")
+    return (FilteredElementCollector(doc, view.Id)
             .OfCategory(BuiltInCategory.OST_Dimensions)
             .WhereElementIsNotElementType()
             .ToElements())
 
 
-    # PASS A: plan moves for "does not fit"
-    with revit_groupTransaction(doc, "Reset"):
-        for dim in dims:
-            if dim.Segments.Size > 1:
-                with revit_transaction(doc, "Reset Dim"):
-                    for i in dim.Segments:
-                        try:
-                            i.ResetTextPosition()
-                        except Exception as e:
-                            print(e)
-            else:
-                with revit_transaction(doc, "Reset Dim"):
-                    try:
-                        dim.ResetTextPosition()
-                    except Exception as e:
-                        print(e)
+def plan_resets(dims, defaults):
+    """ResetTextPosition calls for texts that are not at their default position.
+
+    Returns (edits, number of texts checked).
+    """
+    edits = []
+    total = 0
+    for dim in dims:
+        segments = list(dim.Segments) if dim.NumberOfSegments > 0 else []
+        if segments:
+            for index, seg in enumerate(segments):
+                total += 1
+                if _is_moved(seg, defaults.default(dim, index), defaults.failed(dim, index)):
+                    edits.append(seg.ResetTextPosition)
+        else:
+            total += 1
+            if _is_moved(dim, defaults.default(dim), defaults.failed(dim)):
+                edits.append(dim.ResetTextPosition)
+    return edits, total
+
+
+def _is_moved(dim_like, default, failed):
+    if failed:
+        return False    # kan ikkje resetjast (t.d. summasjonsmål)
+    try:
+        current = dim_like.TextPosition
+    except Exception:
+        return False
+    if current is None or default is None:
+        return False
+    return current.DistanceTo(default) >= TOL_FT
+
 
 if __name__ == "__main__":
     main()
@@ -1,19 +1,63 @@
 # encoding: utf-8
-import os
-
-
-this_dir = os.path.dirname(__file__)
-
-
-# Go up one folder (to Mark.splitpushbutton) then into DoorID.pushbutton
-door_script = os.path.abspath(os.path.join(this_dir, '..', 'MoveDoorTags.pushbutton', 'script.py'))
-window_script = os.path.abspath(os.path.join(this_dir, '..', 'MoveWindowTags.pushbutton', 'script.py'))
-
-
-
-
-# Kjøre dem med execfile (IronPython)
-exec(open(door_script).read())
-exec(open(window_script).read()) 
-
-
+""" 
+Author Alexander Gilje
+title: Move Door and Window Tags
+Date: 12.09.2025
+"""
+#  _  _      ____  ____  ____  _____ 
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \  
+# | || |  |||  __/| \_/||    /  | |  
+# \_/\_/  \|\_/   \____/\_/\_\  \_/ IMPORTS
+#----------------------------------STANDARD LIBRARY IMPORTS----------------------------------#
+
+#---------------------------- AUTODESK REVIT AND PYREVIT IMPORTS ----------------------------#
+from Autodesk.Revit.DB import BuiltInCategory
+
+#---------------------------- CUSTOM IMPORTS ----------------------------#
+
+from tagUtils._tag_placement import DOOR_TAG_OFFSETS, WINDOW_TAG_OFFSETS, TagPlacer
+
+#  _     ____  ____  _  ____  ____  _     _____ ____ 
+# / \ |\/  _ \/  __\/ \/  _ \/  __\/ \   /  __// ___\
+# | | //| / \||  \/|| || / \|| | //| |   |  \  |    \
+# | \// | |-|||    /| || |-||| |_\\| |_/\|  /_ \___ |
+# \__/  \_/ \|\_/\_\\_/\_/ \|\____/\____/\____\\____/ VARIABLES
+
+uidoc = __revit__.ActiveUIDocument
+doc   = uidoc.Document
+
+# Offset-tabellane (skala x linjer x retning) ligg i tagUtils/_tag_placement.py
+SPECS = {
+    BuiltInCategory.OST_DoorTags: DOOR_TAG_OFFSETS,
+    BuiltInCategory.OST_WindowTags: WINDOW_TAG_OFFSETS,
+}
+
+#  _____ _     _      ____  _____  _  ____  _      ____ 
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+
+#----------------------------------------MAIN------------------------------------------------#
+
+def main():
+    view = uidoc.ActiveView
+
+    placer = TagPlacer(doc, view, SPECS)
+    report = placer.run('Move Door and Window Tags')
+
+    if not report["tags"]:
+        print('❌ No Door or Window tags found')
+        return
+    if report["failed"]:
+        print('❌ Failed to move {} tags'.format(report["failed"]))
+
+#  _      ____  _  _     
+# / \__/|/  _ \/ \/ \  /|
+# | |\/||| / \|| || |\ ||
+# | |  ||| |-||| || | \||
+# \_/  \|\_/ \|\_/\_/  \| MAIN SCRIPT
+
+if __name__ == '__main__':
+    main()
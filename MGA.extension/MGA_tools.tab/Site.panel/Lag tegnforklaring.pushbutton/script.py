@@ -98,13 +98,13 @@ def norm_txt(s):
     s = s.replace(u"\u00A0", u" ")     # NBSP -> space
     s = s.replace(u"–", u"-")          # en dash -> hyphen
     s = unicodedata.normalize('NFC', s).strip()
-    s = re.sub(ur"\s*-\s*", u" - ", s) # standardiser mellomrom rundt '-'
-    s = re.sub(ur"\s{2,}", u" ", s)    # klem dobbel-space
+    s = re.sub(r"\s*-\s*", u" - ", s) # standardiser mellomrom rundt '-'
+    s = re.sub(r"\s{2,}", u" ", s)    # klem dobbel-space
     return s
 
 def key(s):
     """Robust nøkkel for likhetssjekk: små bokstaver, uten spaces."""
-    return re.sub(ur"\s+", u"", norm_txt(s)).lower()
+    return re.sub(r"\s+", u"", norm_txt(s)).lower()
 
 def _fr_type_name(fr_type):
     if not fr_type:
@@ -32,6 +32,7 @@ from Autodesk.Revit.DB import BuiltInCategory, BuiltInParameter, FilteredElement
 from Autodesk.Revit.UI import\
     UIApplication
 
+from parameterUtils._bulk_writer import ParameterHandleCache, element_id_value
 from tools._transactions import revit_transaction
 
 #  ____  ____  ____  ____  _____ ____  _____  _  _____ ____ 
@@ -66,6 +67,10 @@ colors = ["0,186,196,140",
     "0,237,160,79",
     "0,200,140,100",
     "0,200,200,200"]
+
+SEKSJON_TYPE = "Seksjonering"           # del av typenamnet på seksjoneringsregionar
+SEKSJON_PARAMETER = "Seksjon"
+COLOR_PARAMETER = "Color Override"
 #  _____ _     _      ____  _____  _  ____  _      ____ 
 # /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
 # |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
@@ -77,16 +82,11 @@ def main():
 
     uiapp = UIApplication(__revit__.Application)
     app = Seksjonering(doc, uiapp)
-    filled_region_list = []
+    handles = ParameterHandleCache()
     filled_regions = FilteredElementCollector(doc, view.Id).OfClass(FilledRegion).WhereElementIsNotElementType().ToElements()
-    seksjoner = set()
-    for fr in filled_regions:
-        fr_type = doc.GetElement(fr.GetTypeId())
-        type_name = fr_type.get_Parameter(DB.BuiltInParameter.SYMBOL_NAME_PARAM).AsString()
-        if("Seksjonering" in type_name):
-            seksjoner.add(fr.LookupParameter("Seksjon").AsString())
-      
-    sorted_seksjoner = list(sorted(seksjoner))
+    classified = classify(filled_regions, handles)
+
+    sorted_seksjoner = sorted(set(seksjon for fr, seksjon in classified))
     for seksjon in sorted_seksjoner:
         cb = CheckBox()
         cb.Content = seksjon
@@ -102,41 +102,81 @@ def main():
     if not valgt_seksjoner:
         print("Ingen seksjoner valgt.")
         return
-    color_lookup = dict(zip(sorted_seksjoner,colors))
-    solid_fill_id = get_solid_fill_pattern_id(doc)
-    
-    seksjon = ""
-    
-    with revit_transaction(doc,"Set color"):
-
-        for fr in filled_regions:
-            fr_type = doc.GetElement(fr.GetTypeId())
-            type_name = fr_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString()
-
-            if "Seksjonering" in type_name:
-                seksjon = fr.LookupParameter("Seksjon").AsString()
-            if not seksjon or seksjon not in color_lookup:
-                continue
-            
-            color_string = color_lookup[seksjon]
-            current_override_param = fr.LookupParameter("Color Override")
-            param_to_set = fr.LookupParameter("Color Override")
-            if current_override_param and current_override_param.AsString() == color_string:
-                continue  # Farge er oppdatert og korrekt            set_param = param_to_set.Set(
-
-            
-            if current_override_param and current_override_param.IsReadOnly == False:
-                current_override_param.Set(color_string)
-            color = parse_color(color_lookup[seksjon])
-            ogs = OverrideGraphicSettings()
-            ogs.SetSurfaceForegroundPatternId(solid_fill_id)
-            ogs.SetSurfaceForegroundPatternColor(color)
-
-            doc.ActiveView.SetElementOverrides(fr.Id, ogs)
-
 
+    # Fargen følgjer plassen i den sorterte lista over alle seksjonar, så ein seksjon
+    # får same farge same kva som er valt
+    color_lookup = dict((seksjon, color) for seksjon, color in zip(sorted_seksjoner, colors)
+                        if seksjon in valgt_seksjoner)
+    planned = plan_colors(classified, color_lookup, handles)
+    if planned:
+        apply_colors(planned, view, get_solid_fill_pattern_id(doc))
+
+
+def type_name(fr, names):
+    """Typenamnet (SYMBOL_NAME_PARAM) til regionen. names: {type id: namn}, les kvar type éin gong."""
+    type_id = fr.GetTypeId()
+    key = element_id_value(type_id)
+    name = names.get(key)
+    if name is None:
+        fr_type = doc.GetElement(type_id)
+        param = fr_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM) if fr_type is not None else None
+        name = names[key] = (param.AsString() if param is not None else None) or ""
+    return name
+
+
+def classify(filled_regions, handles):
+    """Éin gjennomgang: [(region, seksjon)] for seksjoneringsregionar med verdi i Seksjon."""
+    names = {}
+    classified = []
+    for fr in filled_regions:
+        if SEKSJON_TYPE not in type_name(fr, names):
+            continue
+        param = handles.get(fr, SEKSJON_PARAMETER)
+        seksjon = param.AsString() if param is not None else None
+        if seksjon:
+            classified.append((fr, seksjon))
+    return classified
+
+
+def plan_colors(classified, color_lookup, handles):
+    """[(region, seksjon, farge, Color Override-parameter eller None)] for regionar som skal endrast.
+
+    Regionar der Color Override alt har rett farge blir hoppa over.
+    """
+    planned = []
+    for fr, seksjon in classified:
+        color_string = color_lookup.get(seksjon)
+        if color_string is None:
+            continue
+        param = handles.get(fr, COLOR_PARAMETER)
+        if param is not None and param.AsString() == color_string:
+            continue  # Farge er oppdatert og korrekt
+        planned.append((fr, seksjon, color_string, param))
+    return planned
+
+
+def apply_colors(planned, view, solid_fill_id):
+    """Set Color Override and the view override for every planned region in one transaction.
+
+    One OverrideGraphicSettings per colour, shared by all regions with that colour.
+    """
+    overrides = {}
+    with revit_transaction(doc, "Set color"):
+        for fr, seksjon, color_string, param in planned:
+            if param is not None and not param.IsReadOnly:
+                param.Set(color_string)
+            ogs = overrides.get(color_string)
+            if ogs is None:
+                ogs = overrides[color_string] = color_override(color_string, solid_fill_id)
+            view.SetElementOverrides(fr.Id, ogs)
+
+
+def color_override(color_string, solid_fill_id):
+    ogs = OverrideGraphicSettings()
+    ogs.SetSurfaceForegroundPatternId(solid_fill_id)
+    ogs.SetSurfaceForegroundPatternColor(parse_color(color_string))
+    return ogs
 
-    
 def get_solid_fill_pattern_id(doc):
     """Returnerer ElementId for solid fill pattern."""
     collector = FilteredElementCollector(doc).OfClass(FillPatternElement)
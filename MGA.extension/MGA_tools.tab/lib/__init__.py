@@ -1,33 +1,84 @@
-from tools._transactions import revit_transaction
-from tools._transactions import try_and_except
+# encoding: utf-8
+"""
+Felles bibliotek for MGA-knappene.
 
-from tools._export import print_exising_sheet_set
-from tools._export import get_existing_sheet_set
-from tools._export import export_to_csv
+Navnene under importeres først når de brukes (lazy), så `import lib` i seg selv
+drar ikke inn requests, pybase64, WinForms, csv osv. Knappene importerer i dag
+modulene direkte (tools._export, muaUtils._mua ...) og går ikke via denne fila;
+deres importtid avhenger av modulene selv (se benchmarks/import_time.py).
+"""
+import sys
+import types
 
-from tools._file_magement import open_first_file_with_prefix
+# navn -> (modul, attributt, import-nivå). Nivå 1 = relativ import (from .X import Y)
+_LAZY_ATTRS = {
+    "revit_transaction":                ("tools._transactions", "revit_transaction", 0),
+    "try_and_except":                   ("tools._transactions", "try_and_except", 0),
+    "TransactionBatcher":               ("tools._transactions", "TransactionBatcher", 0),
 
-from formsWindow._forms import dialogwindow_TextInput
-from formsWindow._forms import InputForm, InputElement, OutputForm
+    "print_exising_sheet_set":          ("tools._export", "print_exising_sheet_set", 0),
+    "get_existing_sheet_set":           ("tools._export", "get_existing_sheet_set", 0),
+    "export_to_csv":                    ("tools._export", "export_to_csv", 0),
+    "export_to_xlsx":                   ("tools._export", "export_to_xlsx", 0),
 
-from.Snippets._convert import convert_internal_to_mm
-from.Snippets._convert import convert_mm_to_internal
-from.Snippets._convert import convert_m_to_internal
-from.Snippets._convert import convert_length_to_internal
-from.Snippets._convert import get_length_units
+    "open_first_file_with_prefix":      ("tools._file_magement", "open_first_file_with_prefix", 0),
 
-from pybase64 import standard_b64decode
-from pybase64 import standard_b64encode
+    "dialogwindow_TextInput":           ("formsWindow._forms", "dialogwindow_TextInput", 0),
+    "InputForm":                        ("formsWindow._forms", "InputForm", 0),
+    "InputElement":                     ("formsWindow._forms", "InputElement", 0),
+    "OutputForm":                       ("formsWindow._forms", "OutputForm", 0),
 
-from parameterUtils._update_lookup_params import update_lookup_parameters
-from parameterUtils._update_lookup_params import change_ProjectParameter_Value
+    "convert_internal_to_mm":           ("Snippets._convert", "convert_internal_to_mm", 1),
+    "convert_mm_to_internal":           ("Snippets._convert", "convert_mm_to_internal", 1),
+    "convert_m_to_internal":            ("Snippets._convert", "convert_m_to_internal", 1),
+    "convert_length_to_internal":       ("Snippets._convert", "convert_length_to_internal", 1),
+    "get_length_units":                 ("Snippets._convert", "get_length_units", 1),
 
-from acc_tools._auth_token import OAuthClient
-from acc_tools.acc_utills import download_file_from_ACC
+    "standard_b64decode":               ("pybase64", "standard_b64decode", 0),
+    "standard_b64encode":               ("pybase64", "standard_b64encode", 0),
 
-from utills._stringUtills import pad_string
-from utills._stringUtills import check_stringlenght_add_missing
+    "update_lookup_parameters":         ("parameterUtils._update_lookup_params", "update_lookup_parameters", 0),
+    "change_ProjectParameter_Value":    ("parameterUtils._update_lookup_params", "change_ProjectParameter_Value", 0),
+    "BulkParameterWriter":              ("parameterUtils._bulk_writer", "BulkParameterWriter", 0),
 
-from utills._metadata import Metadata_Handler
+    "OAuthClient":                      ("acc_tools._auth_token", "OAuthClient", 0),
+    "download_file_from_ACC":           ("acc_tools.acc_utills", "download_file_from_ACC", 0),
 
-from tools._logger import ScriptLogger
\ No newline at end of file
+    "pad_string":                       ("utills._stringUtills", "pad_string", 0),
+    "check_stringlenght_add_missing":   ("utills._stringUtills", "check_stringlenght_add_missing", 0),
+
+    "Metadata_Handler":                 ("utills._metadata", "Metadata_Handler", 0),
+
+    "ScriptLogger":                     ("tools._logger", "ScriptLogger", 0),
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+
+
+class _LazyModule(types.ModuleType):
+    """Modul som slår opp navnene i _LAZY_ATTRS ved første bruk.
+
+    Module-level __getattr__ (PEP 562) finnes ikke i IronPython 2.7, derfor
+    byttes modulen i sys.modules ut med en instans av denne klassen.
+    """
+
+    def __getattr__(self, name):
+        try:
+            module_name, attr, level = _LAZY_ATTRS[name]
+        except KeyError:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name))
+        module = __import__(module_name, _original.__dict__, {}, [attr], level)
+        value = getattr(module, attr)
+        setattr(self, name, value)   # neste oppslag går direkte
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_LAZY_ATTRS))
+
+
+# Behold referanse til originalmodulen; i Python 2 nullstilles globals når den slettes.
+_original = sys.modules[__name__]
+_lazy = _LazyModule(__name__, __doc__)
+_lazy.__dict__.update(dict((k, v) for k, v in _original.__dict__.items() if k.startswith("__")))
+_lazy._original = _original
+sys.modules[__name__] = _lazy
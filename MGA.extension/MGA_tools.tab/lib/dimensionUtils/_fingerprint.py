@@ -0,0 +1,60 @@
+# encoding: utf-8
+"""
+Fingerprint of a dimension for dirty-only reruns (see tools._sidecar).
+
+Covers what the planning in Dimensionline_clean reads: type (and its text
+size), view scale, line origin/direction and value + text position per text.
+"""
+from Autodesk.Revit.DB import BuiltInParameter
+
+from parameterUtils._bulk_writer import element_id_value
+from tools._sidecar import fingerprint
+
+
+def _xyz(p):
+    if p is None:
+        return None
+    return u"{:.6f},{:.6f},{:.6f}".format(p.X, p.Y, p.Z)
+
+
+def _num(v):
+    return None if v is None else u"{:.6f}".format(v)
+
+
+def _attr(obj, name):
+    try:
+        return getattr(obj, name, None)
+    except Exception:     # TextPosition kan kaste for enkelte måltypar
+        return None
+
+
+def _text_size(dim_type):
+    try:
+        return dim_type.get_Parameter(BuiltInParameter.TEXT_SIZE).AsDouble()
+    except Exception:
+        return None
+
+
+def dimension_fingerprint(dim, view, text_size=None):
+    """text_size: the type's TEXT_SIZE if already known (any unit), else read from the type."""
+    parts = [element_id_value(dim.GetTypeId()), view.Scale]
+    if text_size is None:
+        text_size = _text_size(dim.Document.GetElement(dim.GetTypeId()))
+    parts.append(_num(text_size))
+    try:
+        curve = dim.Curve
+        parts.append(_xyz(curve.Origin))
+        parts.append(_xyz(curve.Direction))
+    except Exception:
+        parts.append(None)
+
+    segments = []
+    try:
+        if dim.NumberOfSegments > 0:
+            segments = list(dim.Segments)
+    except Exception:
+        pass
+    for obj in segments or [dim]:
+        parts.append(_num(_attr(obj, "Value")))
+        parts.append(_xyz(_attr(obj, "TextPosition")))
+    return fingerprint(*parts)
@@ -0,0 +1,156 @@
+# encoding: utf-8
+"""
+Dimension frame (origin, along, up) as plain float tuples.
+
+All projection math here is pure Python, so it runs (and can be tested)
+without Revit. Only DimFrame.from_dimension() and xyz_tuple() touch Revit objects.
+"""
+import math
+
+from parameterUtils._bulk_writer import element_id_value
+
+MM_PER_FOOT = 304.8     # Revit internal units are feet
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def xyz_tuple(p):
+    """XYZ -> (x, y, z). Tuples pass through unchanged."""
+    if isinstance(p, tuple):
+        return p
+    return (p.X, p.Y, p.Z)
+
+
+def dot(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0])
+
+
+def normalize(v):
+    length = math.sqrt(dot(v, v))
+    if length == 0.0:
+        return (0.0, 0.0, 0.0)
+    return (v[0] / length, v[1] / length, v[2] / length)
+
+
+def mm_to_feet(mm):
+    return mm / MM_PER_FOOT
+
+
+def feet_to_mm(ft):
+    return ft * MM_PER_FOOT
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class DimFrame(object):
+    """Local frame of a dimension line in the view plane.
+
+    along = line direction, up = view direction x along, both unit vectors.
+    Positions are returned in mm: x along the line, u out from it.
+
+    Args:
+        origin, along, view_dir: (x, y, z) tuples in feet.
+        xyz: Optional (origin, along, up) as Revit XYZ, for building target points.
+    """
+
+    __slots__ = ("origin", "along", "up", "xyz")
+
+    def __init__(self, origin, along, view_dir, xyz=None):
+        self.origin = origin
+        self.along = normalize(along)
+        self.up = normalize(cross(normalize(view_dir), self.along))
+        self.xyz = xyz
+
+    @classmethod
+    def from_dimension(cls, dim, view):
+        curve = dim.Curve
+        along = curve.Direction.Normalize()
+        view_dir = view.ViewDirection.Normalize()
+        up = view_dir.CrossProduct(along).Normalize()
+        return cls(xyz_tuple(curve.Origin), xyz_tuple(along), xyz_tuple(view_dir),
+                   xyz=(curve.Origin, along, up))
+
+    def project(self, p):
+        """(x_mm, u_mm) for one point (XYZ or tuple)."""
+        p = xyz_tuple(p)
+        o, a, n = self.origin, self.along, self.up
+        dx, dy, dz = p[0] - o[0], p[1] - o[1], p[2] - o[2]
+        return ((dx * a[0] + dy * a[1] + dz * a[2]) * MM_PER_FOOT,
+                (dx * n[0] + dy * n[1] + dz * n[2]) * MM_PER_FOOT)
+
+    def project_many(self, points):
+        """[(x_mm, u_mm)] for many points in one pass. None stays None."""
+        ox, oy, oz = self.origin
+        ax, ay, az = self.along
+        nx, ny, nz = self.up
+        out = []
+        for p in points:
+            if p is None:
+                out.append(None)
+                continue
+            x, y, z = xyz_tuple(p)
+            dx, dy, dz = x - ox, y - oy, z - oz
+            out.append(((dx * ax + dy * ay + dz * az) * MM_PER_FOOT,
+                        (dx * nx + dy * ny + dz * nz) * MM_PER_FOOT))
+        return out
+
+    def along_mm(self, p):
+        return self.project(p)[0]
+
+    def up_mm(self, p):
+        return self.project(p)[1]
+
+    def _row_axis(self):
+        """along, flipped so opposite dimensions on the same line share one axis."""
+        a = self.along
+        for c in a:
+            if abs(c) > 1e-9:
+                return a if c > 0 else (-a[0], -a[1], -a[2])
+        return a
+
+    def _row_normal(self):
+        """Unit vector in the view plane across the row axis (same for all dims with the same axis)."""
+        return normalize(cross(cross(self.along, self.up), self._row_axis()))
+
+    def axis_key(self):
+        """Same key for all dimension lines with the same direction (parallel rows)."""
+        return tuple(round(c, 4) for c in self._row_axis())
+
+    def row_x_mm(self, p):
+        """Position along the row axis, comparable between dimensions with the same axis_key."""
+        return dot(xyz_tuple(p), self._row_axis()) * MM_PER_FOOT
+
+    def row_v_mm(self, p):
+        """Position across the row axis, comparable between dimensions with the same axis_key."""
+        return dot(xyz_tuple(p), self._row_normal()) * MM_PER_FOOT
+
+
+class DimFrames(object):
+    """DimFrame per dimension for one view, computed once."""
+
+    def __init__(self, view):
+        self.view = view
+        self._frames = {}
+
+    def get(self, dim):
+        key = element_id_value(dim.Id)
+        frame = self._frames.get(key)
+        if frame is None:
+            frame = self._frames[key] = DimFrame.from_dimension(dim, self.view)
+        return frame
@@ -0,0 +1,206 @@
+# encoding: utf-8
+"""
+Overlap layout for dimension texts.
+
+Texts are boxes: a span [x0, x1] (mm) along the dimension direction and a
+band [v0, v1] (mm) across it. All dimension lines with the same direction are
+laid out together, so texts collide when both the spans and the bands overlap:
+collinear dimensions (a chain split in several dimensions) as well as
+parallel, closely spaced dimension strings.
+Plain Python, no Revit objects.
+"""
+import bisect
+import heapq
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def _order(spans):
+    return sorted(range(len(spans)), key=lambda i: (spans[i][0], spans[i][1]))
+
+
+def overlap_clusters(spans):
+    """Group overlapping spans. spans: [(x0, x1)]. Returns [[index, ...]] sorted along the row."""
+    clusters = []
+    cur = []
+    cur_max = None
+    for i in _order(spans):
+        x0, x1 = spans[i]
+        if cur and x0 < cur_max:
+            cur.append(i)
+            cur_max = max(cur_max, x1)
+        else:
+            if cur:
+                clusters.append(cur)
+            cur = [i]
+            cur_max = x1
+    if cur:
+        clusters.append(cur)
+    return clusters
+
+
+def _fixed_index(fixed):
+    """{level: (sorted starts, running max of ends)} for fixed spans [(x0, x1, level)]."""
+    by_level = {}
+    for x0, x1, lvl in fixed:
+        by_level.setdefault(lvl, []).append((x0, x1))
+    index = {}
+    for lvl, spans in by_level.items():
+        spans.sort()
+        reach = []
+        end = None
+        for x0, x1 in spans:
+            end = x1 if end is None else max(end, x1)
+            reach.append(end)
+        index[lvl] = ([x0 for x0, _ in spans], reach)
+    return index
+
+
+def _blocked(index, lvl, x0, x1):
+    """True if a fixed span on lvl overlaps [x0, x1]. O(log n)."""
+    entry = index.get(lvl)
+    if entry is None:
+        return False
+    starts, reach = entry
+    n = bisect.bisect_left(starts, x1)     # fixed spans that start before x1
+    return n > 0 and reach[n - 1] > x0
+
+
+def assign_levels(spans, fixed=()):
+    """Lowest free level for every span (sweep line). Level 0 = stays on the line.
+
+    Active spans are kept in a heap by end, released levels in a heap of free
+    levels, so n spans cost O(n log n) instead of O(n * levels).
+    fixed: [(x0, x1, level)] obstacles that keep their level; a span never gets
+    a level held by a fixed span it overlaps.
+    """
+    index = _fixed_index(fixed) if fixed else None
+    levels = [0] * len(spans)
+    active = []     # (x1, level)
+    free = []       # released levels
+    next_level = 0
+    for i in _order(spans):
+        x0, x1 = spans[i]
+        while active and active[0][0] <= x0:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        skipped = []
+        while True:
+            if free:
+                lvl = heapq.heappop(free)
+            else:
+                lvl = next_level
+                next_level += 1
+            if index is None or not _blocked(index, lvl, x0, x1):
+                break
+            skipped.append(lvl)
+        for lvl_skipped in skipped:
+            heapq.heappush(free, lvl_skipped)
+        levels[i] = lvl
+        heapq.heappush(active, (x1, lvl))
+    return levels
+
+
+def band_groups(bands):
+    """Group bands [(v0, v1)] that overlap or touch, directly or through others. Returns [[index, ...]]."""
+    groups = []
+    cur = []
+    cur_max = None
+    for i in sorted(range(len(bands)), key=lambda i: bands[i]):
+        v0, v1 = bands[i]
+        if cur and v0 <= cur_max:
+            cur.append(i)
+            cur_max = max(cur_max, v1)
+        else:
+            if cur:
+                groups.append(cur)
+            cur = [i]
+            cur_max = v1
+    if cur:
+        groups.append(cur)
+    return groups
+
+
+def assign_levels_banded(spans, bands, fixed=(), fixed_bands=()):
+    """Like assign_levels, but only spans in the same band group block each other.
+
+    spans: [(x0, x1)], bands: [(v0, v1)]; fixed/fixed_bands as for assign_levels.
+    Bands that overlap (also through a chain of other bands) form one group, and
+    each group gets its own heap sweep, so texts on parallel strings that do not
+    touch across the line can share a level. Still O(n log n).
+    """
+    n = len(spans)
+    levels = [0] * n
+    for group in band_groups(list(bands) + list(fixed_bands)):
+        own = [i for i in group if i < n]
+        if not own:
+            continue
+        obstacles = [fixed[i - n] for i in group if i >= n]
+        for i, lvl in zip(own, assign_levels([spans[i] for i in own], obstacles)):
+            levels[i] = lvl
+    return levels
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class OverlapLayout(object):
+    """Collect text spans from many dimensions in a view and give each a level.
+
+    Texts are grouped by direction (row = frame.axis_key()). Within a
+    direction a text only pushes texts whose band across the line overlaps
+    its own; without bands every text of the row is in the same band.
+    Texts that must stay where they are (not moved in this run, other dims in
+    the view) are added with add_fixed: they keep their level and only push.
+
+    Example:
+        layout = OverlapLayout()
+        for it in items:                    # all dims in the view
+            layout.add(it["key"], frame.axis_key(), it["x0"], it["x1"], it["v0"], it["v1"])
+        for it in others:                   # texts that stay
+            layout.add_fixed(frame.axis_key(), it["x0"], it["x1"], it["v0"], it["v1"])
+        levels = layout.solve()             # {key: level}
+        logger.count("overlap labels moved", layout.moved)
+    """
+
+    def __init__(self):
+        self._rows = {}     # row -> ([key], [(x0, x1)], [(v0, v1)], [(x0, x1, level)], [(v0, v1)])
+        self.levels = {}
+        self.moved = 0
+
+    def __len__(self):
+        return sum(len(row[0]) for row in self._rows.values())
+
+    def _row(self, row):
+        return self._rows.setdefault(row, ([], [], [], [], []))
+
+    def add(self, key, row, x0, x1, v0=0.0, v1=0.0):
+        keys, spans, bands = self._row(row)[:3]
+        keys.append(key)
+        spans.append((x0, x1))
+        bands.append((v0, v1))
+
+    def add_fixed(self, row, x0, x1, v0=0.0, v1=0.0, level=0):
+        """Obstacle: a text that keeps its level. Not counted by len() and not in solve()."""
+        fixed, fixed_bands = self._row(row)[3:]
+        fixed.append((x0, x1, level))
+        fixed_bands.append((v0, v1))
+
+    def solve(self):
+        """Returns {key: level}. self.moved = texts that got a level above 0."""
+        self.levels = {}
+        for keys, spans, bands, fixed, fixed_bands in self._rows.values():
+            if not keys:
+                continue
+            for key, lvl in zip(keys, assign_levels_banded(spans, bands, fixed, fixed_bands)):
+                self.levels[key] = lvl
+        self.moved = sum(1 for lvl in self.levels.values() if lvl > 0)
+        return self.levels
@@ -0,0 +1,162 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+
+from Autodesk.Revit.DB import Transaction
+
+from parameterUtils._bulk_writer import element_id_value
+
+SINGLE = -1         # segment index used for a dimension without segments
+_FAILED = object()  # ResetTextPosition threw for this text
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def text_key(dim, index=SINGLE):
+    """Stable key for one dimension text: (dimension id, segment index).
+
+    DimensionSegment has no id, and in IronPython every iteration over
+    dim.Segments gives new wrapper objects, so id(seg) is not stable between passes.
+    """
+    return (element_id_value(dim.Id), index)
+
+
+def _segments(dim):
+    try:
+        if dim.NumberOfSegments > 0:
+            return list(dim.Segments)
+    except Exception:
+        pass
+    return []
+
+
+def _reset_and_read(dim_like):
+    try:
+        dim_like.ResetTextPosition()
+    except Exception:
+        return _FAILED
+    return getattr(dim_like, "TextPosition", None)
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class DefaultTextPositions(object):
+    """Default (unmoved) text positions for dimensions, probed in one rolled-back transaction.
+
+    Revit only tells the default position after ResetTextPosition(), so every
+    text is reset inside a transaction that is rolled back. Doing that for all
+    dimensions at once replaces one probe transaction per segment.
+
+    Example:
+        defaults = DefaultTextPositions(doc, logger)
+        defaults.probe(dims)
+        p_line = defaults.line_point(dim, index)    # projected onto the dim line
+        moved = defaults.is_moved(dim)              # single dimension moved by user?
+
+    Args:
+        doc: Revit document.
+        logger: Optional ScriptLogger (counts "probe transactions").
+    """
+
+    def __init__(self, doc, logger=None):
+        self.doc = doc
+        self.logger = logger
+        self._defaults = {}     # text_key -> XYZ / None / _FAILED
+        self._line_points = {}
+        self.probes = 0
+
+    def __contains__(self, key):
+        return key in self._defaults
+
+    def probe(self, dims):
+        """Reset all texts of dims not probed yet and store the defaults. One transaction."""
+        todo = [d for d in dims if text_key(d) not in self._defaults]
+        if not todo:
+            return
+        self.probes += 1
+        if self.logger:
+            self.logger.count("probe transactions")
+
+        t = Transaction(self.doc, "Probe default text positions")
+        t.Start()
+        try:
+            for dim in todo:
+                segments = _segments(dim)
+                for index, seg in enumerate(segments):
+                    self._defaults[text_key(dim, index)] = _reset_and_read(seg)
+                self._defaults[text_key(dim)] = None if segments else _reset_and_read(dim)
+        finally:
+            if t.HasStarted():
+                t.RollBack()    # never commit, we only probe
+
+    def _get(self, dim, index):
+        key = text_key(dim, index)
+        if key not in self._defaults:
+            self.probe([dim])
+        return self._defaults.get(key)
+
+    def default(self, dim, index=SINGLE):
+        """Default TextPosition, or None if unknown."""
+        value = self._get(dim, index)
+        return None if value is _FAILED else value
+
+    def failed(self, dim, index=SINGLE):
+        """True if ResetTextPosition() threw for this text."""
+        return self._get(dim, index) is _FAILED
+
+    def line_point(self, dim, index=SINGLE):
+        """Default text position projected onto the dimension line (falls back to Curve.Origin)."""
+        key = text_key(dim, index)
+        if key not in self._line_points:
+            self._line_points[key] = self._project(dim, self.default(dim, index))
+        return self._line_points[key]
+
+    def is_moved(self, dim, tol_ft, index=SINGLE):
+        """True if the current TextPosition differs from the default by more than tol_ft.
+
+        A text that cannot be reset counts as moved (do not touch it).
+        """
+        if self.failed(dim, index):
+            return True
+        if index == SINGLE:
+            current = getattr(dim, "TextPosition", None)
+        else:
+            current = getattr(_segments(dim)[index], "TextPosition", None)
+        default = self.default(dim, index)
+        if current is None or default is None:
+            return not (current is None and default is None)
+        return current.DistanceTo(default) >= tol_ft
+
+    @staticmethod
+    def _project(dim, base):
+        if base is None:
+            try:
+                base = dim.Curve.Origin
+            except Exception:
+                return None
+        try:
+            pr = dim.Curve.Project(base)
+            if pr:
+                return pr.XYZPoint
+        except Exception:
+            pass
+        try:
+            return dim.Curve.Origin
+        except Exception:
+            return None
@@ -0,0 +1,178 @@
+# encoding: utf-8
+"""
+Text width estimate for dimension labels from per-glyph advance widths.
+
+Widths are fractions of the text size (em). A font is measured once with
+System.Drawing and the table is cached on disk per font name; without
+System.Drawing (or for an unknown font) the built-in Arial table is used.
+"""
+import json
+import os
+import tempfile
+
+from Autodesk.Revit.DB import BuiltInParameter
+
+from parameterUtils._bulk_writer import element_id_value
+
+CACHE_FILE = os.path.join(tempfile.gettempdir(), "MGA_glyph_widths.json")
+
+# Tegn som kan stå i ein måltekst
+GLYPHS = u"0123456789.,-+−±'\"°% ()/:=xXmMcCkK"
+
+# Arial advance widths / 1000 em
+ARIAL = {
+    u"0": 0.556, u"1": 0.556, u"2": 0.556, u"3": 0.556, u"4": 0.556,
+    u"5": 0.556, u"6": 0.556, u"7": 0.556, u"8": 0.556, u"9": 0.556,
+    u".": 0.278, u",": 0.278, u"-": 0.333, u"+": 0.584, u"−": 0.584, u"±": 0.549,
+    u"'": 0.191, u"\"": 0.355, u"°": 0.400, u"%": 0.889, u" ": 0.278,
+    u"(": 0.333, u")": 0.333, u"/": 0.278, u":": 0.278, u"=": 0.584,
+    u"x": 0.500, u"X": 0.667, u"m": 0.833, u"M": 0.833,
+    u"c": 0.500, u"C": 0.722, u"k": 0.500, u"K": 0.667,
+}
+DEFAULT_GLYPH = 0.556   # ukjent tegn: som eit siffer
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def measure_font(font_name, glyphs=GLYPHS):
+    """Advance width per glyph (em) measured with System.Drawing. None if not possible."""
+    try:
+        import clr
+        clr.AddReference("System.Drawing")
+        from System.Drawing import Bitmap, Font, GraphicsUnit, Graphics, StringFormat
+    except Exception:
+        return None
+
+    em = 100.0
+    try:
+        font = Font(font_name, em, GraphicsUnit.Pixel)
+        if font.Name.lower() != font_name.lower():
+            return None     # fonten finst ikkje, Windows har gitt oss ein annan
+        fmt = StringFormat.GenericTypographic
+        with Bitmap(1, 1) as bmp:
+            g = Graphics.FromImage(bmp)
+            try:
+                # "n<c>n" - "nn" gir advance for tegnet, også for mellomrom
+                nn = g.MeasureString(u"nn", font, 10000, fmt).Width
+                return dict((c, round((g.MeasureString(u"n" + c + u"n", font, 10000, fmt).Width - nn) / em, 4))
+                            for c in glyphs)
+            finally:
+                g.Dispose()
+    except Exception:
+        return None
+
+
+def _param(element, bip, default=None):
+    try:
+        p = element.get_Parameter(bip)
+    except Exception:
+        return default
+    if p is None:
+        return default
+    return p
+
+
+def type_font(text_type):
+    """(font name, width factor) for a DimensionType/TextNoteType."""
+    p = _param(text_type, BuiltInParameter.TEXT_FONT)
+    font = (p.AsString() if p else None) or u"Arial"
+    p = _param(text_type, BuiltInParameter.TEXT_WIDTH_SCALE)
+    width_factor = (p.AsDouble() if p else None) or 1.0
+    return font, width_factor
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class GlyphWidthTables(object):
+    """Glyph tables per font name, measured once and kept in CACHE_FILE."""
+
+    def __init__(self, cache_file=CACHE_FILE, measure=measure_font):
+        self.cache_file = cache_file
+        self.measure = measure
+        self._tables = self._load()
+        self._dirty = False
+
+    def _load(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write new measurements to disk (no-op if nothing was measured)."""
+        if not self._dirty or not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(self._tables, f, indent=1, sort_keys=True)
+            self._dirty = False
+        except (IOError, OSError):
+            pass
+
+    def table(self, font_name):
+        key = (font_name or u"Arial").lower()
+        table = self._tables.get(key)
+        if table is None:
+            table = self.measure(font_name) if self.measure else None
+            if table:
+                self._tables[key] = table
+                self._dirty = True
+            else:
+                table = ARIAL   # blir ikkje lagra, neste maskin kan måle
+        return table
+
+
+class TextWidthEstimator(object):
+    """Width of a label in mm: sum of glyph advances * text height * width factor.
+
+    Results are memoized per (string, text type).
+
+    Example:
+        widths = TextWidthEstimator()
+        w_mm = widths.width_mm(u"1250", dim_type, text_height_mm)
+        widths.save()
+
+    Args:
+        tables: Shared GlyphWidthTables (a new one with the default cache file if None).
+    """
+
+    def __init__(self, tables=None):
+        self.tables = tables or GlyphWidthTables()
+        self._types = {}    # type id -> (table, width factor)
+        self._memo = {}
+
+    def _type_info(self, text_type):
+        key = element_id_value(text_type.Id)
+        info = self._types.get(key)
+        if info is None:
+            font, width_factor = type_font(text_type)
+            info = self._types[key] = (self.tables.table(font), width_factor)
+        return key, info
+
+    def width_em(self, text, text_type):
+        """Width in units of text size."""
+        key, (table, width_factor) = self._type_info(text_type)
+        memo_key = (text, key)
+        width = self._memo.get(memo_key)
+        if width is None:
+            width = self._memo[memo_key] = width_factor * sum(table.get(c, DEFAULT_GLYPH) for c in text or u"")
+        return width
+
+    def width_mm(self, text, text_type, text_height_mm):
+        return self.width_em(text, text_type) * text_height_mm
+
+    def save(self):
+        self.tables.save()
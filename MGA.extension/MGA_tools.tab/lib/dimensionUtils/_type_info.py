@@ -0,0 +1,76 @@
+# encoding: utf-8
+"""
+Unit/format settings per DimensionType, resolved once per run.
+
+A view usually has only a handful of dimension types, so everything that
+comes from the type (format options, labels, text size) is read once per
+type instead of once per dimension.
+"""
+from Autodesk.Revit.DB import BuiltInParameter, LabelUtils
+
+from dimensionUtils._frame import MM_PER_FOOT
+from parameterUtils._bulk_writer import element_id_value
+
+
+def decimals_from_accuracy(acc, max_dec=12):
+    """Number of decimals needed to show a value rounded to acc (1 -> 0, 0.5 -> 1, 0.01 -> 2)."""
+    if acc is None or acc <= 0:
+        return None
+    acc = float(acc)
+    for n in range(0, max_dec + 1):
+        scaled = acc * 10 ** n
+        if abs(scaled - round(scaled)) < 1e-6 * max(1.0, scaled):
+            return n
+    return None
+
+
+class DimensionTypeInfo(object):
+    """What Dimensionline_clean needs from a DimensionType.
+
+    text_size_mm is the size on paper; multiply by the view scale for model mm.
+    """
+
+    __slots__ = ("type_id", "dim_type", "accuracy", "decimals", "unit_symbol", "unit_label", "text_size_mm")
+
+    def __init__(self, doc, dim_type):
+        self.type_id = element_id_value(dim_type.Id)
+        self.dim_type = dim_type
+
+        fo = dim_type.GetUnitsFormatOptions()
+        if fo is None or fo.UseDefault:
+            fo = doc.GetUnits().GetFormatOptions(dim_type.GetSpecTypeId())
+
+        try:
+            self.accuracy = fo.Accuracy
+        except Exception:
+            self.accuracy = None
+        self.decimals = decimals_from_accuracy(self.accuracy) if self.accuracy else None
+
+        try:
+            self.unit_symbol = LabelUtils.GetLabelForSymbol(fo.GetSymbolTypeId())
+        except Exception:
+            self.unit_symbol = None
+
+        self.unit_label = LabelUtils.GetLabelForUnit(fo.GetUnitTypeId())
+
+        p = dim_type.get_Parameter(BuiltInParameter.TEXT_SIZE)
+        self.text_size_mm = p.AsDouble() * MM_PER_FOOT
+
+
+class DimensionTypeCache(object):
+    """DimensionTypeInfo per type id. get(dim) reads the type the first time only."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._infos = {}
+
+    def __len__(self):
+        return len(self._infos)
+
+    def get(self, dim):
+        type_id = dim.GetTypeId()
+        key = element_id_value(type_id)
+        info = self._infos.get(key)
+        if info is None:
+            info = self._infos[key] = DimensionTypeInfo(self.doc, self.doc.GetElement(type_id))
+        return info
@@ -0,0 +1,138 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+
+from Autodesk.Revit.DB import BuiltInParameter
+
+from parameterUtils._bulk_writer import BulkParameterWriter, ParameterHandleCache, element_id_value
+
+FEET_TO_M = 0.3048
+
+# Lengde-parameter i prioritert rekkefølgje (lokalisert namn først)
+LENGTH_PARAMETERS = ("Pre-cut Lengde", "Cut Length")
+
+GROUP_KEYS = ("type", "length", "material", "level")
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class MarkGrouper(object):
+    """Group elements by configurable keys and give every group its own Mark.
+
+    Keys (in sort order): any of GROUP_KEYS
+        type      type name
+        length    LENGTH_PARAMETERS in metres, rounded to precision decimals
+        material  structural material name
+        level     level name (reference level for framing)
+
+    Parameter names are resolved once per type (ParameterHandleCache), and
+    type, material and level names once per id. Elements without a length
+    are skipped when 'length' is a key.
+
+    Example:
+        grouper = MarkGrouper(doc, keys=("type", "length"), precision=2)
+        groups = grouper.group(elements)
+        report = grouper.write(groups, "Renumber Framing Elements ID")
+    """
+
+    def __init__(self, doc, keys=("type", "length"), precision=2, length_names=LENGTH_PARAMETERS,
+                 handle_cache=None, logger=None):
+        unknown = [k for k in keys if k not in GROUP_KEYS]
+        if unknown:
+            raise ValueError("Unknown group key(s): {}".format(", ".join(unknown)))
+        self.doc = doc
+        self.keys = tuple(keys)
+        self.precision = precision
+        self.length_names = length_names
+        self.handles = handle_cache or ParameterHandleCache()
+        self.logger = logger
+        self._getters = [getattr(self, "_" + k) for k in self.keys]
+        self._names = {}
+        self.skipped = 0
+
+    def _name_of(self, element_id):
+        key = element_id_value(element_id)
+        if key is None or key < 0:
+            return u""
+        name = self._names.get(key)
+        if name is None:
+            element = self.doc.GetElement(element_id)
+            name = self._names[key] = element.Name if element is not None else u""
+        return name
+
+    def _type(self, element):
+        type_id = element.GetTypeId()
+        if element_id_value(type_id) in (None, -1):
+            return element.Name
+        return self._name_of(type_id)
+
+    def _length(self, element):
+        for name in self.length_names:
+            p = self.handles.get(element, name)
+            if p is not None:
+                if not p.HasValue:
+                    return None
+                return round(p.AsDouble() * FEET_TO_M, self.precision)
+        return None
+
+    def _material(self, element):
+        p = element.get_Parameter(BuiltInParameter.STRUCTURAL_MATERIAL_PARAM)
+        return self._name_of(p.AsElementId()) if p is not None else u""
+
+    def _level(self, element):
+        level_id = getattr(element, "LevelId", None)
+        if element_id_value(level_id) in (None, -1):
+            p = element.get_Parameter(BuiltInParameter.INSTANCE_REFERENCE_LEVEL_PARAM)
+            level_id = p.AsElementId() if p is not None else None
+        return self._name_of(level_id)
+
+    def key(self, element):
+        """Group key tuple, or None if a key can not be read (no length)."""
+        values = []
+        for getter in self._getters:
+            value = getter(element)
+            if value is None:
+                return None
+            values.append(value)
+        return tuple(values)
+
+    def group(self, elements):
+        """{key: [elements]} (element order is kept within a group)."""
+        groups = {}
+        for element in elements:
+            if element is None:
+                continue
+            key = self.key(element)
+            if key is None:
+                self.skipped += 1
+                continue
+            groups.setdefault(key, []).append(element)
+        return groups
+
+    def marks(self, groups, start=1):
+        """[(element, mark)] with 1, 2, 3 ... per group in sorted key order."""
+        result = []
+        for number, key in enumerate(sorted(groups), start=start):
+            mark = str(number)
+            for element in groups[key]:
+                result.append((element, mark))
+        return result
+
+    def write(self, groups, description="Renumber Mark", chunk_size=None):
+        """Set Mark on every element. Only changed values are written. Returns a ParameterWriteReport."""
+        writer = BulkParameterWriter(self.doc, description, chunk_size=chunk_size, logger=self.logger,
+                                     handle_cache=self.handles)
+        for element, mark in self.marks(groups):
+            writer.set(element, "Mark", mark)
+        return writer.write()
@@ -0,0 +1,263 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+import re
+
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+from Autodesk.Revit.DB import \
+    BuiltInCategory, \
+    BuiltInParameter, \
+    ElementMulticategoryFilter, \
+    FilteredElementCollector
+
+from parameterUtils._bulk_writer import element_id_value
+from tools._transactions import TransactionBatcher
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def door_prefix(symbol):
+    """Two first letters of the family name ('BD' for 'BD_Innerdør'), 'UN' without a name."""
+    family = symbol.FamilyName
+    return family[:2].upper() if family else "UN"
+
+
+def window_prefix(symbol):
+    return "V"
+
+
+def format_mark(prefix, number):
+    return u"{}-{:02d}".format(prefix, number)
+
+
+def parse_mark(mark, prefix):
+    """Number of a mark made by format_mark ('BD-07' -> 7), None if it is not '<prefix>-<number>'."""
+    if not mark:
+        return None
+    m = re.match(u"^{}-(\\d+)$".format(re.escape(prefix)), mark.strip())
+    return int(m.group(1)) if m else None
+
+
+def type_name(symbol):
+    p = symbol.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM)
+    return (p.AsString() if p is not None else None) or u""
+
+
+def by_element_id(symbol):
+    return element_id_value(symbol.Id)
+
+
+def number_marks(symbols, current, incremental=True):
+    """{id value: number} for symbols of one prefix, in the given order.
+
+    incremental: numbers in current ({id value: number or None}) are kept,
+    the rest get the next number after the highest one in use. When two types
+    share a number the first keeps it. Without incremental every type is
+    numbered from 1.
+    """
+    if not incremental:
+        return dict((by_element_id(s), i) for i, s in enumerate(symbols, start=1))
+    numbers = {}
+    taken = set()
+    for symbol in symbols:
+        number = current.get(by_element_id(symbol))
+        if number is not None and number not in taken:
+            numbers[by_element_id(symbol)] = number
+            taken.add(number)
+    next_number = max(taken) + 1 if taken else 1
+    for symbol in symbols:
+        key = by_element_id(symbol)
+        if key not in numbers:
+            numbers[key] = next_number
+            next_number += 1
+    return numbers
+
+
+def collect_types(doc, categories):
+    """{category id value: [type]} for the types that have instances, with one collector.
+
+    Instances without a type (or of an invalid type) are skipped.
+    """
+    cats = List[BuiltInCategory](list(categories))
+    seen = {}
+    for element in (FilteredElementCollector(doc)
+                    .WherePasses(ElementMulticategoryFilter(cats))
+                    .WhereElementIsNotElementType()):
+        type_id = element.GetTypeId()
+        key = element_id_value(type_id)
+        if key is None or key < 0 or key in seen:
+            continue
+        seen[key] = (element_id_value(element.Category.Id), type_id)
+
+    types = {}
+    for category, type_id in seen.values():
+        symbol = doc.GetElement(type_id)
+        if symbol is not None:
+            types.setdefault(category, []).append(symbol)
+    return types
+
+
+def assign_type_marks(doc, logger, categories, renumber=False, description="Assign Type Mark"):
+    """Type Marks for all types of the categories in one transaction (rules in TYPE_MARK_RULES).
+
+    Returns ({category id value: [type]}, TypeMarkReport).
+    """
+    types = collect_types(doc, categories)
+    assigner = TypeMarkAssigner(doc, logger, None, renumber=renumber, description=description)
+    edits, report = [], TypeMarkReport()
+    for bic in categories:
+        prefix_for, sort_key = TYPE_MARK_RULES[int(bic)]
+        category_edits, category_report = assigner.plan(types.get(int(bic), []), prefix_for, sort_key)
+        edits.extend(category_edits)
+        report.extend(category_report)
+    assigner.write(edits, report)
+    return types, report
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class TypeMarkReport(object):
+    """Diff of a TypeMarkAssigner run. Entries are dicts with element_id, name, old and new."""
+
+    def __init__(self):
+        self.changed = []
+        self.kept = 0
+        self.read_only = []
+        self.failed = []
+
+    def extend(self, other):
+        self.changed.extend(other.changed)
+        self.kept += other.kept
+        self.read_only.extend(other.read_only)
+        self.failed.extend(other.failed)
+
+    def summary(self):
+        return "{} changed, {} kept, {} read-only, {} failed".format(
+            len(self.changed), self.kept, len(self.read_only), len(self.failed))
+
+    def diff_lines(self):
+        return [u"{}: {} -> {}".format(e["name"], e["old"] or u"<none>", e["new"]) for e in self.changed]
+
+
+class TypeMarkAssigner(object):
+    """Type Mark '<prefix>-NN' for family types, numbered per prefix.
+
+    By default the numbering is incremental: types that already have a valid
+    mark for their prefix keep it, new types (or types with a foreign or
+    duplicate mark) get the next free number. renumber=True numbers every
+    type from 1 in sort order again. Only marks that change are written.
+
+    Example:
+        assigner = TypeMarkAssigner(doc, logger, door_prefix, sort_key=by_element_id)
+        report = assigner.assign(door_types)
+        logger.info(report.summary())
+
+    Args:
+        prefix_for: symbol -> prefix ('BD', 'V' ...).
+        sort_key: Order within a prefix (new types are numbered in this order).
+        renumber (bool): Number every type from scratch.
+        description (str): Transaction name.
+    """
+
+    def __init__(self, doc, logger, prefix_for, sort_key=by_element_id, renumber=False,
+                 description="Assign Type Mark"):
+        self.doc = doc
+        self.logger = logger
+        self.prefix_for = prefix_for
+        self.sort_key = sort_key
+        self.renumber = renumber
+        self.description = description
+
+    def plan(self, symbols, prefix_for=None, sort_key=None):
+        """(edits, report) without writing. edits are (symbol, parameter, mark) for TransactionBatcher.
+
+        prefix_for / sort_key override the ones given to the constructor.
+        """
+        prefix_for = prefix_for or self.prefix_for
+        sort_key = sort_key or self.sort_key
+        report = TypeMarkReport()
+        groups = {}
+        params = {}
+        marks = {}
+        for symbol in symbols:
+            key = by_element_id(symbol)
+            param = params[key] = symbol.get_Parameter(BuiltInParameter.ALL_MODEL_TYPE_MARK)
+            marks[key] = param.AsString() if param is not None else None
+            groups.setdefault(prefix_for(symbol), []).append(symbol)
+
+        edits = []
+        for prefix, group in sorted(groups.items()):
+            group.sort(key=sort_key)
+            current = dict((by_element_id(s), parse_mark(marks[by_element_id(s)], prefix)) for s in group)
+            numbers = number_marks(group, current, incremental=not self.renumber)
+            for symbol in group:
+                key = by_element_id(symbol)
+                old, new = marks[key], format_mark(prefix, numbers[key])
+                if old == new:
+                    report.kept += 1
+                    continue
+                entry = {"element_id": key, "name": u"{}: {}".format(symbol.FamilyName, type_name(symbol)),
+                         "old": old, "new": new}
+                param = params[key]
+                if param is None or param.IsReadOnly:
+                    report.read_only.append(entry)
+                    continue
+                edits.append((symbol, param, new))
+                report.changed.append(entry)
+        return edits, report
+
+    def assign(self, symbols):
+        """Write the changed marks in one transaction and return a TypeMarkReport."""
+        edits, report = self.plan(symbols)
+        return self.write(edits, report)
+
+    def write(self, edits, report):
+        """Write planned edits (from one or more plan() calls) in one transaction."""
+        if edits:
+            with TransactionBatcher(self.doc, self.description, chunk_size=None, logger=self.logger) as batch:
+                batch.extend(edits)
+            if batch.failed:
+                failed = set(id(edit) for edit, error in batch.failed)
+                report.failed = [e for edit, e in zip(edits, report.changed) if id(edit) in failed]
+                report.changed = [e for edit, e in zip(edits, report.changed) if id(edit) not in failed]
+
+        if self.logger:
+            for line in report.diff_lines():
+                self.logger.info(line)
+            for entry in report.read_only:
+                self.logger.error("Could not assign Type Mark to {}".format(entry["name"]))
+            self.logger.info("{}: {}".format(self.description, report.summary()))
+        return report
+
+
+#  ____  _     _     _     _____ ____
+# /  __\/ \ /\/ \   / \   /  __// ___\
+# |  \/|| | ||| |   | |   |  \  |    \
+# |    /| \_/|| |_/\| |_/\|  /_ \___ |
+# \_/\_\\____/\____/\____/\____\\____/ RULES
+#===========================================================================================================#
+
+# Kategori -> (prefiks, sortering av nye typar)
+TYPE_MARK_RULES = {
+    int(BuiltInCategory.OST_Doors): (door_prefix, by_element_id),
+    int(BuiltInCategory.OST_Windows): (window_prefix, type_name),
+}
@@ -0,0 +1,125 @@
+# encoding: utf-8
+"""
+Totals of MUA regions per Comments value, per level and per view.
+
+MuaEngine feeds every matched region into MuaTotals while it computes
+area/perimeter, so the totals need no extra pass over the regions and no
+extra geometry. The totals are kept per (view, comment); the coarser
+tables (per level, per comment) are summed from those.
+
+    totals = MuaTotals(doc)
+    engine = MuaEngine(doc, view, logger, cache, totals=totals)
+    engine.run(regions, search_word)
+    export_report(totals, path)     # .xlsx: tre ark, .csv: éin tabell per view
+"""
+import os
+
+from parameterUtils._bulk_writer import element_id_value
+from tools._export import export_to_csv, export_to_xlsx
+
+FEET_TO_M = 0.3048
+AREA_DECIMALS = 2
+LENGTH_DECIMALS = 2
+
+COMMENT = u"Kommentar"
+LEVEL = u"Etasje"
+VIEW = u"View"
+COUNT = u"Tal"
+AREA = u"Areal (m2)"
+PERIMETER = u"Omkrets (m)"
+TOTAL = u"Sum"
+
+VALUE_COLUMNS = (COUNT, AREA, PERIMETER)
+_KEY_INDEX = {LEVEL: 0, VIEW: 1, COMMENT: 2}
+
+# (arknamn, grupperingsnøklar) - éin tabell per linje i rapporten
+REPORT_TABLES = (
+    (u"Per kommentar", (COMMENT,)),
+    (u"Per etasje", (LEVEL, COMMENT)),
+    (u"Per view", (LEVEL, VIEW, COMMENT)),
+)
+
+
+class MuaTotals(object):
+    """Count, area (m²) and perimeter (m) summed per (view, comment).
+
+    View and level names are looked up once per OwnerViewId. Regions in views
+    without a level (drafting views) get an empty level name.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._views = {}
+        self._groups = {}
+
+    def __len__(self):
+        return len(self._groups)
+
+    def _view_names(self, view_id):
+        key = element_id_value(view_id)
+        names = self._views.get(key)
+        if names is None:
+            view = self.doc.GetElement(view_id) if key not in (None, -1) else None
+            level = getattr(view, "GenLevel", None) if view is not None else None
+            names = self._views[key] = (level.Name if level is not None else u"",
+                                        view.Name if view is not None else u"")
+        return names
+
+    def add(self, filled_region, comment, area_m2, perimeter):
+        """Add one region. perimeter in feet (as from GetExactLength), area_m2 may be None."""
+        level, view = self._view_names(filled_region.OwnerViewId)
+        key = (level, view, comment)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = [0, 0.0, 0.0]
+        group[0] += 1
+        if area_m2 is not None:
+            group[1] += area_m2
+        group[2] += perimeter * FEET_TO_M
+
+    def rows(self, by=(COMMENT,), total=False):
+        """Rows (dicts) summed over the keys in by, sorted. total=True adds a 'Sum' row."""
+        picks = [_KEY_INDEX[k] for k in by]
+        summed = {}
+        for key, (count, area, perimeter) in self._groups.items():
+            sub = tuple(key[i] for i in picks)
+            values = summed.get(sub)
+            if values is None:
+                values = summed[sub] = [0, 0.0, 0.0]
+            values[0] += count
+            values[1] += area
+            values[2] += perimeter
+
+        rows = [self._row(dict(zip(by, sub)), values) for sub, values in sorted(summed.items())]
+        if total and rows:
+            totals = [sum(v[i] for v in summed.values()) for i in range(3)]
+            label = dict((k, u"") for k in by)
+            label[by[0]] = TOTAL
+            rows.append(self._row(label, totals))
+        return rows
+
+    @staticmethod
+    def _row(row, values):
+        row[COUNT] = values[0]
+        row[AREA] = round(values[1], AREA_DECIMALS)
+        row[PERIMETER] = round(values[2], LENGTH_DECIMALS)
+        return row
+
+    def lines(self, limit=15):
+        """'MUA 1: 12.34 m²' per comment, for a dialog."""
+        rows = self.rows()
+        lines = [u"{}: {:.2f} m²".format(r[COMMENT] or u"(tom)", r[AREA]) for r in rows[:limit]]
+        if len(rows) > limit:
+            lines.append(u"... og {} til".format(len(rows) - limit))
+        return lines
+
+
+def export_report(totals, filename):
+    """Write the report tables. .xlsx: one sheet per table; otherwise the per-view table as csv."""
+    if os.path.splitext(filename)[1].lower() == ".xlsx":
+        export_to_xlsx([(name, list(by) + list(VALUE_COLUMNS), totals.rows(by, total=True))
+                        for name, by in REPORT_TABLES], filename)
+    else:
+        by = REPORT_TABLES[-1][1]
+        export_to_csv(list(by) + list(VALUE_COLUMNS), totals.rows(by, total=True), filename)
+    return filename
@@ -0,0 +1,80 @@
+# encoding: utf-8
+"""
+Area and perimeter of filled regions, cached between runs.
+
+GetBoundaries() + GetExactLength() per region is the expensive part of MUA.
+The result is kept in a sidecar (tools._sidecar.SidecarCache) keyed by
+UniqueId, together with a cheap fingerprint of the region:
+
+    rounded bounding box + HOST_AREA_COMPUTED
+
+Both come without touching the boundary curves. A region whose fingerprint
+is unchanged gets its area/perimeter from the cache.
+"""
+from Autodesk.Revit.DB import BuiltInParameter, StorageType, UnitTypeId, UnitUtils
+
+from tools._sidecar import fingerprint
+
+BBOX_DECIMALS = 4       # fot (~0.03 mm)
+AREA_DECIMALS = 6       # fot²
+
+
+def total_length(filled_region):
+    total_length = 0.0
+    for loop in filled_region.GetBoundaries():
+        total_length += loop.GetExactLength()
+    return total_length
+
+
+def _round(value, decimals):
+    return None if value is None else u"{:.{}f}".format(value, decimals)
+
+
+def computed_area(filled_region):
+    """HOST_AREA_COMPUTED in internal units (ft²), None if the region has none."""
+    p = filled_region.get_Parameter(BuiltInParameter.HOST_AREA_COMPUTED)
+    if p is not None and p.StorageType == StorageType.Double:
+        return p.AsDouble()
+    return None
+
+
+def region_fingerprint(filled_region, area, view=None):
+    parts = [_round(area, AREA_DECIMALS)]
+    bb = filled_region.get_BoundingBox(view)
+    if bb is not None:
+        parts.extend(_round(v, BBOX_DECIMALS) for v in (bb.Min.X, bb.Min.Y, bb.Max.X, bb.Max.Y))
+    return fingerprint(*parts)
+
+
+class RegionMeasurements(object):
+    """(area m², perimeter) per filled region, from cache when the region is unchanged.
+
+    Args:
+        cache: SidecarCache, or None to always measure.
+        view: View for get_BoundingBox (None = model bounding box).
+    """
+
+    def __init__(self, cache=None, view=None):
+        self.cache = cache
+        self.view = view
+        self.measured = 0
+
+    def get(self, filled_region):
+        area = computed_area(filled_region)
+        fp = None
+        if self.cache is not None:
+            fp = region_fingerprint(filled_region, area, self.view)
+            cached = self.cache.get(filled_region.UniqueId, fp)
+            if cached is not None:
+                return cached[0], cached[1]
+
+        area_m2 = UnitUtils.ConvertFromInternalUnits(area, UnitTypeId.SquareMeters) if area is not None else None
+        perimeter = total_length(filled_region)
+        self.measured += 1
+        if self.cache is not None:
+            self.cache.put(filled_region.UniqueId, fp, [area_m2, perimeter])
+        return area_m2, perimeter
+
+    def save(self):
+        if self.cache is not None:
+            self.cache.save()
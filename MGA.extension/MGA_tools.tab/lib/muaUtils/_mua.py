@@ -0,0 +1,209 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+
+from Autodesk.Revit.DB import \
+    BuiltInParameter, \
+    FilledRegion, \
+    FilteredElementCollector, \
+    ViewType
+
+from muaUtils._geometry_cache import RegionMeasurements
+from parameterUtils._bulk_writer import BulkParameterWriter, ParameterHandleCache, ParameterWriteReport, \
+    element_id_value
+from tools._transactions import revit_groupTransaction
+
+AREA_PARAMETER = "Areal"
+PERIMETER_PARAMETER = "Omkrets"
+ALL = "Alle"
+
+# Views som blir tekne med i prosjektmodus
+MUA_VIEW_TYPES = (ViewType.FloorPlan, ViewType.DraftingView)
+
+# Innstillingar for geometri-cachen. Ein cache skriven med andre innstillingar blir ignorert.
+SETTINGS = {"version": 2, "area": AREA_PARAMETER, "perimeter": PERIMETER_PARAMETER, "area_unit": "m2"}
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def collect_filled_regions(doc, view):
+    return list(FilteredElementCollector(doc, view.Id).OfClass(FilledRegion).ToElements())
+
+
+def collect_filled_regions_by_view(doc, view_types=MUA_VIEW_TYPES):
+    """[(view, [filled regions])] for every view of view_types that owns filled regions, sorted by view name.
+
+    One document-wide collector; the regions are grouped by OwnerViewId.
+    View templates are left out.
+    """
+    by_view = {}
+    for fr in FilteredElementCollector(doc).OfClass(FilledRegion).ToElements():
+        by_view.setdefault(element_id_value(fr.OwnerViewId), []).append(fr)
+
+    groups = []
+    for regions in by_view.values():
+        view = doc.GetElement(regions[0].OwnerViewId)
+        if view is None or view.IsTemplate or view.ViewType not in view_types:
+            continue
+        groups.append((view, regions))
+    groups.sort(key=lambda group: group[0].Name)
+    return groups
+
+
+def region_comment(filled_region):
+    comment = filled_region.get_Parameter(BuiltInParameter.ALL_MODEL_INSTANCE_COMMENTS)
+    return (comment.AsString() if comment else None) or u""
+
+
+def matches(comment, search_word=None):
+    """'demo' regions never match. Otherwise all (search_word None/'Alle') or those containing search_word."""
+    comment = comment.lower()
+    if "demo" in comment:
+        return False
+    if not search_word or search_word.lower() == ALL.lower():
+        return True
+    return search_word.lower() in comment
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class MuaResult(object):
+    """Counts from MuaEngine.run() (areas/perimeters = regions that have the value set after the run).
+
+    totals is the engine's MuaTotals, or None when the engine does not aggregate.
+    """
+
+    def __init__(self):
+        self.regions = 0
+        self.matched = 0
+        self.cached = 0
+        self.measured = 0
+        self.areas = 0
+        self.perimeters = 0
+        self.report = None
+        self.totals = None
+        self.views = 0
+
+    def summary(self):
+        where = u" i {} views".format(self.views) if self.views else u""
+        return u"Satt areal på {}, og omkrets på {} filled regions{} ({} frå cache).".format(
+            self.areas, self.perimeters, where, self.cached)
+
+
+class MuaEngine(object):
+    """Areal (m²) and Omkrets on filled regions, in three stages.
+
+        filter   comment test (no geometry)
+        compute  area/perimeter, from the geometry cache for unchanged regions;
+                 with totals, every matched region is also added to the MuaTotals
+        write    one BulkParameterWriter, one transaction, only changed values
+
+    run_project() does the same for many views: every view is filtered and
+    computed first, then written with one transaction per view inside one
+    TransactionGroup (one undo step).
+
+    Example:
+        cache = SidecarCache.for_document(doc, "SetMUA_geometry", settings=SETTINGS)
+        engine = MuaEngine(doc, view, logger, cache)
+        result = engine.run(collect_filled_regions(doc, view), search_word)
+        # eller alle plan- og teikningsview:
+        result = engine.run_project(collect_filled_regions_by_view(doc), search_word)
+    """
+
+    def __init__(self, doc, view=None, logger=None, cache=None, totals=None):
+        self.doc = doc
+        self.view = view
+        self.logger = logger
+        self.totals = totals
+        self.measurements = RegionMeasurements(cache, view)
+        self.handles = ParameterHandleCache()
+
+    def filter(self, regions, search_word=None):
+        return [fr for fr in regions if matches(region_comment(fr), search_word)]
+
+    def compute(self, regions, result):
+        """[(region, {parameter name: value})] for regions that have Areal and/or Omkrets."""
+        values = []
+        looked_up = 0
+        measured_before = self.measurements.measured
+        for fr in regions:
+            area_param = self.handles.get(fr, AREA_PARAMETER)
+            length_param = self.handles.get(fr, PERIMETER_PARAMETER)
+            has_params = area_param is not None or length_param is not None
+            if not has_params and self.totals is None:
+                continue
+            area, perimeter = self.measurements.get(fr)
+            looked_up += 1
+            if self.totals is not None:
+                self.totals.add(fr, region_comment(fr), area, perimeter)
+            if not has_params:
+                continue
+            region_values = {}
+            if area_param is not None and area is not None:
+                region_values[AREA_PARAMETER] = area
+                result.areas += 1
+            if length_param is not None:
+                region_values[PERIMETER_PARAMETER] = perimeter
+                result.perimeters += 1
+            values.append((fr, region_values))
+        measured = self.measurements.measured - measured_before
+        result.measured += measured
+        result.cached += looked_up - measured
+        return values
+
+    def write(self, values, description="Sett areal og omkrets"):
+        writer = BulkParameterWriter(self.doc, description, logger=self.logger, handle_cache=self.handles)
+        for fr, region_values in values:
+            writer.add(fr, region_values)
+        return writer.write()
+
+    def run(self, regions, search_word=None, description="Sett areal og omkrets"):
+        result = MuaResult()
+        result.regions = len(regions)
+        matched = self.filter(regions, search_word)
+        result.matched = len(matched)
+        values = self.compute(matched, result)
+        result.report = self.write(values, description)
+        result.totals = self.totals
+        self.measurements.save()
+        return result
+
+    def run_project(self, groups, search_word=None, description="Sett areal og omkrets"):
+        """run() for [(view, regions)]. Views without matching regions are skipped (result.views = views written)."""
+        result = MuaResult()
+        planned = []
+        for view, regions in groups:
+            result.regions += len(regions)
+            matched = self.filter(regions, search_word)
+            if not matched:
+                continue
+            result.matched += len(matched)
+            # Fingeravtrykket brukar bounding box i viewet som eig regionen
+            self.measurements.view = view
+            planned.append((view, self.compute(matched, result)))
+        result.views = len(planned)
+
+        result.report = ParameterWriteReport()
+        if planned:
+            with revit_groupTransaction(self.doc, description):
+                for view, values in planned:
+                    result.report.extend(self.write(values, u"{} - {}".format(description, view.Name)))
+        result.totals = self.totals
+        self.measurements.save()
+        return result
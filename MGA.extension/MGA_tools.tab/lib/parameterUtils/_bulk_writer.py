@@ -0,0 +1,261 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+
+from tools._transactions import TransactionBatcher
+
+try:
+    _STRING_TYPES = (basestring,)
+except NameError:
+    _STRING_TYPES = (str,)
+
+_INVALID_BUILTIN = -1   # BuiltInParameter.INVALID
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def element_id_value(element_id):
+    """Integer value of an ElementId (Value in Revit 2024+, IntegerValue before)."""
+    if element_id is None:
+        return None
+    try:
+        return element_id.Value
+    except AttributeError:
+        return element_id.IntegerValue
+
+
+def read_parameter_value(param):
+    """Return the current value of a parameter based on its StorageType."""
+    storage = str(param.StorageType)
+    if storage == "String":
+        return param.AsString()
+    if storage == "Double":
+        return param.AsDouble()
+    if storage == "Integer":
+        return param.AsInteger()
+    if storage == "ElementId":
+        return param.AsElementId()
+    return None
+
+
+def values_equal(old, new, tolerance=1e-6):
+    """Compare a stored parameter value with a new value without touching Revit."""
+    if old is None or isinstance(old, _STRING_TYPES) or isinstance(new, _STRING_TYPES):
+        return (old or u"") == (new or u"")
+    if isinstance(old, float) or isinstance(new, float):
+        try:
+            return abs(float(old) - float(new)) <= tolerance
+        except (TypeError, ValueError):
+            return False
+    if hasattr(old, "IntegerValue") or hasattr(new, "IntegerValue"):
+        try:
+            return element_id_value(old) == element_id_value(new)
+        except AttributeError:
+            return False
+    return old == new
+
+
+def _type_key(element):
+    """Cache key for 'same kind of element': type id, else the element's own id.
+
+    Elements without a type (ElementTypes themselves) are not grouped: types in
+    one category can have different family and type parameters.
+    """
+    type_id = element.GetTypeId()
+    value = element_id_value(type_id)
+    if value is not None and value != -1:
+        return ("type", value)
+    return ("element", element_id_value(element.Id))
+
+
+def _handle_for(param):
+    """Reduce a Parameter to something reusable on other elements of the same type."""
+    definition = param.Definition
+    try:
+        bip = definition.BuiltInParameter
+        if int(bip) != _INVALID_BUILTIN:
+            return ("builtin", bip)
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return ("definition", definition)
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class ParameterHandleCache(object):
+    """Resolve parameter names once per element type.
+
+    The first element of a type pays for LookupParameter(name). The result is
+    kept as a BuiltInParameter or Definition, and later elements of the same
+    type use get_Parameter() with that handle instead of a string lookup.
+    """
+
+    def __init__(self):
+        self._handles = {}
+        self.lookups = 0
+
+    def get(self, element, name):
+        key = (_type_key(element), name)
+        if key in self._handles:
+            handle = self._handles[key]
+            if handle is None:
+                return None
+            param = element.get_Parameter(handle[1])
+            if param is not None:
+                return param
+
+        param = element.LookupParameter(name)
+        self.lookups += 1
+        self._handles[key] = _handle_for(param) if param is not None else None
+        return param
+
+
+class ParameterWriteReport(object):
+    """Result of a BulkParameterWriter run. Each entry is a dict with
+    element_id, name, old and new."""
+
+    def __init__(self):
+        self.changed = []
+        self.unchanged = 0
+        self.missing = []
+        self.read_only = []
+        self.failed = []
+        self.seconds = 0.0
+
+    def extend(self, other):
+        """Add the entries of another report (several writers, one summary)."""
+        self.changed.extend(other.changed)
+        self.unchanged += other.unchanged
+        self.missing.extend(other.missing)
+        self.read_only.extend(other.read_only)
+        self.failed.extend(other.failed)
+        self.seconds += other.seconds
+
+    def summary(self):
+        return "{} changed, {} unchanged, {} missing, {} read-only, {} failed".format(
+            len(self.changed), self.unchanged, len(self.missing), len(self.read_only), len(self.failed))
+
+    def rows(self):
+        """Flat rows for export_to_csv."""
+        rows = []
+        for status, entries in (("changed", self.changed),
+                                ("missing", self.missing),
+                                ("read_only", self.read_only),
+                                ("failed", self.failed)):
+            for entry in entries:
+                row = dict(entry)
+                row["status"] = status
+                rows.append(row)
+        return rows
+
+
+class BulkParameterWriter(object):
+    """Write many parameters on many elements in one transaction.
+
+    Values that already match are skipped, so only real changes are written.
+
+    Example:
+        writer = BulkParameterWriter(doc, "Sett areal og omkrets")
+        for fr in filled_regions:
+            writer.add(fr, {"Areal": area, "Omkrets": length})
+        report = writer.write()
+        logger.info(report.summary())
+
+    Args:
+        doc: Revit document.
+        description (str): Transaction name.
+        chunk_size (int): Passed to TransactionBatcher. None = one transaction.
+        logger: Optional ScriptLogger.
+        handle_cache: Shared ParameterHandleCache (a new one is made if None).
+        tolerance (float): Tolerance for Double parameters (internal units).
+    """
+
+    def __init__(self, doc, description="Set parameters", chunk_size=None, logger=None,
+                 handle_cache=None, tolerance=1e-6):
+        self.doc = doc
+        self.description = description
+        self.chunk_size = chunk_size
+        self.logger = logger
+        self.handles = handle_cache or ParameterHandleCache()
+        self.tolerance = tolerance
+        self._queue = []
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, element, values):
+        """Queue several values for one element. values: {parameter name: value}"""
+        for name, value in values.items():
+            self._queue.append((element, name, value))
+
+    def set(self, element, name, value):
+        """Queue a single value."""
+        self._queue.append((element, name, value))
+
+    def plan(self):
+        """Compare queued values with the model. Returns (edits, report) without writing."""
+        report = ParameterWriteReport()
+        edits = []
+        lookups_before = self.handles.lookups
+        for element, name, value in self._queue:
+            entry = {"element_id": element_id_value(element.Id), "name": name, "old": None, "new": value}
+            param = self.handles.get(element, name)
+            if param is None:
+                report.missing.append(entry)
+                continue
+            old = read_parameter_value(param)
+            entry["old"] = old
+            if values_equal(old, value, self.tolerance):
+                report.unchanged += 1
+                continue
+            if param.IsReadOnly:
+                report.read_only.append(entry)
+                continue
+            edits.append((element, param, value))
+            report.changed.append(entry)
+        if hasattr(self.logger, "count"):
+            self.logger.count("LookupParameter", self.handles.lookups - lookups_before)
+        return edits, report
+
+    def write(self):
+        """Write all changed values in one transaction and return a ParameterWriteReport."""
+        edits, report = self.plan()
+        self._queue = []
+        if not edits:
+            return report
+
+        batch = TransactionBatcher(self.doc, self.description, chunk_size=self.chunk_size, logger=self.logger)
+        batch.extend(edits)
+        batch.flush()
+        report.seconds = sum(r["seconds"] for r in batch.chunk_reports)
+
+        if batch.failed:
+            # edits and report.changed are built in the same order
+            failed_edits = set(id(edit) for edit, error in batch.failed)
+            still_changed = []
+            for edit, entry in zip(edits, report.changed):
+                if id(edit) in failed_edits:
+                    report.failed.append(entry)
+                else:
+                    still_changed.append(entry)
+            report.changed = still_changed
+
+        if self.logger:
+            self.logger.info("{}: {}".format(self.description, report.summary()))
+        return report
@@ -13,22 +13,22 @@ from datetime import date
 
 # Imports from Autodesk and pyRevit
 
-from tools._transactions import revit_transaction
+from parameterUtils._bulk_writer import BulkParameterWriter
 
 def update_lookup_parameters(doc,object,param_names,param_values):
     if len(param_names) != len(param_values):
         raise ValueError("Parameter namen and param_values must have same length")
+    # Alle parametere settes i en og samme transaksjon, uendrede verdier hoppes over
+    writer = BulkParameterWriter(doc, "Change lookUp parameter")
+    # I rekkjefølgje, også når same namn kjem fleire gonger (siste verdi vinn)
     for param_name, param_value in zip(param_names, param_values):
-        param_to_set = object.LookupParameter(param_name)
-        if param_to_set is None:
-            print('Parameter {} not found').format(param_name)
-            continue
-        if param_to_set.IsReadOnly:
-            print('Parameter {} is read-only').format(param_name)
-            continue
-            
-        with revit_transaction(doc, "Change lookUp parameter"):
-            param_to_set.Set(param_value)
+        writer.set(object, param_name, param_value)
+    report = writer.write()
+    for entry in report.missing:
+        print('Parameter {} not found'.format(entry["name"]))
+    for entry in report.read_only:
+        print('Parameter {} is read-only'.format(entry["name"]))
+    return report
             
 
 def change_ProjectParameter_Value(doc,parameter_name,parameter_value):
@@ -0,0 +1,161 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+from Autodesk.Revit.DB import \
+    BuiltInCategory, \
+    ElementMulticategoryFilter, \
+    FilteredElementCollector, \
+    IndependentTag, \
+    Level, \
+    Reference, \
+    TagOrientation
+
+from parameterUtils._bulk_writer import element_id_value
+from tagUtils._spatial_grid import TagLayout
+from tools._transactions import revit_transaction
+
+TAGGED_CATEGORIES = (
+    BuiltInCategory.OST_Doors,
+    BuiltInCategory.OST_Windows,
+)
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class BatchTagger(object):
+    """Tag elements in every view of their level, all tags in one transaction.
+
+    A view belongs to a level when the level name is part of the view name
+    (case-insensitive). Everything per view is read once: the level -> views
+    map for all levels, the visible elements (one collector per view), the
+    tags already there and the TagLayout for free spots. add() only queues;
+    create() makes all queued tags in its own transaction, flush() makes them
+    inside the transaction the caller already has open.
+
+    An element that already has a tag of the same tag family in a view is
+    skipped there.
+
+    Example:
+        tagger = BatchTagger(doc, views)
+        for door in doors:
+            tagger.add(door, door_tag_type, wall_normal(door))
+        tagger.create()     # opens its own transaction
+    """
+
+    def __init__(self, doc, views, categories=TAGGED_CATEGORIES, offset=1.2):
+        self.doc = doc
+        self.views = list(views)
+        self.categories = categories
+        self.offset = offset
+        self._level_views = None
+        self._visible = {}
+        self._tagged = {}
+        self._layouts = {}
+        self._families = {}
+        self._queue = []
+        self.report = {"queued": 0, "already_tagged": 0, "created": 0, "failed": 0}
+
+    def level_views(self, level_id):
+        """Views whose name contains the name of the level."""
+        if self._level_views is None:
+            names = [(view, view.Name.lower()) for view in self.views]
+            self._level_views = {}
+            for level in FilteredElementCollector(self.doc).OfClass(Level).ToElements():
+                level_name = level.Name.lower()
+                self._level_views[element_id_value(level.Id)] = [v for v, n in names if level_name in n]
+        return self._level_views.get(element_id_value(level_id), ())
+
+    def visible(self, view):
+        """Id values of the elements of self.categories that are shown in the view."""
+        key = element_id_value(view.Id)
+        ids = self._visible.get(key)
+        if ids is None:
+            cats = List[BuiltInCategory](list(self.categories))
+            ids = self._visible[key] = set(
+                element_id_value(eid) for eid in
+                FilteredElementCollector(self.doc, view.Id)
+                .WherePasses(ElementMulticategoryFilter(cats))
+                .WhereElementIsNotElementType()
+                .ToElementIds())
+        return ids
+
+    def family_name(self, type_id):
+        key = element_id_value(type_id)
+        name = self._families.get(key)
+        if name is None:
+            tag_type = self.doc.GetElement(type_id)
+            name = self._families[key] = tag_type.FamilyName if tag_type is not None else u""
+        return name
+
+    def tagged(self, view):
+        """{(element id value, tag family name)} for the tags already in the view."""
+        key = element_id_value(view.Id)
+        pairs = self._tagged.get(key)
+        if pairs is None:
+            pairs = self._tagged[key] = set()
+            for tag in FilteredElementCollector(self.doc, view.Id).OfClass(IndependentTag).ToElements():
+                family = self.family_name(tag.GetTypeId())
+                for eid in tag.GetTaggedLocalElementIds():
+                    pairs.add((element_id_value(eid), family))
+        return pairs
+
+    def layout(self, view):
+        key = element_id_value(view.Id)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = self._layouts[key] = TagLayout(self.doc, view)
+        return layout
+
+    def add(self, element, tag_type, wall_normal):
+        """Queue a tag of tag_type for element in every view of its level. Returns the number queued."""
+        element_id = element_id_value(element.Id)
+        family = tag_type.FamilyName
+        point = element.Location.Point.Add(wall_normal.Multiply(self.offset))
+        queued = 0
+        for view in self.level_views(element.LevelId):
+            if element_id not in self.visible(view):
+                continue
+            tagged = self.tagged(view)
+            if (element_id, family) in tagged:
+                self.report["already_tagged"] += 1
+                continue
+            tagged.add((element_id, family))
+            self._queue.append((element, view, tag_type, self.layout(view).place(point, exclude=element.Id)))
+            queued += 1
+        self.report["queued"] += queued
+        return queued
+
+    def flush(self):
+        """Create every queued tag in the open transaction. Returns the new tags."""
+        created = []
+        for element, view, tag_type, location in self._queue:
+            try:
+                created.append(IndependentTag.Create(self.doc, tag_type.Id, view.Id, Reference(element),
+                                                     False, TagOrientation.Horizontal, location))
+            except Exception:
+                self.report["failed"] += 1
+        self.report["created"] += len(created)
+        self._queue = []
+        return created
+
+    def create(self, description='Tag elements'):
+        """Create every queued tag in one transaction. Returns the new tags."""
+        if not self._queue:
+            return []
+        with revit_transaction(self.doc, description):
+            return self.flush()
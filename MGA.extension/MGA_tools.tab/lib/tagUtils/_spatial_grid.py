@@ -0,0 +1,248 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+from Autodesk.Revit.DB import \
+    BuiltInCategory, \
+    ElementMulticategoryFilter, \
+    FilteredElementCollector, \
+    XYZ
+
+from parameterUtils._bulk_writer import element_id_value
+
+MM_PER_FOOT = 304.8
+EPS = 1e-9
+
+# Vekt for overlapp (andel av tag-arealet): andre tags er verst, modell-geometri kan tags stå oppå
+WEIGHT_TAG = 1.0
+WEIGHT_ANNOTATION = 0.75
+WEIGHT_MODEL = 0.25
+WEIGHT_DISTANCE = 0.01      # per fot frå ønska posisjon - same overlapp: nærast vinn
+
+TAG_SIZE_MM = (12.0, 5.0)   # (breidde, høgde) på papir
+
+ANNOTATION_CATEGORIES = (
+    BuiltInCategory.OST_DoorTags,
+    BuiltInCategory.OST_WindowTags,
+    BuiltInCategory.OST_RoomTags,
+    BuiltInCategory.OST_TextNotes,
+    BuiltInCategory.OST_GenericAnnotation,
+)
+MODEL_CATEGORIES = (
+    BuiltInCategory.OST_Doors,
+    BuiltInCategory.OST_Windows,
+)
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def _dot(p, d):
+    return p.X * d.X + p.Y * d.Y + p.Z * d.Z
+
+
+def box_overlap(a, b):
+    """Overlap area of two boxes (u0, v0, u1, v1), 0 if they do not overlap."""
+    du = min(a[2], b[2]) - max(a[0], b[0])
+    if du <= 0.0:
+        return 0.0
+    dv = min(a[3], b[3]) - max(a[1], b[1])
+    if dv <= 0.0:
+        return 0.0
+    return du * dv
+
+
+def centered_box(u, v, width, height):
+    return (u - width * 0.5, v - height * 0.5, u + width * 0.5, v + height * 0.5)
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class SpatialGrid(object):
+    """Uniform grid of weighted boxes (u0, v0, u1, v1).
+
+    A box is stored in every cell it touches, so a query only looks at the
+    boxes near it instead of every box in the view. cell_size should be about
+    the size of the boxes that are queried. A box can have an owner (e.g. an
+    element id value) so overlap() can leave it out.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self._boxes = []
+        self._cells = {}
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def _cell_range(self, box):
+        s = self.cell_size
+        return (int(box[0] // s), int(box[1] // s), int(box[2] // s), int(box[3] // s))
+
+    def insert(self, box, weight=1.0, owner=None):
+        index = len(self._boxes)
+        self._boxes.append((box, weight, owner))
+        i0, j0, i1, j1 = self._cell_range(box)
+        cells = self._cells
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i, j))
+                if cell is None:
+                    cells[(i, j)] = [index]
+                else:
+                    cell.append(index)
+        return index
+
+    def query(self, box):
+        """Indices of stored boxes in the cells box touches (may not overlap box itself)."""
+        i0, j0, i1, j1 = self._cell_range(box)
+        cells = self._cells
+        if i0 == i1 and j0 == j1:
+            return cells.get((i0, j0), ())
+        found = set()
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                cell = cells.get((i, j))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def overlap(self, box, exclude=None):
+        """Sum of weight * overlap area with every stored box (except those owned by exclude)."""
+        boxes = self._boxes
+        total = 0.0
+        for index in self.query(box):
+            other, weight, owner = boxes[index]
+            if exclude is not None and owner == exclude:
+                continue
+            total += weight * box_overlap(box, other)
+        return total
+
+
+class TagLayout(object):
+    """Free spots for new tags in one view.
+
+    Holds the tags placed so far plus the existing annotation and model
+    elements of the view in a SpatialGrid (view coordinates, feet). place()
+    scores candidate positions around the wanted point by weighted overlap
+    and keeps the best one.
+
+    Model elements are added as their view bounding box, so diagonal elements
+    count as bigger than they are; keep MODEL_CATEGORIES to compact families.
+    The element being tagged is passed as exclude, so its own box (for doors
+    including the swing) does not push its tag away.
+
+    Example:
+        layout = TagLayout(doc, view)
+        tag_location = layout.place(point.Add(wall_normal.Multiply(1.2)), exclude=door.Id)
+        IndependentTag.Create(..., tag_location)
+    """
+
+    def __init__(self, doc, view, tag_size_mm=TAG_SIZE_MM, search_steps=3,
+                 annotation_categories=ANNOTATION_CATEGORIES, model_categories=MODEL_CATEGORIES):
+        self.doc = doc
+        self.view = view
+        self.right = view.RightDirection
+        self.up = view.UpDirection
+        self.normal = view.ViewDirection
+
+        to_ft = view.Scale / MM_PER_FOOT
+        self.tag_width = tag_size_mm[0] * to_ft
+        self.tag_height = tag_size_mm[1] * to_ft
+        self.search_steps = search_steps
+        self.grid = SpatialGrid(max(self.tag_width, self.tag_height))
+        self.placed = 0
+        self.overlapping = 0
+
+        # Kandidatar rundt ønska punkt, nærast først (halve tag-storleikar i u og v)
+        su, sv = self.tag_width * 0.5, self.tag_height * 0.5
+        steps = range(-search_steps, search_steps + 1)
+        offsets = [(i * su, j * sv) for i in steps for j in steps]
+        offsets.sort(key=lambda o: o[0] * o[0] + o[1] * o[1])
+        self._offsets = [(du, dv, (du * du + dv * dv) ** 0.5) for du, dv in offsets]
+
+        if annotation_categories:
+            self.add_elements(self._collect(annotation_categories), WEIGHT_ANNOTATION)
+        if model_categories:
+            self.add_elements(self._collect(model_categories), WEIGHT_MODEL)
+
+    def _collect(self, categories):
+        cats = List[BuiltInCategory](list(categories))
+        return (FilteredElementCollector(self.doc, self.view.Id)
+                .WherePasses(ElementMulticategoryFilter(cats))
+                .WhereElementIsNotElementType()
+                .ToElements())
+
+    def to_view(self, point):
+        return _dot(point, self.right), _dot(point, self.up)
+
+    def from_view(self, u, v, depth):
+        r, p, n = self.right, self.up, self.normal
+        return XYZ(r.X * u + p.X * v + n.X * depth,
+                   r.Y * u + p.Y * v + n.Y * depth,
+                   r.Z * u + p.Z * v + n.Z * depth)
+
+    def element_box(self, element):
+        """View box of the element's bounding box in this view, or None."""
+        bb = element.get_BoundingBox(self.view)
+        if bb is None:
+            return None
+        lo, hi = bb.Min, bb.Max
+        us, vs = [], []
+        for x in (lo.X, hi.X):
+            for y in (lo.Y, hi.Y):
+                for z in (lo.Z, hi.Z):
+                    p = XYZ(x, y, z)
+                    us.append(_dot(p, self.right))
+                    vs.append(_dot(p, self.up))
+        return (min(us), min(vs), max(us), max(vs))
+
+    def add_elements(self, elements, weight):
+        for element in elements:
+            box = self.element_box(element)
+            if box is not None:
+                self.grid.insert(box, weight, element_id_value(element.Id))
+
+    def place(self, point, width=None, height=None, exclude=None):
+        """Best position near point for a tag of width x height (feet), and reserve it.
+
+        exclude: ElementId of the host; its box is not counted as overlap.
+        Returns an XYZ at the same depth as point.
+        """
+        exclude = element_id_value(exclude) if exclude is not None else None
+        width = width or self.tag_width
+        height = height or self.tag_height
+        u, v = self.to_view(point)
+        best, best_score, best_overlap = None, None, 0.0
+        for du, dv, dist in self._offsets:
+            penalty = WEIGHT_DISTANCE * dist
+            if best_score is not None and penalty >= best_score:
+                break   # resten ligg lenger unna - kan ikkje bli betre
+            box = centered_box(u + du, v + dv, width, height)
+            overlap = self.grid.overlap(box, exclude) / (width * height)
+            score = overlap + penalty
+            if best_score is None or score < best_score:
+                best, best_score, best_overlap = box, score, overlap
+        self.grid.insert(best, WEIGHT_TAG)
+        self.placed += 1
+        if best_overlap > EPS:
+            self.overlapping += 1
+        return self.from_view((best[0] + best[2]) * 0.5, (best[1] + best[3]) * 0.5, _dot(point, self.normal))
@@ -0,0 +1,280 @@
+# encoding: utf-8
+
+#  _  _      ____  ____  ____  _____
+# / \/ \__/|/  __\/  _ \/  __\/__ __\
+# | || |\/|||  \/|| / \||  \/|  / \
+# | || |  |||  __/| \_/||    /  | |
+# \_/\_/  \|\_/   \____/\_/\_\  \_/
+# IMPORTS
+#===========================================================================================================#
+import re
+
+import clr
+clr.AddReference("System")
+from System.Collections.Generic import List
+
+from Autodesk.Revit.DB import \
+    BuiltInCategory, \
+    ElementId, \
+    ElementMulticategoryFilter, \
+    FamilyInstance, \
+    FilteredElementCollector, \
+    XYZ
+
+from parameterUtils._bulk_writer import element_id_value
+from tools._transactions import revit_transaction
+
+EPS = 1e-9
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def _row_value(row, lines):
+    lines = max(1, lines)
+    if lines <= len(row):
+        return row[lines - 1]
+    step = row[-1] - row[-2] if len(row) > 1 else 0.0
+    return row[-1] + step * (lines - len(row))
+
+
+def _interpolate(by_scale, scale):
+    scales = sorted(by_scale)
+    if scale <= scales[0]:
+        return by_scale[scales[0]]
+    if scale >= scales[-1]:
+        return by_scale[scales[-1]]
+    for lo, hi in zip(scales, scales[1:]):
+        if lo <= scale <= hi:
+            t = float(scale - lo) / (hi - lo)
+            return by_scale[lo] + t * (by_scale[hi] - by_scale[lo])
+
+
+_SCALE_RE = re.compile(r"1\s*[-:]\s*(\d+)")
+
+
+def tag_scale(name, default):
+    """Scale from the tag type name ('Dør 1-100 ok' -> 100). default if the name has none."""
+    name = (name or u"").lower()
+    m = _SCALE_RE.search(name)
+    if m:
+        return int(m.group(1))
+    if '100' in name:
+        return 100
+    if '50' in name:
+        return 50
+    return default
+
+
+def is_ok_tag(name):
+    return 'ok' in (name or u"").lower()
+
+
+def line_count(text):
+    if not text:
+        return 1
+    c = 0
+    for ln in text.splitlines():
+        if ln and ln.strip():
+            c += 1
+    return max(1, c)
+
+
+def facing_xy(instance):
+    """Unit facing direction in plan, or None."""
+    f = instance.FacingOrientation
+    dx, dy = f.X, f.Y
+    len2 = dx * dx + dy * dy
+    if len2 <= EPS:
+        return None
+    if abs(len2 - 1.0) > 1e-6:
+        inv = 1.0 / (len2 ** 0.5)
+        dx *= inv
+        dy *= inv
+    return dx, dy
+
+
+def _category_value(element):
+    category = element.Category
+    return element_id_value(category.Id) if category is not None else None
+
+
+def _first(it):
+    for x in it:
+        return x
+    return None
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class OffsetSpec(object):
+    """Tag offset (feet, from the host point along FacingOrientation) as a table.
+
+    Args:
+        offsets: {scale: {diag_xor: (offset for 1 line, 2 lines, ...)}}
+            diag_xor is True when the facing points into the 2nd or 4th quadrant.
+        ok_factors: {scale: {diag_xor: factor}} for 'ok' tags (negative = other side).
+        default_scale: Scale used when the tag name has no scale.
+
+    Scales between two rows are interpolated, outside the table the nearest
+    row is used. More lines than the table has continue with the last step.
+    """
+
+    def __init__(self, offsets, ok_factors, default_scale=200):
+        self.offsets = offsets
+        self.ok_factors = ok_factors
+        self.default_scale = default_scale
+        self._memo = {}
+
+    def offset(self, scale, lines, diag_xor, ok=False):
+        key = (scale, lines, diag_xor, ok)
+        d = self._memo.get(key)
+        if d is None:
+            d = _interpolate(dict((s, _row_value(row[diag_xor], lines)) for s, row in self.offsets.items()), scale)
+            if ok:
+                d *= _interpolate(dict((s, row[diag_xor]) for s, row in self.ok_factors.items()), scale)
+            self._memo[key] = d
+        return d
+
+
+class TagPlacer(object):
+    """Move door/window tags out from their host along FacingOrientation.
+
+    All tag categories are collected in one collector pass, all hosts are
+    fetched with one collector over the tagged ids, and every new
+    TagHeadPosition is set in one transaction.
+
+    Example:
+        placer = TagPlacer(doc, view, {BuiltInCategory.OST_DoorTags: DOOR_TAG_OFFSETS,
+                                       BuiltInCategory.OST_WindowTags: WINDOW_TAG_OFFSETS})
+        report = placer.run()
+    """
+
+    def __init__(self, doc, view, specs):
+        self.doc = doc
+        self.view = view
+        self.categories = list(specs)
+        self.specs = dict((int(bic), spec) for bic, spec in specs.items())
+        self.report = {"tags": 0, "moved": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+
+    def collect(self):
+        cats = List[BuiltInCategory](self.categories)
+        tags = list(FilteredElementCollector(self.doc, self.view.Id)
+                    .WherePasses(ElementMulticategoryFilter(cats))
+                    .WhereElementIsNotElementType()
+                    .ToElements())
+        self.report["tags"] = len(tags)
+        return tags
+
+    def hosts(self, tags):
+        """{id value: FamilyInstance} for the first tagged element of every tag."""
+        ids = List[ElementId]()
+        for tag in tags:
+            eid = _first(tag.GetTaggedLocalElementIds())
+            if eid is not None:
+                ids.Add(eid)
+        if ids.Count == 0:
+            return {}
+        return dict((element_id_value(e.Id), e) for e in
+                    FilteredElementCollector(self.doc, ids).OfClass(FamilyInstance).ToElements())
+
+    def plan(self, tags):
+        """[(tag, new TagHeadPosition)] for tags that are not already in place."""
+        hosts = self.hosts(tags)
+        moves = []
+        for tag in tags:
+            spec = self.specs.get(_category_value(tag))
+            host = hosts.get(element_id_value(_first(tag.GetTaggedLocalElementIds())))
+            if spec is None or host is None:
+                self.report["skipped"] += 1
+                continue
+            location = host.Location
+            base = getattr(location, 'Point', None) if location is not None else None
+            facing = facing_xy(host)
+            if base is None or facing is None:
+                self.report["skipped"] += 1
+                continue
+            dx, dy = facing
+            diag_xor = (dx > 0.0 and dy < 0.0) or (dx < 0.0 and dy > 0.0)
+
+            try:
+                text = tag.TagText or ''
+            except Exception:
+                text = ''
+            name = tag.Name
+            d = spec.offset(tag_scale(name, spec.default_scale), line_count(text), diag_xor, is_ok_tag(name))
+
+            head = tag.TagHeadPosition
+            x, y = base.X + dx * d, base.Y + dy * d
+            if abs(x - head.X) <= EPS and abs(y - head.Y) <= EPS:
+                self.report["unchanged"] += 1
+                continue
+            moves.append((tag, XYZ(x, y, head.Z)))
+        return moves
+
+    def apply(self, moves, description='Move Tags'):
+        if not moves:
+            return
+        with revit_transaction(self.doc, description):
+            for tag, target in moves:
+                try:
+                    if getattr(tag, 'Pinned', False):
+                        tag.Pinned = False
+                    tag.TagHeadPosition = target
+                    self.report["moved"] += 1
+                except Exception:
+                    self.report["failed"] += 1
+
+    def run(self, description='Move Tags'):
+        tags = self.collect()
+        self.apply(self.plan(tags), description)
+        return self.report
+
+
+#  _____  ____  ____  _     _____ ____
+# /__ __\/  _ \/  _ \/ \   /  __// ___\
+#   / \  | / \|| | //| |   |  \  |    \
+#   | |  | |-||| |_\\| |_/\|  /_ \___ |
+#   \_/  \_/ \|\____/\____/\____\\____/ OFFSET TABLES (feet)
+#===========================================================================================================#
+
+DOOR_TAG_OFFSETS = OffsetSpec(
+    offsets={
+        50: {True: (1.00, 1.27, 1.54, 1.81, 2.08, 2.35, 2.62),
+             False: (1.00, 1.27, 1.54, 1.81, 2.08, 2.35, 2.62)},
+        100: {True: (1.20, 1.60, 2.00, 2.40, 2.80, 3.20, 3.60),
+              False: (1.20, 1.60, 2.00, 2.40, 2.80, 3.20, 3.60)},
+        200: {True: (1.20, 1.68, 2.16, 2.64, 3.12, 3.60, 4.08),
+              False: (1.20, 1.68, 2.16, 2.64, 3.12, 3.60, 4.08)},
+    },
+    ok_factors={
+        50: {True: -0.60, False: -0.60},
+        100: {True: -1.00, False: -1.00},
+        200: {True: -0.60, False: -0.60},
+    },
+)
+
+WINDOW_TAG_OFFSETS = OffsetSpec(
+    offsets={
+        50: {True: (0.73, 1.00, 1.27, 1.54, 1.81, 2.08, 2.35),
+             False: (1.43, 1.70, 1.97, 2.24, 2.51, 2.78, 3.05)},
+        100: {True: (0.90, 1.29, 1.68, 2.07, 2.46, 3.15),
+              False: (1.50, 1.89, 2.28, 2.67, 3.06, 3.45)},
+        200: {True: (0.80, 1.32, 1.84, 2.36, 2.88, 3.40, 3.92),
+              False: (1.70, 2.22, 2.74, 3.26, 3.78, 4.30, 4.82)},
+    },
+    ok_factors={
+        50: {True: -0.60, False: -0.60},
+        100: {True: -1.15, False: -0.60},
+        200: {True: -0.60, False: -0.60},
+    },
+)
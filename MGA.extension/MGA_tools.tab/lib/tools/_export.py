@@ -3,10 +3,9 @@
 Verkyøy for eksport av tegning fra Revit
 """
 # Imports
-import encodings
-from hmac import new
 import os
 import csv
+import itertools
 from Autodesk.Revit.DB import\
     FilteredElementCollector\
     ,ViewSheetSet\
@@ -91,4 +90,115 @@ def export_to_csv(column_order, data, filename):
             writer.writerow(ordered_row)
 
         file.flush()
-        file.close()
\ No newline at end of file
+        file.close()
+
+
+#------------------------------------------- XLSX -------------------------------------------#
+# Minimal xlsx (Office Open XML) med berre zipfile - openpyxl finst ikkje i IronPython.
+
+_XLSX_CONTENT_TYPES = (
+    u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    u'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    u'<Default Extension="xml" ContentType="application/xml"/>'
+    u'<Override PartName="/xl/workbook.xml" '
+    u'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    u'{}</Types>')
+_XLSX_SHEET_TYPE = (u'<Override PartName="/xl/worksheets/sheet{}.xml" '
+                    u'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+_XLSX_ROOT_RELS = (
+    u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    u'<Relationship Id="rId1" '
+    u'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    u'Target="xl/workbook.xml"/></Relationships>')
+_XLSX_WORKBOOK = (
+    u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    u'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    u'<sheets>{}</sheets></workbook>')
+_XLSX_WORKBOOK_RELS = (
+    u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    u'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{}</Relationships>')
+_XLSX_SHEET_REL = (u'<Relationship Id="rId{0}" '
+                   u'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                   u'Target="worksheets/sheet{0}.xml"/>')
+_XLSX_SHEET_HEAD = (u'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                    u'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+_XLSX_SHEET_TAIL = u'</sheetData></worksheet>'
+
+
+def _escape(text, entities=None):
+    """Som xml.sax.saxutils.escape. saxutils dreg inn urllib/http/ssl ved import."""
+    text = text.replace(u"&", u"&amp;").replace(u"<", u"&lt;").replace(u">", u"&gt;")
+    for key, value in (entities or {}).items():
+        text = text.replace(key, value)
+    return text
+
+
+def _xlsx_column(index):
+    """0 -> 'A', 25 -> 'Z', 26 -> 'AA'."""
+    letters = u""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = u"ABCDEFGHIJKLMNOPQRSTUVWXYZ"[rest] + letters
+    return letters
+
+
+def _xlsx_cell(ref, value):
+    if isinstance(value, bool) or value is None:
+        value = u"" if value is None else value
+    elif isinstance(value, (int, float)):
+        return u'<c r="{}"><v>{!r}</v></c>'.format(ref, value)
+    text = value if isinstance(value, type(u"")) else str(value)
+    return u'<c r="{}" t="inlineStr"><is><t xml:space="preserve">{}</t></is></c>'.format(ref, _escape(text))
+
+
+def _xlsx_sheet_name(name, used):
+    name = u"".join(u"_" if ch in u"[]:*?/\\" else ch for ch in name)[:31] or u"Ark"
+    base, n = name, 2
+    while name.lower() in used:
+        suffix = u" ({})".format(n)
+        name = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(name.lower())
+    return name
+
+
+def export_to_xlsx(sheets, filename):
+    """Write [(sheet name, column_order, data)] to an xlsx file.
+
+    data is a list of dicts like for export_to_csv. Numbers are written as
+    numbers, everything else as text. One row at a time is turned into XML,
+    so only the XML of one sheet is held in memory.
+    """
+    import zipfile   # først her; knappen som berre reknar areal treng han ikkje
+
+    used = set()
+    names = [_xlsx_sheet_name(sheet[0], used) for sheet in sheets]
+    with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive:
+        def put(path, text):
+            archive.writestr(path, text.encode("utf-8"))
+
+        put("[Content_Types].xml", _XLSX_CONTENT_TYPES.format(
+            u"".join(_XLSX_SHEET_TYPE.format(i) for i in range(1, len(sheets) + 1))))
+        put("_rels/.rels", _XLSX_ROOT_RELS)
+        put("xl/workbook.xml", _XLSX_WORKBOOK.format(u"".join(
+            u'<sheet name="{}" sheetId="{}" r:id="rId{}"/>'.format(_escape(name, {u'"': u"&quot;"}), i, i)
+            for i, name in enumerate(names, 1))))
+        put("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS.format(
+            u"".join(_XLSX_SHEET_REL.format(i) for i in range(1, len(sheets) + 1))))
+
+        for i, (_, column_order, data) in enumerate(sheets, 1):
+            columns = [_xlsx_column(c) for c in range(len(column_order))]
+            parts = [_XLSX_SHEET_HEAD]
+            rows = [dict(zip(column_order, column_order))]
+            for r, row in enumerate(itertools.chain(rows, data), 1):
+                parts.append(u'<row r="{}">'.format(r))
+                for col, key in zip(columns, column_order):
+                    parts.append(_xlsx_cell(u"{}{}".format(col, r), row.get(key, u"")))
+                parts.append(u'</row>')
+            parts.append(_XLSX_SHEET_TAIL)
+            put("xl/worksheets/sheet{}.xml".format(i), u"".join(parts))
+
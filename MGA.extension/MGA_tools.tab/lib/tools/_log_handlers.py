@@ -0,0 +1,109 @@
+# encoding: utf-8
+"""
+Handlers for ScriptLogger(queued=True), and the JSON-lines formatter (json_lines=True).
+
+The file is written by a background thread, so logging on the Revit UI thread
+only puts a record on a queue. IronPython 2.7 has no logging.handlers.QueueHandler
+or QueueListener, so minimal versions are used when the stdlib lacks them.
+"""
+import datetime
+import json
+import logging
+import logging.handlers
+import threading
+
+try:
+    import queue as _queue
+except ImportError:                     # IronPython 2.7
+    import Queue as _queue
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message (+ data if given via extra)."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            entry["data"] = data
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.Handler):
+    """Put records on a queue (same behaviour as logging.handlers.QueueHandler)."""
+
+    def __init__(self, q):
+        logging.Handler.__init__(self)
+        self.queue = q
+
+    def prepare(self, record):
+        # Message is built here, so the writer thread never touches caller objects.
+        msg = record.getMessage()
+        record.msg = msg
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _QueueListener(object):
+    """Background thread that hands queued records to the real handlers."""
+
+    _sentinel = None
+
+    def __init__(self, q, *handlers):
+        self.queue = q
+        self.handlers = handlers
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._monitor, name="ScriptLogger-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _monitor(self):
+        while True:
+            record = self.queue.get()
+            if record is self._sentinel:
+                break
+            for handler in self.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def stop(self):
+        if self._thread is not None:
+            self.queue.put_nowait(self._sentinel)
+            self._thread.join()
+            self._thread = None
+
+
+QueueHandler = getattr(logging.handlers, "QueueHandler", _QueueHandler)
+QueueListener = getattr(logging.handlers, "QueueListener", _QueueListener)
+
+
+def queued_file_handler(log_file_path, formatter, max_bytes=5 * 1024 * 1024, backup_count=3):
+    """Return (queue_handler, listener). The listener is already started.
+
+    The file rotates when it reaches max_bytes; backup_count old files are kept.
+    """
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+    file_handler.setFormatter(formatter)
+    q = _queue.Queue(-1)
+    listener = QueueListener(q, file_handler)
+    listener.start()
+    return QueueHandler(q), listener
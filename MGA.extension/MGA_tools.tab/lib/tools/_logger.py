@@ -1,12 +1,77 @@
 # logger.py
 
 
+import atexit
+import functools
 import logging
 import os
+import tempfile
+import time
+
+_now = getattr(time, "perf_counter", time.time)
+
+# Køa loggarar som ikkje er lukka enno. Éin atexit-funksjon for alle: atexit.unregister
+# finst ikkje i IronPython 2.7, og close() skal sleppe loggaren i den langlevde Revit-prosessen.
+_open_loggers = set()
+_atexit_registered = []
+
+
+def _close_open_loggers():
+    for logger in list(_open_loggers):
+        logger.close()
+
+
+def _extra(data):
+    """extra= for a logging call; JsonLinesFormatter writes record.data as "data"."""
+    return {"data": data} if data is not None else None
+
+
+class _TimedSection(object):
+    """Returned by ScriptLogger.timed(). Works both as 'with' block and as decorator."""
+
+    def __init__(self, owner, section):
+        self.owner = owner
+        self.section = section
+        self._starts = []
+
+    def __enter__(self):
+        self._starts.append(_now())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.owner._add_time(self.section, _now() - self._starts.pop())
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
 
 class ScriptLogger(object):
-    def __init__(self, name='DoorScript', log_to_file=False, log_file_path=None):
+    """
+    Args:
+        name (str): Logger name, also the log file name.
+        log_to_file (bool): Also write to %TEMP%/<name>.log (or log_file_path).
+        queued (bool): Write the file from a background thread (QueueHandler/QueueListener),
+            with size-based rotation. Logging calls then never wait for the disk.
+        json_lines (bool): File lines as JSON objects instead of plain text (<name>.jsonl).
+        max_bytes / backup_count: Rotation settings for queued mode.
+
+    Call close() at the end of a queued run to flush the file; loggers not closed are closed at exit.
+    """
+    def __init__(self, name='DoorScript', log_to_file=False, log_file_path=None,
+                 queued=False, json_lines=False, max_bytes=5 * 1024 * 1024, backup_count=3):
         self.logger = logging.getLogger(name)
+        self.name = name
+        self._timings = {}      # section -> [seconds, calls]
+        self._order = []
+        self._counters = {}
+        self._started = _now()
+        self._listener = None
+        self._own_handlers = []
 
         if not self.logger.handlers:
             formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
@@ -19,18 +84,135 @@ class ScriptLogger(object):
             if log_to_file:
                 if not log_file_path:
                     # Default log file in user temp folder
-                    log_file_path = os.path.join(os.getenv('TEMP'), '{}.log'.format(name))
-                file_handler = logging.FileHandler(log_file_path)
-                file_handler.setFormatter(formatter)
+                    log_file_path = os.path.join(os.getenv('TEMP') or tempfile.gettempdir(),
+                                                 '{}.{}'.format(name, 'jsonl' if json_lines else 'log'))
+                file_formatter = formatter
+                if json_lines:
+                    from tools._log_handlers import JsonLinesFormatter
+                    file_formatter = JsonLinesFormatter()
+                if queued:
+                    from tools._log_handlers import queued_file_handler
+                    file_handler, self._listener = queued_file_handler(
+                        log_file_path, file_formatter, max_bytes, backup_count)
+                    self._own_handlers = [console_handler, file_handler]
+                    _open_loggers.add(self)
+                    if not _atexit_registered:
+                        atexit.register(_close_open_loggers)
+                        _atexit_registered.append(True)
+                else:
+                    file_handler = logging.FileHandler(log_file_path)
+                    file_handler.setFormatter(file_formatter)
                 self.logger.addHandler(file_handler)
 
             self.logger.setLevel(logging.INFO)
 
-    def info(self, msg):
-        self.logger.info(msg)
+    def info(self, msg, data=None):
+        self.logger.info(msg, extra=_extra(data))
+
+    def warning(self, msg, data=None):
+        self.logger.warning(msg, extra=_extra(data))
+
+    def error(self, msg, data=None):
+        self.logger.error(msg, extra=_extra(data))
+
+    def close(self):
+        """Stop the writer thread (queued mode) after the queue is written to disk."""
+        _open_loggers.discard(self)
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        listener.stop()
+        # neste kjøring i samme motor skal sette opp handlerne på nytt
+        for handler in self._own_handlers:
+            self.logger.removeHandler(handler)
+        self._own_handlers = []
+
+    # ---------------------------------- profiling ---------------------------------- #
+
+    def timed(self, section):
+        """Measure time spent in a section.
+
+            with logger.timed("probe"):
+                ...
+
+            @logger.timed("plan moves")
+            def plan_multiseg_moves(...):
+                ...
+
+        Nested and repeated sections add up; the summary shows total time and calls.
+        """
+        return _TimedSection(self, section)
+
+    def count(self, name, n=1):
+        """Count Revit API calls (collector runs, transactions, LookupParameter ...).
+
+        Each call is also logged at DEBUG level with {"counter", "n", "total"} as data;
+        at the default INFO level that costs one level check.
+        """
+        if name not in self._counters:
+            self._counters[name] = 0
+        self._counters[name] += n
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("count %s +%d", name, n,
+                              extra=_extra({"counter": name, "n": n, "total": self._counters[name]}))
+
+    def _add_time(self, section, seconds):
+        if section not in self._timings:
+            self._timings[section] = [0.0, 0]
+            self._order.append(section)
+        entry = self._timings[section]
+        entry[0] += seconds
+        entry[1] += 1
+
+    def timings(self):
+        """{section: (seconds, calls)}"""
+        return dict((k, tuple(v)) for k, v in self._timings.items())
+
+    def counters(self):
+        return dict(self._counters)
+
+    def summary_data(self):
+        """The summary as a dict: total_s, timings {section: {seconds, calls}}, counters."""
+        return {
+            "total_s": _now() - self._started,
+            "timings": dict((section, {"seconds": seconds, "calls": calls})
+                            for section, (seconds, calls) in self._timings.items()),
+            "counters": dict(self._counters),
+        }
+
+    def summary(self):
+        """Table with timed sections (slowest first) and counters."""
+        total = _now() - self._started
+        lines = ["{} - run summary ({:.3f} s total)".format(self.name, total)]
+        if self._timings:
+            width = max(len(s) for s in self._timings)
+            lines.append("  {:<{w}}  {:>10}  {:>7}  {:>6}".format("section", "seconds", "calls", "%", w=width))
+            for section in sorted(self._order, key=lambda s: -self._timings[s][0]):
+                seconds, calls = self._timings[section]
+                share = 100.0 * seconds / total if total > 0 else 0.0
+                lines.append("  {:<{w}}  {:>10.4f}  {:>7}  {:>6.1f}".format(section, seconds, calls, share, w=width))
+        if self._counters:
+            width = max(len(c) for c in self._counters)
+            lines.append("  {:<{w}}  {:>10}".format("counter", "count", w=width))
+            for name in sorted(self._counters):
+                lines.append("  {:<{w}}  {:>10}".format(name, self._counters[name], w=width))
+        return "\n".join(lines)
 
-    def warning(self, msg):
-        self.logger.warning(msg)
+    def emit_summary(self, to_console=False):
+        """Write the summary table to the log file (and console if to_console=True).
 
-    def error(self, msg):
-        self.logger.error(msg)
+        Call this at the end of main(). Without a file handler the summary goes to the console.
+        The record carries summary_data() as data, so json_lines files get the numbers too.
+        """
+        text = self.summary()
+        extra = _extra(self.summary_data())
+        file_handlers = [h for h in self.logger.handlers
+                         if isinstance(h, logging.FileHandler) or hasattr(h, "queue")]
+        if to_console or not file_handlers:
+            self.logger.info(text, extra=extra)
+            return text
+        record = self.logger.makeRecord(self.logger.name, logging.INFO, __file__, 0, text, None, None,
+                                        extra=extra)
+        for handler in file_handlers:
+            handler.handle(record)
+        return text
@@ -0,0 +1,128 @@
+# encoding: utf-8
+"""
+Sidecar JSON with one fingerprint per element (keyed by UniqueId).
+
+A button stores what the element looked like after its last run. On the next
+run elements with the same fingerprint can be skipped, so a rerun only costs
+as much as the number of changed elements.
+
+    store = FingerprintStore.for_document(doc, "Dimensionline_clean", settings=SETTINGS)
+    dirty = [d for d in dims if not store.is_unchanged(d.UniqueId, fingerprint(d))]
+    ...
+    for d in dirty:
+        store.update(d.UniqueId, fingerprint(d))     # after the changes are committed
+    store.save()
+
+SidecarCache keeps a value next to each fingerprint, so an unchanged element
+gets its last result back without the expensive part being repeated.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+
+def fingerprint(*parts):
+    """Short stable hash of the parts (floats should be rounded by the caller)."""
+    text = u"|".join(u"{}".format(p) for p in parts)
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+class FingerprintStore(object):
+    """Fingerprints for one document and one tool.
+
+    Args:
+        path (str): JSON file. None = nothing is read or written (every element is dirty).
+        settings: Anything JSON-serialisable describing the tool settings.
+            A file written with other settings is ignored.
+    """
+
+    def __init__(self, path, settings=None):
+        self.path = path
+        self.settings = settings
+        self._items = self._load()
+        self._dirty = False
+        self.skipped = 0
+
+    @classmethod
+    def for_document(cls, doc, name, settings=None, folder=None):
+        """Store in %TEMP% named after the tool and the document path (or title if not saved)."""
+        doc_key = doc.PathName or doc.Title
+        if not doc_key:
+            return cls(None, settings)
+        digest = hashlib.md5(doc_key.encode("utf-8")).hexdigest()[:12]
+        folder = folder or os.getenv('TEMP') or tempfile.gettempdir()
+        return cls(os.path.join(folder, u"{}_{}.json".format(name, digest)), settings)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if data.get("settings") != self.settings:
+            return {}   # nye innstillingar - alt må køyrast på nytt
+        return data.get("items", {})
+
+    def is_unchanged(self, key, fp):
+        if self._items.get(key) == fp:
+            self.skipped += 1
+            return True
+        return False
+
+    def update(self, key, fp):
+        if self._items.get(key) != fp:
+            self._items[key] = fp
+            self._dirty = True
+
+    def forget(self, key):
+        if self._items.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty or not self.path:
+            return
+        try:
+            with open(self.path, "w") as f:
+                json.dump({"settings": self.settings, "items": self._items}, f)
+            self._dirty = False
+        except (IOError, OSError):
+            pass
+
+
+class SidecarCache(FingerprintStore):
+    """Cached value per element, valid as long as the element's fingerprint is the same.
+
+        cache = SidecarCache.for_document(doc, "SetMUA_geometry", settings=SETTINGS)
+        value = cache.get(region.UniqueId, fp)
+        if value is None:
+            value = measure(region)
+            cache.put(region.UniqueId, fp, value)
+        cache.save()
+
+    Values must be JSON-serialisable (lists come back as lists).
+    """
+
+    def __init__(self, path, settings=None):
+        FingerprintStore.__init__(self, path, settings)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, fp):
+        item = self._items.get(key)
+        if item is not None and item[0] == fp:
+            self.hits += 1
+            return item[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, fp, value):
+        item = [fp, value]
+        if self._items.get(key) != item:
+            self._items[key] = item
+            self._dirty = True
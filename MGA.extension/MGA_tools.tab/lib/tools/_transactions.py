@@ -1,7 +1,15 @@
 # encoding: utf-8
+import time
 from contextlib import contextmanager
 from Autodesk.Revit.DB import Transaction, TransactionGroup
 
+_now = getattr(time, "perf_counter", time.time)
+
+try:
+    _STRING_TYPES = (basestring,)
+except NameError:
+    _STRING_TYPES = (str,)
+
 
 @contextmanager
 def revit_transaction(doc, description):
@@ -39,4 +47,168 @@ def try_and_except(description):
         yield
     except Exception as e:
         print("Operation {} failed: {}".format(description,e))
-        raise
\ No newline at end of file
+        raise
+
+
+class TransactionBatcher(object):
+    """Queue Revit edits and commit them in chunks inside one TransactionGroup.
+
+    An edit is either a callable (called without arguments) or an
+    (element, parameter, value) tuple. The parameter can be a Parameter,
+    a parameter name (resolved with LookupParameter) or a BuiltInParameter.
+
+    Example:
+        with TransactionBatcher(doc, "Sett areal", chunk_size=500) as batch:
+            for fr in filled_regions:
+                batch.add((fr, "Areal", area))
+        print(batch.summary())
+
+    Args:
+        doc: Revit document.
+        description (str): Name of the TransactionGroup (and prefix of each chunk).
+        chunk_size (int): Edits per Transaction. None or 0 commits everything at once.
+        logger: Optional ScriptLogger, receives one line per committed chunk.
+        transaction_cls / group_cls: Overrides for Transaction/TransactionGroup,
+            so the batcher can be driven by stubs outside Revit.
+    """
+
+    def __init__(self, doc, description, chunk_size=500, logger=None,
+                 transaction_cls=None, group_cls=None):
+        if doc is None:
+            raise AttributeError("Document is null. Transaction cannot be started.")
+        self.doc = doc
+        self.description = description
+        self.chunk_size = chunk_size
+        self.logger = logger
+        self._transaction_cls = transaction_cls or Transaction
+        self._group_cls = group_cls or TransactionGroup
+        self._queue = []
+        self.chunk_reports = []
+        self.failed = []
+        self.applied = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self._queue = []
+        return False
+
+    def add(self, edit):
+        """Queue one edit (callable or (element, parameter, value) tuple)."""
+        if not callable(edit) and len(edit) != 3:
+            raise ValueError("Edit must be a callable or an (element, parameter, value) tuple")
+        self._queue.append(edit)
+
+    def extend(self, edits):
+        for edit in edits:
+            self.add(edit)
+
+    def flush(self):
+        """Commit all queued edits. Returns the list of chunk reports.
+
+        applied, failed and chunk_reports describe this flush only. If a chunk
+        raises, the whole group is rolled back and they are cleared again.
+        """
+        if not self._queue:
+            return self.chunk_reports
+        edits, self._queue = self._queue, []
+        self.chunk_reports = []
+        self.failed = []
+        self.applied = 0
+
+        tg = self._group_cls(self.doc, self.description)
+        try:
+            tg.Start()
+            chunks = self._chunks(edits)
+            for index, chunk in enumerate(chunks, start=1):
+                self._run_chunk(index, len(chunks), chunk)
+            tg.Assimilate()
+        except Exception as e:
+            message = "Transaction {} failed: {}".format(self.description, e)
+            if self.logger:
+                self.logger.error(message)
+            else:
+                print(message)
+            if tg.HasStarted():
+                tg.RollBack()
+            # Ingenting av gruppa står att i modellen
+            self.chunk_reports = []
+            self.failed = []
+            self.applied = 0
+            raise
+        return self.chunk_reports
+
+    def summary(self):
+        """Short text summary of the last flush (for logs and dialogs)."""
+        total = sum(r["seconds"] for r in self.chunk_reports)
+        commit = sum(r["commit_seconds"] for r in self.chunk_reports)
+        return "{}: {} edits in {} chunk(s), {} failed, {:.3f}s total ({:.3f}s in Commit)".format(
+            self.description, self.applied, len(self.chunk_reports), len(self.failed), total, commit)
+
+    def _chunks(self, edits):
+        size = self.chunk_size or len(edits)
+        return [edits[i:i + size] for i in range(0, len(edits), size)]
+
+    def _run_chunk(self, index, count, chunk):
+        name = self.description if count == 1 else "{} ({}/{})".format(self.description, index, count)
+        tx = self._transaction_cls(self.doc, name)
+        applied = 0
+        failed = 0
+        start = _now()
+        tx.Start()
+        try:
+            for edit in chunk:
+                try:
+                    _apply_edit(edit)
+                    applied += 1
+                except Exception as e:
+                    failed += 1
+                    self.failed.append((edit, e))
+            commit_start = _now()
+            tx.Commit()
+            commit_seconds = _now() - commit_start
+        except Exception:
+            if tx.HasStarted():
+                tx.RollBack()
+            raise
+
+        self.applied += applied
+        if hasattr(self.logger, "count"):
+            self.logger.count("transactions")
+        report = {
+            "chunk": index,
+            "edits": len(chunk),
+            "applied": applied,
+            "failed": failed,
+            "seconds": _now() - start,
+            "commit_seconds": commit_seconds,
+        }
+        self.chunk_reports.append(report)
+        if self.logger:
+            self.logger.info("{}: chunk {}/{} committed {} edits ({} failed) in {:.3f}s".format(
+                self.description, index, count, applied, failed, report["seconds"]))
+        return report
+
+
+def _apply_edit(edit):
+    if callable(edit):
+        return edit()
+    element, param, value = edit
+    if isinstance(param, _STRING_TYPES):
+        param = element.LookupParameter(param)
+    elif not hasattr(param, "Set"):
+        param = element.get_Parameter(param)
+    if param is None:
+        raise LookupError("Parameter not found on element {}".format(element.Id))
+    if param.IsReadOnly:
+        raise ValueError("Parameter {} is read-only".format(param.Definition.Name))
+    if param.Set(value) is False:
+        raise ValueError("Parameter {} was not set to {!r}".format(param.Definition.Name, value))
+    return True
@@ -0,0 +1,93 @@
+# encoding: utf-8
+"""
+View selection and progress for buttons that can run on many views.
+
+    views = choose_views(doc, uidoc.ActiveView, "Rydd mållinjer")
+    with progress_bar(len(views)) as pb:
+        for i, v in enumerate(views, start=1):
+            if pb.cancelled:
+                break
+            ...
+            pb.update_progress(i, len(views))
+"""
+from Autodesk.Revit.DB import FilteredElementCollector, ViewSheet
+from pyrevit import forms
+
+from parameterUtils._bulk_writer import element_id_value
+
+ACTIVE_VIEW = u"Aktivt view"
+PICK_VIEWS = u"Velg views"
+VIEWS_ON_SHEETS = u"Alle views på ark"
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def views_on_sheets(doc, view_types=None):
+    """All views placed on sheets (each view once, no templates), sorted by name.
+
+    view_types: optional collection of ViewType to keep (e.g. plans and sections only).
+    """
+    seen = set()
+    views = []
+    sheets = FilteredElementCollector(doc).OfClass(ViewSheet).WhereElementIsNotElementType().ToElements()
+    for sheet in sheets:
+        for vid in sheet.GetAllPlacedViews():
+            key = element_id_value(vid)
+            if key in seen:
+                continue
+            seen.add(key)
+            v = doc.GetElement(vid)
+            if v is None or v.IsTemplate:
+                continue
+            if view_types and v.ViewType not in view_types:
+                continue
+            views.append(v)
+    return sorted(views, key=lambda v: v.Name)
+
+
+def choose_views(doc, active_view, title=u"Velg views", view_types=None):
+    """Ask for active view / picked views / all views on sheets.
+
+    Returns a list of views, or None if the user cancelled.
+    """
+    choice = forms.CommandSwitchWindow.show([ACTIVE_VIEW, PICK_VIEWS, VIEWS_ON_SHEETS], message=title)
+    if not choice:
+        return None
+    if choice == ACTIVE_VIEW:
+        return [active_view]
+    if choice == PICK_VIEWS:
+        picked = forms.select_views(title=title, multiple=True)
+        return list(picked) if picked else None
+    return views_on_sheets(doc, view_types)
+
+
+def progress_bar(count, title=u"{value} av {max_value}"):
+    """Cancellable pyRevit ProgressBar when there is more than one step, else a silent stand-in."""
+    if count > 1:
+        return forms.ProgressBar(title=title, cancellable=True, step=1)
+    return _NoProgress()
+
+
+#  ____  _     ____  ____  ____  _____ ____
+# /   _\/ \   /  _ \/ ___\/ ___\/  __// ___\
+# |  /  | |   | / \||    \|    \|  \  |    \
+# |  \__| |_/\| |-||\___ |\___ ||  /_ \___ |
+# \____/\____/\_/ \|\____/\____/\____\\____/ CLASSES
+#===========================================================================================================#
+
+class _NoProgress(object):
+    cancelled = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update_progress(self, new_value, max_value=1):
+        pass
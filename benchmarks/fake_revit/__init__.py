@@ -0,0 +1,228 @@
+# encoding: utf-8
+"""
+Fake Revit/pyRevit-miljø for å kjøre lib og knappe-skript utenfor Revit (CPython).
+
+    import fake_revit
+    fake_revit.install()
+    doc, view = fake_revit.documents.dimension_view(1000)
+    fake_revit.activate(doc, view)
+    import tools._transactions   # Autodesk.*, System.*, pyrevit, clr ... er nå fakes
+
+Autodesk.Revit.DB, Autodesk.Revit.UI, pyrevit og System.Collections.Generic har
+fungerende fakes (se _db.py og _ui.py). Alle andre navn under STUB_ROOTS er
+stubber som godtar alle attributter, kall og arv, slik at import av et skript
+går gjennom.
+"""
+import importlib.abc
+import importlib.machinery
+import sys
+import types
+
+# Rot-moduler som alltid stubbes. requests/pybase64 stubbes bare hvis de mangler.
+STUB_ROOTS = ("Autodesk", "System", "pyrevit", "clr", "wpf", "RevitServices", "RevitNodes")
+OPTIONAL_ROOTS = ("requests", "pybase64")
+
+
+class _AnythingMeta(type):
+    """Gjør at også klasse-attributter (BuiltInCategory.OST_Doors osv.) finnes."""
+
+    def __getattr__(cls, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _make_stub(name)
+
+    def __getitem__(cls, item):
+        return cls
+
+    def __iter__(cls):
+        return iter(())
+
+
+class _Anything(object, metaclass=_AnythingMeta):
+    """Instans som svarer på alt: attributter, kall, iterasjon, tall og with."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Anything()
+
+    def __call__(self, *args, **kwargs):
+        return _Anything()
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return False
+
+    def __int__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getitem__(self, item):
+        return _Anything()
+
+
+def _make_stub(name):
+    return _AnythingMeta(str(name), (_Anything,), {})
+
+
+class _StubModule(types.ModuleType):
+    """Modul der alle navn er stub-klasser (kan både kalles og arves fra)."""
+
+    __path__ = []   # oppfører seg som en pakke, så undermoduler kan importeres
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = _make_stub(name)
+        setattr(self, name, value)
+        return value
+
+
+def _public(module):
+    return dict((k, v) for k, v in vars(module).items() if not k.startswith("_"))
+
+
+def _db_attrs():
+    from . import _db
+    return _public(_db)
+
+
+def _exceptions_attrs():
+    from . import _db
+    return {"InvalidOperationException": _db.InvalidOperationException,
+            "ArgumentException": ValueError,
+            "OperationCanceledException": KeyboardInterrupt}
+
+
+def _ui_attrs():
+    from . import _ui
+    names = ("TaskDialog", "TaskDialogResult", "TaskDialogCommonButtons",
+             "TaskDialogCommandLinkId", "UIDocument", "UIApplication")
+    return dict((n, getattr(_ui, n)) for n in names)
+
+
+def _generic_attrs():
+    from . import _ui
+    return {"List": _ui.List, "IList": _ui.IList, "ICollection": _ui.ICollection,
+            "HashSet": _ui.HashSet}
+
+
+def _pyrevit_attrs():
+    from . import _db, _ui
+    return {"revit": _ui.revit, "forms": _ui.forms, "script": _ui.script,
+            "HOST_APP": _ui.HOST_APP, "DB": sys.modules["Autodesk.Revit.DB"],
+            "UI": sys.modules["Autodesk.Revit.UI"]}
+
+
+def _framework_attrs():
+    from . import _ui
+    return {"List": _ui.List}
+
+
+def _builtins_attrs():
+    return {"unicode": str, "basestring": str}
+
+
+# Moduler med fungerende fakes; resten av navnene blir stubber.
+PREPARED = {
+    "Autodesk.Revit.DB": _db_attrs,
+    "Autodesk.Revit.Exceptions": _exceptions_attrs,
+    "Autodesk.Revit.UI": _ui_attrs,
+    "System.Collections.Generic": _generic_attrs,
+    "pyrevit": _pyrevit_attrs,
+    "pyrevit.framework": _framework_attrs,
+}
+
+
+class _StubFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+
+    def __init__(self, roots):
+        self.roots = set(roots)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname.split(".")[0] in self.roots:
+            return importlib.machinery.ModuleSpec(fullname, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        return _StubModule(spec.name)
+
+    def exec_module(self, module):
+        parent, _, child = module.__name__.rpartition(".")
+        if parent and parent in sys.modules:
+            setattr(sys.modules[parent], child, module)
+        if module.__name__ == "pyrevit":
+            __import__("Autodesk.Revit.DB")
+            __import__("Autodesk.Revit.UI")
+        prepare = PREPARED.get(module.__name__)
+        if prepare is not None:
+            module.__dict__.update(prepare())
+
+
+_installed = None
+
+
+def _importable(name):
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def install():
+    """Legg fakes inn i sys.meta_path og sett __revit__. Trygt å kalle flere ganger.
+
+    IronPython-builtins som mangler i Python 3 (unicode, basestring) legges også inn.
+    """
+    global _installed
+    if _installed is not None:
+        return _installed
+    roots = list(STUB_ROOTS) + [r for r in OPTIONAL_ROOTS if not _importable(r)]
+    _installed = _StubFinder(roots)
+    sys.meta_path.insert(0, _installed)
+
+    import builtins
+    from . import _ui
+    for name, value in _builtins_attrs().items():
+        if not hasattr(builtins, name):
+            setattr(builtins, name, value)
+    builtins.__revit__ = _ui.UIApplication()
+    return _installed
+
+
+def activate(doc, view=None, selection=None, answers=None):
+    """Gjør doc (og view) aktiv for __revit__, pyrevit.revit og UIDocument."""
+    from . import _ui
+    if view is not None:
+        doc.ActiveView = view
+    _ui.STATE.doc = doc
+    _ui.STATE.selection = list(selection or [])
+    _ui.STATE.answers = dict(answers or {})
+    _ui.STATE.dialogs = []
+    return doc
+
+
+def state():
+    """Aktiv tilstand (doc, selection, answers, dialogs)."""
+    from . import _ui
+    return _ui.STATE
+
+
+from . import documents  # noqa: E402  (fake_revit.documents.dimension_view(...) osv.)
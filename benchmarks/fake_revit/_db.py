@@ -0,0 +1,1346 @@
+# encoding: utf-8
+"""
+Fake Autodesk.Revit.DB: de delene av API-et som MGA-verktøyene bruker.
+
+Modellen er bevisst enkel, men oppfører seg som Revit der det påvirker ytelse
+og korrekthet:
+  - endringer (Parameter.Set, TextPosition, MoveElement ...) krever en åpen
+    Transaction og rulles tilbake med RollBack / TransactionGroup.RollBack
+  - FilteredElementCollector går gjennom alle elementene i dokumentet/viewet
+  - alle API-kall som er interessante for profilering telles i doc.counters
+"""
+import itertools
+import math
+
+
+#  ____  _     ____  ____  _  ____  ____
+# /  __\/ \ /\/  _ \/ ___\/ \/   _\/ ___\
+# | | //| | ||| / \||    \| ||  /  |    \
+# | |_\\| \_/|| |-||\___ || ||  \__\___ |
+# \____/\____/\_/ \|\____/\_/\____/\____/ BASICS
+#===========================================================================================================#
+
+class InvalidOperationException(Exception):
+    """Revit kaster denne når modellen endres uten åpen transaksjon."""
+
+
+class _Enum(object):
+    """Enum-verdi med navn og heltall (str() gir navnet, som i IronPython)."""
+
+    def __init__(self, owner, name, value):
+        self._owner = owner
+        self._name = name
+        self._value = value
+
+    def __int__(self):
+        return self._value
+
+    def __index__(self):
+        return self._value
+
+    def __str__(self):
+        return self._name
+
+    def __repr__(self):
+        return "{}.{}".format(self._owner, self._name)
+
+    def __eq__(self, other):
+        if isinstance(other, _Enum):
+            return self._owner == other._owner and self._value == other._value
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self._owner, self._value))
+
+
+class _EnumMeta(type):
+    """Ukjente medlemmer (BuiltInParameter.XYZ) opprettes ved første oppslag."""
+
+    def __getattr__(cls, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        members = cls.__dict__["_members"]
+        if name not in members:
+            members[name] = _Enum(cls.__name__, name, cls._next_value())
+        return members[name]
+
+    def _next_value(cls):
+        cls._counter -= 1
+        return cls._counter
+
+
+def _enum(name, members=(), start=0, invalid=None):
+    cls = _EnumMeta(name, (object,), {"_members": {}, "_counter": -1000})
+    for i, member in enumerate(members):
+        cls._members[member] = _Enum(name, member, start + i)
+    if invalid is not None:
+        cls._members["INVALID"] = _Enum(name, "INVALID", invalid)
+    return cls
+
+
+BuiltInParameter = _enum("BuiltInParameter", invalid=-1)
+BuiltInCategory = _enum("BuiltInCategory", invalid=-1)
+StorageType = _enum("StorageType", ("None", "Integer", "Double", "String", "ElementId"))
+DimensionStyleType = _enum("DimensionStyleType", ("Linear", "Angular", "Radial", "ArcLength",
+                                                  "Ordinate", "Diameter", "SpotElevation"))
+ViewType = _enum("ViewType", ("Undefined", "FloorPlan", "CeilingPlan", "Elevation", "ThreeD",
+                              "Schedule", "DrawingSheet", "Legend", "DraftingView", "Section",
+                              "AreaPlan", "EngineeringPlan", "Detail"))
+ViewDuplicateOption = _enum("ViewDuplicateOption", ("Duplicate", "AsDependent", "WithDetailing"))
+TransactionStatus = _enum("TransactionStatus", ("Uninitialized", "Started", "RolledBack",
+                                                "Committed", "Pending", "Error", "Proceed"))
+HorizontalTextAlignment = _enum("HorizontalTextAlignment", ("Left", "Center", "Right"))
+VerticalTextAlignment = _enum("VerticalTextAlignment", ("Top", "Middle", "Bottom"))
+TagOrientation = _enum("TagOrientation", ("Horizontal", "Vertical", "AnyModelDirection"))
+
+
+class ElementId(object):
+    __slots__ = ("_value",)
+
+    def __init__(self, value):
+        self._value = int(value)
+
+    @property
+    def Value(self):
+        return self._value
+
+    @property
+    def IntegerValue(self):
+        return self._value
+
+    def __int__(self):
+        return self._value
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other._value == self._value
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._value)
+
+    def __lt__(self, other):
+        return self._value < other._value
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "ElementId({})".format(self._value)
+
+    def ToString(self):
+        return str(self._value)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+#  _____ _____ ____  _      _____ _____  ____ ___  _
+# /  __//  __//  _ \/ \__/|/  __//__ __\/  __\\  \//
+# | |  _|  \  | / \|| |\/|||  \    / \  |  \/| \  /
+# | |_//|  /_ | \_/|| |  |||  /_   | |  |    / / /
+# \____\\____\\____/\_/  \|\____\  \_/  \_/\_\/_/  GEOMETRY
+#===========================================================================================================#
+
+class XYZ(object):
+    __slots__ = ("X", "Y", "Z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, k):
+        return XYZ(self.X * k, self.Y * k, self.Z * k)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k):
+        return XYZ(self.X / k, self.Y / k, self.Z / k)
+
+    __div__ = __truediv__
+
+    def __neg__(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def __repr__(self):
+        return "XYZ({:.6f}, {:.6f}, {:.6f})".format(self.X, self.Y, self.Z)
+
+    def Add(self, other):
+        return self + other
+
+    def Subtract(self, other):
+        return self - other
+
+    def Multiply(self, k):
+        return self * k
+
+    def DotProduct(self, other):
+        return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+
+    def CrossProduct(self, other):
+        return XYZ(self.Y * other.Z - self.Z * other.Y,
+                   self.Z * other.X - self.X * other.Z,
+                   self.X * other.Y - self.Y * other.X)
+
+    def GetLength(self):
+        return math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def Normalize(self):
+        length = self.GetLength()
+        return self if length == 0 else self / length
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def IsAlmostEqualTo(self, other, tolerance=1e-9):
+        return self.DistanceTo(other) <= tolerance
+
+
+XYZ.Zero = XYZ(0, 0, 0)
+XYZ.BasisX = XYZ(1, 0, 0)
+XYZ.BasisY = XYZ(0, 1, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class Transform(object):
+    """Bare translasjon; nok for crop-boksene i de syntetiske viewene."""
+
+    def __init__(self, origin=None):
+        self.Origin = origin or XYZ.Zero
+
+    @property
+    def Inverse(self):
+        return Transform(-self.Origin)
+
+    def OfPoint(self, p):
+        return p + self.Origin
+
+    def OfVector(self, v):
+        return v
+
+
+Transform.Identity = Transform()
+
+
+class BoundingBoxXYZ(object):
+
+    def __init__(self, minimum=None, maximum=None):
+        self.Min = minimum or XYZ.Zero
+        self.Max = maximum or XYZ.Zero
+        self.Transform = Transform.Identity
+        self.Enabled = True
+
+
+class IntersectionResult(object):
+
+    def __init__(self, point, parameter, distance):
+        self.XYZPoint = point
+        self.Parameter = parameter
+        self.Distance = distance
+
+
+class Curve(object):
+    pass
+
+
+class Line(Curve):
+
+    def __init__(self, origin, direction, length=None):
+        self.Origin = origin
+        self.Direction = direction.Normalize()
+        self._length = length
+        self.IsBound = length is not None
+
+    @classmethod
+    def CreateBound(cls, p0, p1):
+        return cls(p0, p1 - p0, p0.DistanceTo(p1))
+
+    @classmethod
+    def CreateUnbound(cls, origin, direction):
+        return cls(origin, direction)
+
+    @property
+    def Length(self):
+        return self._length or 0.0
+
+    def GetEndPoint(self, index):
+        return self.Origin if index == 0 else self.Origin + self.Direction * self.Length
+
+    def GetExactLength(self):
+        return self.Length
+
+    def Project(self, point):
+        t = (point - self.Origin).DotProduct(self.Direction)
+        if self.IsBound:
+            t = min(max(t, 0.0), self._length)
+        closest = self.Origin + self.Direction * t
+        return IntersectionResult(closest, t, closest.DistanceTo(point))
+
+
+class CurveLoop(object):
+
+    def __init__(self, curves=None):
+        self._curves = list(curves or [])
+
+    def Append(self, curve):
+        self._curves.append(curve)
+
+    def __iter__(self):
+        return iter(self._curves)
+
+    def GetExactLength(self):
+        return sum(c.GetExactLength() for c in self._curves)
+
+    @classmethod
+    def rectangle(cls, x, y, w, h):
+        p = [XYZ(x, y), XYZ(x + w, y), XYZ(x + w, y + h), XYZ(x, y + h)]
+        return cls(Line.CreateBound(p[i], p[(i + 1) % 4]) for i in range(4))
+
+
+class Plane(object):
+
+    @classmethod
+    def CreateByNormalAndOrigin(cls, normal, origin):
+        plane = cls()
+        plane.Normal, plane.Origin = normal, origin
+        return plane
+
+
+#  _     _      _  _____  ____
+# / \ /\/ \  /|/ \/__ __\/ ___\
+# | | ||| |\ ||| |  / \  |    \
+# | \_/|| | \||| |  | |  \___ |
+# \____/\_/  \|\_/  \_/  \____/ UNITS
+#===========================================================================================================#
+
+_MM_PER_FOOT = 304.8
+
+
+class ForgeTypeId(object):
+
+    def __init__(self, type_id, label, factor):
+        self.TypeId = type_id
+        self.label = label
+        self.factor = factor   # enheter per intern enhet (fot, fot², ...)
+
+    def __eq__(self, other):
+        return isinstance(other, ForgeTypeId) and other.TypeId == self.TypeId
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.TypeId)
+
+    def Empty(self):
+        return not self.TypeId
+
+
+class UnitTypeId(object):
+    Millimeters = ForgeTypeId("autodesk.unit.unit:millimeters", "Millimeters", _MM_PER_FOOT)
+    Centimeters = ForgeTypeId("autodesk.unit.unit:centimeters", "Centimeters", _MM_PER_FOOT / 10.0)
+    Meters = ForgeTypeId("autodesk.unit.unit:meters", "Meters", _MM_PER_FOOT / 1000.0)
+    Feet = ForgeTypeId("autodesk.unit.unit:feet", "Feet", 1.0)
+    SquareMeters = ForgeTypeId("autodesk.unit.unit:squareMeters", "Square meters", (_MM_PER_FOOT / 1000.0) ** 2)
+    CubicMeters = ForgeTypeId("autodesk.unit.unit:cubicMeters", "Cubic meters", (_MM_PER_FOOT / 1000.0) ** 3)
+    Degrees = ForgeTypeId("autodesk.unit.unit:degrees", "Degrees", 180.0 / math.pi)
+
+
+class SpecTypeId(object):
+    Length = ForgeTypeId("autodesk.spec.aec:length", "Length", 1.0)
+    Area = ForgeTypeId("autodesk.spec.aec:area", "Area", 1.0)
+    Angle = ForgeTypeId("autodesk.spec.aec:angle", "Angle", 1.0)
+
+
+class SymbolTypeId(object):
+    Mm = ForgeTypeId("autodesk.unit.symbol:mm", "mm", 1.0)
+    M = ForgeTypeId("autodesk.unit.symbol:m", "m", 1.0)
+
+
+class UnitUtils(object):
+
+    @staticmethod
+    def ConvertFromInternalUnits(value, unit_type_id):
+        return value * unit_type_id.factor
+
+    @staticmethod
+    def ConvertToInternalUnits(value, unit_type_id):
+        return value / unit_type_id.factor
+
+
+class LabelUtils(object):
+
+    @staticmethod
+    def GetLabelForUnit(unit_type_id):
+        return unit_type_id.label
+
+    @staticmethod
+    def GetLabelForSymbol(symbol_type_id):
+        return symbol_type_id.label if symbol_type_id else u""
+
+    @staticmethod
+    def GetLabelFor(value):
+        return str(value)
+
+
+class FormatOptions(object):
+
+    def __init__(self, unit=UnitTypeId.Millimeters, accuracy=1.0, symbol=None, use_default=False):
+        self.UseDefault = use_default
+        self.Accuracy = accuracy
+        self._unit = unit
+        self._symbol = symbol
+
+    def GetUnitTypeId(self):
+        return self._unit
+
+    def GetSymbolTypeId(self):
+        return self._symbol or ForgeTypeId("", "", 1.0)
+
+
+class Units(object):
+
+    def __init__(self):
+        self._options = {}
+
+    def GetFormatOptions(self, spec):
+        return self._options.get(spec) or FormatOptions()
+
+    def SetFormatOptions(self, spec, options):
+        self._options[spec] = options
+
+
+#  ____  _      _____ ____  ____  _____  _  ____  _      ____
+# /  _ \/ \  /|/__ __\  __\/  _ \/__ __\/ \/  _ \/ \  /|/ ___\
+# | / \|| |\ ||  / \ |  \/|| / \|  / \  | || / \|| |\ |||    \
+# | \_/|| | \||  | | |    /| |-||  | |  | || \_/|| | \||\___ |
+# \____/\_/  \|  \_/ \_/\_\\_/ \|  \_/  \_/\____/\_/  \|\____/ TRANSACTIONS
+#===========================================================================================================#
+
+class Transaction(object):
+    """Transaksjon mot et fake dokument. RollBack angrer alle endringer siden Start."""
+
+    def __init__(self, doc, name=""):
+        self.doc = doc
+        self.name = name
+        self._mark = None
+        self._status = TransactionStatus.Uninitialized
+
+    def Start(self, name=None):
+        if self._mark is not None:
+            raise InvalidOperationException("Transaction already started")
+        if self.doc._open_transactions:
+            raise InvalidOperationException("Another transaction is already open")
+        self._mark = len(self.doc._journal)
+        self.doc._open_transactions += 1
+        self.doc.count("transactions")
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def HasStarted(self):
+        return self._status == TransactionStatus.Started
+
+    def HasEnded(self):
+        return self._status in (TransactionStatus.Committed, TransactionStatus.RolledBack)
+
+    def GetStatus(self):
+        return self._status
+
+    def GetName(self):
+        return self.name
+
+    def Commit(self):
+        self._end()
+        self.doc.count("commits")
+        self._status = TransactionStatus.Committed
+        return self._status
+
+    def RollBack(self):
+        mark = self._mark
+        self._end()
+        self.doc._undo_to(mark)
+        self.doc.count("rollbacks")
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+    def _end(self):
+        if self._status != TransactionStatus.Started:
+            raise InvalidOperationException("Transaction has not been started")
+        self.doc._open_transactions -= 1
+        self._mark = None
+
+    def Dispose(self):
+        if self.HasStarted():
+            self.RollBack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.Dispose()
+        return False
+
+
+class TransactionGroup(object):
+
+    def __init__(self, doc, name=""):
+        self.doc = doc
+        self.name = name
+        self._mark = None
+        self._status = TransactionStatus.Uninitialized
+
+    def Start(self, name=None):
+        if self.doc._open_transactions:
+            raise InvalidOperationException("Cannot start a group inside a transaction")
+        self._mark = len(self.doc._journal)
+        self.doc.count("transaction_groups")
+        self._status = TransactionStatus.Started
+        return self._status
+
+    def HasStarted(self):
+        return self._status == TransactionStatus.Started
+
+    def GetStatus(self):
+        return self._status
+
+    def Assimilate(self):
+        self._status = TransactionStatus.Committed
+        return self._status
+
+    Commit = Assimilate
+
+    def RollBack(self):
+        self.doc._undo_to(self._mark)
+        self._status = TransactionStatus.RolledBack
+        return self._status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.HasStarted():
+            self.RollBack()
+        return False
+
+
+#  _____ _     _____ _      _____ _      _____ ____
+# /  __// \   /  __// \__/|/  __// \  /|/__ __\/ ___\
+# |  \  | |   |  \  | |\/|||  \  | |\ ||  / \  |    \
+# |  /_ | |_/\|  /_ | |  |||  /_ | | \||  | |  \___ |
+# \____\\____/\____\\_/  \|\____\\_/  \|  \_/  \____/ ELEMENTS
+#===========================================================================================================#
+
+def _journaled(attr):
+    """Property som krever åpen transaksjon ved skriving og kan rulles tilbake."""
+
+    def getter(self):
+        return getattr(self, attr)
+
+    def setter(self, value):
+        self._doc_for_write().write(self, attr, value)
+
+    return property(getter, setter)
+
+
+class Definition(object):
+
+    def __init__(self, name, bip=None):
+        self.Name = name
+        self.BuiltInParameter = bip if bip is not None else BuiltInParameter.INVALID
+
+    def __eq__(self, other):
+        return isinstance(other, Definition) and other.Name == self.Name \
+            and int(other.BuiltInParameter) == int(self.BuiltInParameter)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.Name, int(self.BuiltInParameter)))
+
+
+class Parameter(object):
+
+    def __init__(self, element, definition, storage, value=None, read_only=False):
+        self.Element = element
+        self.Definition = definition
+        self.StorageType = storage
+        self.IsReadOnly = read_only
+        self._value = value
+
+    @property
+    def HasValue(self):
+        return self._value is not None
+
+    def AsString(self):
+        if self.StorageType == StorageType.String:
+            return self._value
+        return None
+
+    def AsValueString(self):
+        return None if self._value is None else str(self._value)
+
+    def AsDouble(self):
+        return float(self._value or 0.0)
+
+    def AsInteger(self):
+        return int(self._value or 0)
+
+    def AsElementId(self):
+        return self._value if self._value is not None else ElementId.InvalidElementId
+
+    def Set(self, value):
+        if self.IsReadOnly:
+            raise InvalidOperationException("Parameter '{}' is read-only".format(self.Definition.Name))
+        doc = self.Element.Document
+        doc.count("parameter_sets")
+        doc.write(self, "_value", value)
+        return True
+
+
+class Category(object):
+
+    def __init__(self, bic, name):
+        self.BuiltInCategory = bic
+        self.Id = ElementId(int(bic))
+        self.Name = name
+
+
+class Element(object):
+    """Fake Element. Parametre lagres per navn; BuiltInParameter-parametre også per bip."""
+
+    _category_bic = None
+
+    def __init__(self, doc=None, name=u"", category=None, type_id=None):
+        self.Document = doc
+        self.Id = ElementId.InvalidElementId
+        self.UniqueId = u""
+        self._name = name
+        self.Category = category
+        self._type_id = type_id or ElementId.InvalidElementId
+        self._params = {}
+        self._bip_params = {}
+        self._pinned = False
+        self.OwnerViewId = ElementId.InvalidElementId
+        self.Location = None
+        self._bbox = None
+
+    def _doc_for_write(self):
+        return self.Document
+
+    @property
+    def Name(self):
+        return self._name
+
+    @Name.setter
+    def Name(self, value):
+        self.Document.write(self, "_name", value)
+
+    Pinned = _journaled("_pinned")
+
+    def GetTypeId(self):
+        return self._type_id
+
+    def add_parameter(self, name, storage, value=None, bip=None, read_only=False):
+        param = Parameter(self, Definition(name, bip), storage, value, read_only)
+        self._params[name] = param
+        if bip is not None:
+            self._bip_params[int(bip)] = param
+        return param
+
+    def LookupParameter(self, name):
+        if self.Document is not None:
+            self.Document.count("lookup_parameter")
+        return self._params.get(name)
+
+    def get_Parameter(self, key):
+        if self.Document is not None:
+            self.Document.count("get_parameter")
+        if isinstance(key, Definition):
+            param = self._params.get(key.Name)
+            return param if param is not None and param.Definition == key else None
+        return self._bip_params.get(int(key))
+
+    @property
+    def Parameters(self):
+        return list(self._params.values())
+
+    def get_BoundingBox(self, view):
+        return self._bbox
+
+    def __repr__(self):
+        return "<{} {} '{}'>".format(type(self).__name__, self.Id.Value, self._name)
+
+
+class ElementType(Element):
+
+    @property
+    def FamilyName(self):
+        return getattr(self, "_family_name", u"")
+
+
+class FamilySymbol(ElementType):
+    pass
+
+
+class FilledRegionType(ElementType):
+    pass
+
+
+class TextNoteType(ElementType):
+    pass
+
+
+class DimensionType(ElementType):
+
+    def __init__(self, doc=None, name=u"", style=None, format_options=None, **kwargs):
+        ElementType.__init__(self, doc, name, **kwargs)
+        self.StyleType = style or DimensionStyleType.Linear
+        self._format_options = format_options or FormatOptions()
+
+    def GetSpecTypeId(self):
+        return SpecTypeId.Length
+
+    def GetUnitsFormatOptions(self):
+        return self._format_options
+
+
+class LocationPoint(object):
+
+    def __init__(self, point):
+        self.Point = point
+
+
+class LocationCurve(object):
+
+    def __init__(self, curve):
+        self.Curve = curve
+
+
+class FamilyInstance(Element):
+
+    def __init__(self, doc=None, name=u"", facing=None, level_id=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self.FacingOrientation = facing or XYZ.BasisY
+        self.LevelId = level_id or ElementId.InvalidElementId
+        self.HandOrientation = XYZ.BasisX
+
+    @property
+    def Symbol(self):
+        return self.Document.GetElement(self._type_id)
+
+
+class IndependentTag(Element):
+
+    def __init__(self, doc=None, name=u"", tagged_ids=None, head=None, text=u"", **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self._tagged_ids = list(tagged_ids or [])
+        self._head = head or XYZ.Zero
+        self.TagText = text
+        self.HasLeader = False
+
+    TagHeadPosition = _journaled("_head")
+
+    def GetTaggedLocalElementIds(self):
+        return _IdSet(self._tagged_ids)
+
+    def GetTaggedLocalElements(self):
+        return [self.Document.GetElement(i) for i in self._tagged_ids]
+
+    @property
+    def TaggedLocalElementId(self):
+        return self._tagged_ids[0] if self._tagged_ids else ElementId.InvalidElementId
+
+    def _move(self, vector):
+        self.TagHeadPosition = self._head + vector
+
+    @classmethod
+    def Create(cls, doc, symbol_id, view_id, reference, add_leader, orientation, point):
+        symbol = doc.GetElement(symbol_id)
+        tag = cls(doc, symbol.Name, tagged_ids=[reference.ElementId], head=point,
+                  category=symbol.Category, type_id=symbol_id)
+        tag.OwnerViewId = view_id
+        tag.HasLeader = add_leader
+        return doc.create(tag)
+
+
+class Reference(object):
+
+    def __init__(self, element):
+        self.ElementId = element.Id
+
+
+class _IdSet(list):
+    """ISet<ElementId> med Count."""
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class FilledRegion(Element):
+
+    def __init__(self, doc=None, name=u"", loops=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self._loops = list(loops or [])
+
+    def GetBoundaries(self):
+        if self.Document is not None:
+            self.Document.count("get_boundaries")
+        return list(self._loops)
+
+    @classmethod
+    def Create(cls, doc, type_id, view_id, boundaries):
+        loops = [b if isinstance(b, CurveLoop) else CurveLoop(b) for b in boundaries]
+        region = cls(doc, type_id=type_id, loops=loops,
+                     category=doc.category(BuiltInCategory.OST_DetailComponents))
+        region.OwnerViewId = view_id
+        return doc.create(region)
+
+
+class TextNote(Element):
+
+    @classmethod
+    def Create(cls, doc, view_id, position, text, options):
+        note = cls(doc, text, category=doc.category(BuiltInCategory.OST_TextNotes))
+        note.OwnerViewId = view_id
+        note.Location = LocationPoint(position)
+        note.Text = text
+        return doc.create(note)
+
+
+class TextNoteOptions(object):
+
+    def __init__(self, type_id=None):
+        self.TypeId = type_id
+        self.HorizontalAlignment = HorizontalTextAlignment.Left
+        self.VerticalAlignment = VerticalTextAlignment.Top
+
+
+class Toposolid(Element):
+
+    def __init__(self, doc=None, name=u"", subdivision_ids=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self._subdivisions = list(subdivision_ids or [])
+
+    def GetSubDivisionIds(self):
+        return list(self._subdivisions)
+
+
+class DimensionSegment(object):
+    """Segment i en flersegment-mållinje. Ikke et Element (som i Revit)."""
+
+    def __init__(self, dimension, origin, value, text_position=None, default_text_position=None):
+        self._dimension = dimension
+        self.Origin = origin
+        self.Value = value
+        self.ValueString = None
+        self.EqualityFormula = None
+        self._default_tp = default_text_position or origin
+        self._tp = text_position or self._default_tp
+        self._has_leader = False
+
+    def _doc_for_write(self):
+        return self._dimension.Document
+
+    TextPosition = _journaled("_tp")
+    HasLeader = _journaled("_has_leader")
+
+    def ResetTextPosition(self):
+        self.TextPosition = self._default_tp
+
+
+class _SegmentArray(list):
+
+    @property
+    def Size(self):
+        return len(self)
+
+    @property
+    def IsEmpty(self):
+        return not self
+
+
+class Dimension(Element):
+
+    def __init__(self, doc=None, name=u"", curve=None, value=None, text_position=None,
+                 default_text_position=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self.Curve = curve
+        self.Value = value
+        self.EqualityFormula = None
+        self.Segments = _SegmentArray()
+        self._default_tp = default_text_position
+        self._tp = text_position or default_text_position
+        self._has_leader = False
+
+    @property
+    def NumberOfSegments(self):
+        return len(self.Segments)
+
+    @property
+    def DimensionType(self):
+        return self.Document.GetElement(self._type_id)
+
+    TextPosition = _journaled("_tp")
+    HasLeader = _journaled("_has_leader")
+
+    def ResetTextPosition(self):
+        self.TextPosition = self._default_tp
+
+    def add_segment(self, origin, value, text_position=None, default_text_position=None):
+        seg = DimensionSegment(self, origin, value, text_position, default_text_position)
+        self.Segments.append(seg)
+        return seg
+
+
+class SpotDimension(Dimension):
+    pass
+
+
+class View(Element):
+
+    def __init__(self, doc=None, name=u"", view_type=None, scale=100, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self.ViewType = view_type or ViewType.FloorPlan
+        self._scale = scale
+        self.ViewDirection = XYZ.BasisZ
+        self.UpDirection = XYZ.BasisY
+        self.RightDirection = XYZ.BasisX
+        self.IsTemplate = False
+        self.CropBoxActive = False
+        self.CropBox = None
+        self.GenLevel = None
+        self.SketchPlane = None
+        self._filters = []
+        self._disabled_filters = set()
+        self._overrides = {}
+
+    Scale = _journaled("_scale")
+
+    def SetElementOverrides(self, element_id, settings):
+        self.Document._require_transaction()
+        self.Document.count("element_overrides")
+        key = element_id.Value
+        old = self._overrides.get(key)
+        self._overrides[key] = OverrideGraphicSettings(settings)
+        self.Document._journal.append(lambda: self._overrides.__setitem__(key, old))
+
+    def GetElementOverrides(self, element_id):
+        return OverrideGraphicSettings(self._overrides.get(element_id.Value) or OverrideGraphicSettings())
+
+    def GetFilters(self):
+        return list(self._filters)
+
+    def GetIsFilterEnabled(self, filter_id):
+        return filter_id not in self._disabled_filters
+
+    def Duplicate(self, option):
+        copy = type(self)(self.Document, self._name + u" Copy", self.ViewType, self._scale,
+                          category=self.Category)
+        return self.Document.create(copy).Id
+
+
+class ViewPlan(View):
+    pass
+
+
+class ViewDrafting(View):
+    pass
+
+
+class ViewSheet(View):
+
+    def __init__(self, doc=None, name=u"", number=u"", **kwargs):
+        kwargs.setdefault("view_type", ViewType.DrawingSheet)
+        View.__init__(self, doc, name, **kwargs)
+        self.SheetNumber = number
+
+    def GetAllPlacedViews(self):
+        return _IdSet(getattr(self, "_placed", []))
+
+
+class ViewSheetSet(Element):
+
+    def __init__(self, doc=None, name=u"", views=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self.Views = list(views or [])
+
+
+class Level(Element):
+
+    def __init__(self, doc=None, name=u"", elevation=0.0, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self.Elevation = elevation
+
+
+class ProjectInfo(Element):
+
+    def __init__(self, doc=None, number=u"", **kwargs):
+        Element.__init__(self, doc, u"Project Information", **kwargs)
+        self.Number = number
+
+
+class Color(object):
+
+    def __init__(self, red, green, blue):
+        self.Red, self.Green, self.Blue = red, green, blue
+        self.IsValid = True
+
+
+class OverrideGraphicSettings(object):
+
+    def __init__(self, other=None):
+        self._values = dict(other._values) if other is not None else {}
+
+    def __getattr__(self, name):
+        if name.startswith("Set"):
+            def setter(*args):
+                self._values[name[3:]] = args[0] if len(args) == 1 else args
+                return self
+            return setter
+        raise AttributeError(name)
+
+
+class FillPattern(object):
+
+    def __init__(self, name=u"", is_solid=False):
+        self.Name = name
+        self.IsSolidFill = is_solid
+
+
+class FillPatternElement(Element):
+
+    def __init__(self, doc=None, name=u"", is_solid=False, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self._pattern = FillPattern(name, is_solid)
+
+    def GetFillPattern(self):
+        return self._pattern
+
+
+class ParameterFilterElement(Element):
+
+    def __init__(self, doc=None, name=u"", category_ids=None, element_filter=None, **kwargs):
+        Element.__init__(self, doc, name, **kwargs)
+        self._categories = list(category_ids or [])
+        self._filter = element_filter
+
+    def GetCategories(self):
+        return list(self._categories)
+
+    def GetElementFilter(self):
+        return self._filter
+
+
+class ElementTransformUtils(object):
+
+    @staticmethod
+    def MoveElement(doc, element_id, vector):
+        doc.count("move_element")
+        element = doc.GetElement(element_id)
+        if element is None:
+            raise InvalidOperationException("Element {} not found".format(element_id))
+        if element.Pinned:
+            raise InvalidOperationException("Element is pinned")
+        if hasattr(element, "_move"):
+            element._move(vector)
+        elif isinstance(element.Location, LocationPoint):
+            doc.write(element, "Location", LocationPoint(element.Location.Point + vector))
+
+    @staticmethod
+    def MoveElements(doc, element_ids, vector):
+        for element_id in element_ids:
+            ElementTransformUtils.MoveElement(doc, element_id, vector)
+
+
+#  ____  _     _____ _____  _____ ____  ____
+# /   _\/ \   /  __//  __/ /  __//  __\/ ___\
+# |  /  | |   |  \  |  \   |  \  |  \/||    \
+# |  \__| |_/\|  /_ |  /_  |  /_ |    /\___ |
+# \____/\____/\____\\____\ \____\\_/\_\\____/ FILTERS / COLLECTOR
+#===========================================================================================================#
+
+class ElementFilter(object):
+
+    def PassesFilter(self, element):
+        raise NotImplementedError
+
+
+class ElementCategoryFilter(ElementFilter):
+
+    def __init__(self, category, inverted=False):
+        self._id = int(category)
+        self._inverted = inverted
+
+    def PassesFilter(self, element):
+        category = element.Category
+        hit = category is not None and category.Id.Value == self._id
+        return hit != self._inverted
+
+
+class ElementMulticategoryFilter(ElementFilter):
+
+    def __init__(self, categories, inverted=False):
+        self._ids = set(int(c) for c in categories)
+        self._inverted = inverted
+
+    def PassesFilter(self, element):
+        category = element.Category
+        hit = category is not None and category.Id.Value in self._ids
+        return hit != self._inverted
+
+
+class ElementClassFilter(ElementFilter):
+
+    def __init__(self, cls):
+        self._cls = cls
+
+    def PassesFilter(self, element):
+        return isinstance(element, self._cls)
+
+
+class LogicalOrFilter(ElementFilter):
+
+    def __init__(self, filters, other=None):
+        self._filters = list(filters) if other is None else [filters, other]
+
+    def PassesFilter(self, element):
+        return any(f.PassesFilter(element) for f in self._filters)
+
+
+class LogicalAndFilter(ElementFilter):
+
+    def __init__(self, filters, other=None):
+        self._filters = list(filters) if other is None else [filters, other]
+
+    def PassesFilter(self, element):
+        return all(f.PassesFilter(element) for f in self._filters)
+
+
+class FilteredElementCollector(object):
+    """Lat kjede av filtre over dokumentets elementer (evt. bare de som eies av / er synlige i et view)."""
+
+    def __init__(self, doc, view_id=None):
+        doc.count("collectors")
+        self._doc = doc
+        self._view_id = view_id
+        self._ids = None
+        if view_id is not None and not isinstance(view_id, ElementId):
+            # FilteredElementCollector(doc, ICollection<ElementId>)
+            self._view_id = None
+            self._ids = [i.Value for i in view_id]
+        self._tests = []
+
+    def _add(self, test):
+        self._tests.append(test)
+        return self
+
+    def OfCategory(self, bic):
+        value = int(bic)
+        return self._add(lambda e: e.Category is not None and e.Category.Id.Value == value)
+
+    def OfCategoryId(self, category_id):
+        return self.OfCategory(category_id.Value)
+
+    def OfClass(self, cls):
+        return self._add(lambda e: isinstance(e, cls))
+
+    def WhereElementIsNotElementType(self):
+        return self._add(lambda e: not isinstance(e, ElementType))
+
+    def WhereElementIsElementType(self):
+        return self._add(lambda e: isinstance(e, ElementType))
+
+    def WherePasses(self, element_filter):
+        return self._add(element_filter.PassesFilter)
+
+    def _source(self):
+        if self._ids is not None:
+            elements = self._doc._elements
+            return [elements[i] for i in self._ids if i in elements]
+        if self._view_id is None:
+            return self._doc._elements.values()
+        return self._doc._visible_in(self._view_id)
+
+    def __iter__(self):
+        self._doc.count("collector_iterations")
+        tests = self._tests
+        for element in self._source():
+            if all(test(element) for test in tests):
+                yield element
+
+    def ToElements(self):
+        return _ElementList(self)
+
+    def ToElementIds(self):
+        return _ElementList(e.Id for e in self)
+
+    def GetElementCount(self):
+        return sum(1 for _ in self)
+
+    def FirstElement(self):
+        for element in self:
+            return element
+        return None
+
+    def FirstElementId(self):
+        element = self.FirstElement()
+        return element.Id if element is not None else ElementId.InvalidElementId
+
+
+class _ElementList(list):
+    """IList<Element> med Count."""
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+#  ____  ____  ____  _     _      _____ _      _____
+# /  _ \/  _ \/   _\/ \ /\/ \__/|/  __// \  /|/__ __\
+# | | \|| / \||  /  | | ||| |\/|||  \  | |\ ||  / \
+# | |_/|| \_/||  \__| \_/|| |  |||  /_ | | \||  | |
+# \____/\____/\____/\____/\_/  \|\____\\_/  \|  \_/ DOCUMENT
+#===========================================================================================================#
+
+class _DocumentCreator(object):
+
+    def __init__(self, doc):
+        self._doc = doc
+
+    def NewDetailCurve(self, view, curve):
+        element = Element(self._doc, u"Detail Line", category=self._doc.category(BuiltInCategory.OST_Lines))
+        element.Location = LocationCurve(curve)
+        element.OwnerViewId = view.Id
+        return self._doc.create(element)
+
+
+class Document(object):
+    """Fake Document: elementer, enkel undo-journal for transaksjoner og API-tellere."""
+
+    def __init__(self, title=u"Synthetic", project_number=u"12345"):
+        self.Title = title
+        self.PathName = u""
+        self.IsFamilyDocument = False
+        self.IsModifiable = False
+        self._elements = {}
+        self._by_unique_id = {}
+        self._by_view = {}
+        self._categories = {}
+        self._ids = itertools.count(1000)
+        self._journal = []
+        self._open_transactions = 0
+        self._units = Units()
+        self.counters = {}
+        self.ActiveView = None
+        self.Create = _DocumentCreator(self)
+        self.ProjectInformation = self.add(ProjectInfo(self, project_number))
+
+    # ---------- counters ----------
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset_counters(self):
+        self.counters = {}
+
+    # ---------- model ----------
+    def category(self, bic, name=None):
+        key = int(bic)
+        if key not in self._categories:
+            self._categories[key] = Category(bic, name or str(bic))
+        return self._categories[key]
+
+    def add(self, element, view=None):
+        """Legg inn et element uten transaksjon (brukes av dokumentbyggerne)."""
+        element.Document = self
+        element.Id = ElementId(next(self._ids))
+        element.UniqueId = u"fake-{:08d}".format(element.Id.Value)
+        self._elements[element.Id.Value] = element
+        self._by_unique_id[element.UniqueId] = element
+        if view is not None:
+            element.OwnerViewId = view.Id
+        owner = element.OwnerViewId.Value
+        if owner != -1:
+            self._by_view.setdefault(owner, []).append(element)
+        return element
+
+    def show_in_view(self, element, view):
+        """Gjør et modell-element (dør, vegg ...) synlig i et view."""
+        self._by_view.setdefault(view.Id.Value, []).append(element)
+
+    def _visible_in(self, view_id):
+        return [e for e in self._by_view.get(view_id.Value, ()) if e.Id.Value in self._elements]
+
+    def create(self, element):
+        self._require_transaction()
+        self.add(element)
+        self._journal.append(lambda: self._remove(element))
+        return element
+
+    def _remove(self, element):
+        self._elements.pop(element.Id.Value, None)
+        self._by_unique_id.pop(element.UniqueId, None)
+
+    def GetElement(self, key):
+        self.count("get_element")
+        if isinstance(key, ElementId):
+            return self._elements.get(key.Value)
+        if isinstance(key, int):
+            return self._elements.get(key)
+        return self._by_unique_id.get(key)
+
+    def Delete(self, ids):
+        self._require_transaction()
+        if isinstance(ids, ElementId):
+            ids = [ids]
+        deleted = []
+        for element_id in list(ids):
+            element = self._elements.get(element_id.Value)
+            if element is None:
+                continue
+            self._remove(element)
+            deleted.append(element)
+            self._journal.append(lambda e=element: self._restore(e))
+        return _IdSet(e.Id for e in deleted)
+
+    def _restore(self, element):
+        self._elements[element.Id.Value] = element
+        self._by_unique_id[element.UniqueId] = element
+
+    def GetUnits(self):
+        return self._units
+
+    # ---------- transactions ----------
+    def _require_transaction(self):
+        if not self._open_transactions:
+            raise InvalidOperationException(
+                "Attempt to modify the model outside of transaction.")
+
+    def write(self, obj, attr, value):
+        """Skriv en verdi og journalfør gammel verdi for RollBack."""
+        self._require_transaction()
+        old = getattr(obj, attr)
+        setattr(obj, attr, value)
+        self._journal.append(lambda: setattr(obj, attr, old))
+
+    def _undo_to(self, mark):
+        while len(self._journal) > mark:
+            self._journal.pop()()
+
+    def __len__(self):
+        return len(self._elements)
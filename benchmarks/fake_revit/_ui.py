@@ -0,0 +1,327 @@
+# encoding: utf-8
+"""
+Fake Autodesk.Revit.UI, pyRevit (revit/forms/script) og System.Collections.Generic.
+
+Dialoger viser ingenting: de logges i STATE.dialogs og svarer med verdiene i
+STATE.answers, slik at et skript kan kjøres helt uten bruker.
+"""
+import logging
+
+from . import _db
+
+
+class _State(object):
+    """Aktivt dokument/view/utvalg og ferdige svar på dialoger."""
+
+    def __init__(self):
+        self.doc = None
+        self.selection = []
+        self.answers = {}
+        self.dialogs = []
+
+    def answer(self, key, default=None):
+        value = self.answers.get(key, default)
+        return value() if callable(value) else value
+
+
+STATE = _State()
+
+
+# ---------------------------------------- System ---------------------------------------- #
+
+class _GenericMeta(type):
+    """List[ElementId] / IList[Curve] gir bare tilbake samme klasse."""
+
+    def __getitem__(cls, item):
+        return cls
+
+
+class List(list, metaclass=_GenericMeta):
+
+    def Add(self, item):
+        self.append(item)
+
+    def AddRange(self, items):
+        self.extend(items)
+
+    def Contains(self, item):
+        return item in self
+
+    def Clear(self):
+        del self[:]
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+IList = List
+ICollection = List
+HashSet = List
+
+
+# ------------------------------------- Autodesk.Revit.UI ------------------------------------- #
+
+TaskDialogResult = _db._enum("TaskDialogResult", ("None", "Ok", "Cancel", "Yes", "No", "Close",
+                                                  "CommandLink1", "CommandLink2", "CommandLink3"))
+TaskDialogCommonButtons = _db._enum("TaskDialogCommonButtons", ("None", "Ok", "Yes", "No",
+                                                                "Cancel", "Retry", "Close"))
+TaskDialogCommandLinkId = _db._enum("TaskDialogCommandLinkId", ("CommandLink1", "CommandLink2",
+                                                                "CommandLink3", "CommandLink4"))
+
+
+class TaskDialog(object):
+
+    def __init__(self, title=u""):
+        self.Title = title
+        self.MainInstruction = u""
+        self.MainContent = u""
+        self.CommonButtons = None
+        self.DefaultButton = None
+        self._links = []
+
+    def AddCommandLink(self, link_id, text, *args):
+        self._links.append((link_id, text))
+
+    def Show(self):
+        STATE.dialogs.append(("TaskDialog", self.Title, self.MainInstruction))
+        return STATE.answer("TaskDialog", TaskDialogResult.Cancel)
+
+    @staticmethod
+    def _show_static(title, message, *args):
+        STATE.dialogs.append(("TaskDialog", title, message))
+        return STATE.answer("TaskDialog", TaskDialogResult.Ok)
+
+
+# TaskDialog.Show brukes både statisk (Show(title, msg)) og på instanser (td.Show()).
+class _ShowDescriptor(object):
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return TaskDialog._show_static
+        return instance._show_instance
+
+
+TaskDialog._show_instance = TaskDialog.Show
+TaskDialog.Show = _ShowDescriptor()
+
+
+class _Selection(object):
+
+    def GetElementIds(self):
+        return List(STATE.selection)
+
+    def SetElementIds(self, ids):
+        STATE.selection = list(ids)
+
+    def PickObjects(self, *args):
+        return List()
+
+
+class UIDocument(object):
+
+    def __init__(self):
+        self.Selection = _Selection()
+
+    @property
+    def Document(self):
+        return STATE.doc
+
+    @property
+    def ActiveView(self):
+        return STATE.doc.ActiveView
+
+    @ActiveView.setter
+    def ActiveView(self, view):
+        STATE.doc.ActiveView = view
+
+    def RefreshActiveView(self):
+        pass
+
+
+class _Application(object):
+    VersionNumber = "2025"
+    Username = "benchmark"
+
+
+class UIApplication(object):
+
+    def __init__(self):
+        self.ActiveUIDocument = UIDocument()
+        self.Application = _Application()
+
+
+# ------------------------------------------ pyRevit ------------------------------------------ #
+
+class _RevitTransaction(object):
+    """pyrevit.revit.Transaction: committer ved suksess, ruller tilbake ved feil."""
+
+    def __init__(self, name=None, doc=None, **kwargs):
+        self._tx = _db.Transaction(doc or STATE.doc, name or "pyRevit Transaction")
+
+    def __enter__(self):
+        self._tx.Start()
+        return self._tx
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._tx.Commit()
+        else:
+            self._tx.RollBack()
+        return False
+
+
+class _RevitModule(object):
+    """pyrevit.revit: doc/uidoc/active_view følger STATE."""
+
+    Transaction = _RevitTransaction
+
+    @property
+    def doc(self):
+        return STATE.doc
+
+    @property
+    def uidoc(self):
+        return UIDocument()
+
+    @property
+    def active_view(self):
+        return STATE.doc.ActiveView
+
+    def get_selection(self):
+        return [STATE.doc.GetElement(i) for i in STATE.selection]
+
+
+class WPFWindow(object):
+    """Ingen XAML; kontroller som ikke er satt er stubber."""
+
+    def __init__(self, xaml_source=None, *args, **kwargs):
+        self.xaml_source = xaml_source
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        from . import _Anything
+        value = _Anything()
+        object.__setattr__(self, name, value)
+        return value
+
+    def ShowDialog(self):
+        STATE.dialogs.append(("WPFWindow", type(self).__name__, self.xaml_source))
+        return True
+
+    def Close(self):
+        pass
+
+
+class ProgressBar(object):
+
+    def __init__(self, title=u"", cancellable=False, step=1, **kwargs):
+        self.title = title
+        self.cancelled = False
+        self.updates = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update_progress(self, new_value, max_value=1):
+        self.updates += 1
+        self.cancelled = bool(STATE.answer("ProgressBar.cancel_after") is not None
+                              and self.updates >= STATE.answer("ProgressBar.cancel_after"))
+
+
+class _Shower(object):
+
+    def __init__(self, key):
+        self.key = key
+
+    def show(self, *args, **kwargs):
+        STATE.dialogs.append((self.key, args[1:] if args else (), kwargs.get("title")))
+        return STATE.answer(self.key)
+
+
+class _FormsModule(object):
+    WPFWindow = WPFWindow
+    ProgressBar = ProgressBar
+    CommandSwitchWindow = _Shower("CommandSwitchWindow")
+    SelectFromList = _Shower("SelectFromList")
+
+    @staticmethod
+    def alert(msg, title=None, exitscript=False, **kwargs):
+        STATE.dialogs.append(("alert", title, msg))
+        if exitscript:
+            raise SystemExit(msg)
+        return STATE.answer("alert", True)
+
+    @staticmethod
+    def ask_for_string(default=None, prompt=None, title=None, **kwargs):
+        STATE.dialogs.append(("ask_for_string", title, prompt))
+        return STATE.answer("ask_for_string", default)
+
+    @staticmethod
+    def save_file(*args, **kwargs):
+        return STATE.answer("save_file")
+
+    @staticmethod
+    def pick_folder(*args, **kwargs):
+        return STATE.answer("pick_folder")
+
+    @staticmethod
+    def select_views(*args, **kwargs):
+        return STATE.answer("select_views")
+
+    @staticmethod
+    def select_sheets(*args, **kwargs):
+        return STATE.answer("select_sheets")
+
+
+class _Output(object):
+
+    def print_md(self, text):
+        pass
+
+    def print_table(self, *args, **kwargs):
+        pass
+
+    def linkify(self, *args, **kwargs):
+        return u""
+
+    def update_progress(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+class _ScriptModule(object):
+
+    @staticmethod
+    def get_logger():
+        return logging.getLogger("pyrevit")
+
+    @staticmethod
+    def get_output():
+        return _Output()
+
+    @staticmethod
+    def exit():
+        raise SystemExit()
+
+
+class _HostApp(object):
+    version = "2025"
+
+    def is_newer_than(self, version):
+        return int(self.version) > int(version)
+
+    def is_older_than(self, version):
+        return int(self.version) < int(version)
+
+
+revit = _RevitModule()
+forms = _FormsModule()
+script = _ScriptModule()
+HOST_APP = _HostApp()
@@ -0,0 +1,485 @@
+# encoding: utf-8
+"""
+Syntetiske dokumenter for benchmarks (1k-100k elementer).
+
+Alle byggere er deterministiske (seed) og returnerer (doc, view). Elementene
+legges inn uten transaksjon, og doc.counters nullstilles før retur, så en
+benchmark måler bare det skriptet selv gjør.
+"""
+import random
+
+from . import _db
+from ._db import (BuiltInCategory as BIC, BuiltInParameter as BIP, StorageType,
+                  XYZ, Line, CurveLoop, BoundingBoxXYZ)
+
+MM = 1.0 / 304.8    # mm -> fot
+
+
+def new_document(project_number=u"12345", scale=100, view_name=u"Plan 01"):
+    """Tomt dokument med ett aktivt plan-view."""
+    doc = _db.Document(project_number=project_number)
+    view = doc.add(_db.ViewPlan(doc, view_name, _db.ViewType.FloorPlan, scale,
+                                category=doc.category(BIC.OST_Views)))
+    doc.ActiveView = view
+    return doc, view
+
+
+def _done(doc, view):
+    doc.reset_counters()
+    return doc, view
+
+
+def _bbox(x, y, w, h):
+    return BoundingBoxXYZ(XYZ(x, y, 0.0), XYZ(x + w, y + h, 0.0))
+
+
+#--------------------------------------- DIMENSIONS ---------------------------------------#
+
+def dimension_type(doc, name=u"Mål 2.5mm", text_size_mm=2.5, style=None, accuracy=1.0):
+    dim_type = _db.DimensionType(doc, name, style=style,
+                                 format_options=_db.FormatOptions(_db.UnitTypeId.Millimeters, accuracy),
+                                 category=doc.category(BIC.OST_Dimensions))
+    dim_type.add_parameter(u"Text Size", StorageType.Double, text_size_mm * MM, bip=BIP.TEXT_SIZE)
+    dim_type.add_parameter(u"Text Font", StorageType.String, u"Arial", bip=BIP.TEXT_FONT)
+    dim_type.add_parameter(u"Width Factor", StorageType.Double, 1.0, bip=BIP.TEXT_WIDTH_SCALE)
+    return doc.add(dim_type)
+
+
+def dimension_view(n_elements, seed=1, scale=100, segments=(2, 8), single_share=0.3,
+                   moved_share=0.1, ordinate_share=0.02):
+    """Mållinjer der n_elements er antall tekster (segmenter + enkeltmål).
+
+    Mållinjene ligger langs X eller Y. Segmentlengdene varierer fra 50 til
+    3000 mm, så en del tekster får ikke plass og noen klynger overlapper.
+    """
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    linear = dimension_type(doc)
+    ordinate = dimension_type(doc, u"Ordinate", style=_db.DimensionStyleType.Ordinate)
+    _add_dimensions(doc, view, n_elements, rng, linear, ordinate, segments, single_share,
+                    moved_share, ordinate_share)
+    return _done(doc, view)
+
+
+def dimension_project(n_elements, n_views=20, seed=1, scale=100):
+    """n_views plan-views med mållinjer, hver plassert på sitt eget ark (n_elements tekster totalt)."""
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    linear = dimension_type(doc)
+    ordinate = dimension_type(doc, u"Ordinate", style=_db.DimensionStyleType.Ordinate)
+    views_category = doc.category(BIC.OST_Views)
+    sheets_category = doc.category(BIC.OST_Sheets)
+    for i in range(n_views):
+        plan = view if i == 0 else doc.add(_db.ViewPlan(doc, u"Plan {:02d}".format(i + 1), _db.ViewType.FloorPlan,
+                                                        scale, category=views_category))
+        _add_dimensions(doc, plan, n_elements // n_views, rng, linear, ordinate)
+        sheet = _db.ViewSheet(doc, u"Ark {:02d}".format(i + 1), number=u"A{:03d}".format(i + 1),
+                              category=sheets_category)
+        sheet._placed = [plan.Id]
+        doc.add(sheet)
+    return _done(doc, view)
+
+
+def _add_dimensions(doc, view, n_elements, rng, linear, ordinate, segments=(2, 8), single_share=0.3,
+                    moved_share=0.1, ordinate_share=0.02):
+    scale = view.Scale
+    category = doc.category(BIC.OST_Dimensions)
+    text_offset = 2.5 * scale * MM      # standard tekst ligger over linja
+
+    texts = 0
+    row = 0
+    while texts < n_elements:
+        along = XYZ.BasisX if rng.random() < 0.5 else XYZ.BasisY
+        up = view.ViewDirection.CrossProduct(along)
+        origin = XYZ(rng.uniform(-500, 500), rng.uniform(-500, 500), 0.0) + up * (row * 3.0)
+        row += 1
+        dim_type = ordinate if rng.random() < ordinate_share else linear
+        line = Line.CreateUnbound(origin, along)
+
+        if rng.random() < single_share:
+            length = rng.uniform(50, 3000) * MM
+            mid = origin + along * (0.5 * length)
+            default = mid + up * text_offset
+            moved = rng.random() < moved_share
+            current = default + up * (rng.uniform(5, 20) * scale * MM) if moved else default
+            dim = _db.Dimension(doc, u"", curve=line, value=length, text_position=current,
+                                default_text_position=default, category=category, type_id=dim_type.Id)
+            doc.add(dim, view)
+            texts += 1
+            continue
+
+        dim = doc.add(_db.Dimension(doc, u"", curve=line, category=category, type_id=dim_type.Id), view)
+        x = 0.0
+        for _ in range(rng.randint(*segments)):
+            length = (rng.uniform(50, 400) if rng.random() < 0.4 else rng.uniform(400, 3000)) * MM
+            mid = origin + along * (x + 0.5 * length)
+            default = mid + up * text_offset
+            moved = rng.random() < moved_share
+            current = default + up * (rng.uniform(5, 20) * scale * MM) if moved else default
+            dim.add_segment(mid, length, current, default)
+            x += length
+            texts += 1
+        dim.Value = None
+
+
+#----------------------------------------- TAGS -----------------------------------------#
+
+_FACINGS = [XYZ(1, 0, 0), XYZ(0, 1, 0), XYZ(-1, 0, 0), XYZ(0, -1, 0),
+            XYZ(0.7071, 0.7071, 0), XYZ(-0.7071, 0.7071, 0),
+            XYZ(0.7071, -0.7071, 0), XYZ(-0.7071, -0.7071, 0)]
+
+
+def tag_view(n_elements, seed=1, scale=100, host=u"door", ok_share=0.2, untagged_share=0.0):
+    """Dører eller vinduer med hver sin tag (n_elements = antall tags).
+
+    Tag-typenavn følger firmaets mønster ('Dør 1-50', 'Dør 1-100 ok', ...),
+    og tag-teksten har 1-4 linjer.
+    """
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    if host == u"door":
+        host_bic, tag_bic, label = BIC.OST_Doors, BIC.OST_DoorTags, u"Dør"
+    else:
+        host_bic, tag_bic, label = BIC.OST_Windows, BIC.OST_WindowTags, u"Vindu"
+    host_category = doc.category(host_bic)
+    tag_category = doc.category(tag_bic)
+
+    symbols = []
+    for i in range(8):
+        symbol = _db.FamilySymbol(doc, u"{} {:02d}".format(label, i), category=host_category)
+        symbol._family_name = u"{}{:02d}_{}".format(label[:1], i, label)
+        symbol.add_parameter(u"Type Mark", StorageType.String, None, bip=BIP.ALL_MODEL_TYPE_MARK)
+        symbols.append(doc.add(symbol))
+
+    grid = max(1, int(n_elements ** 0.5))
+    for i in range(n_elements):
+        point = XYZ((i % grid) * 6.0, (i // grid) * 6.0, 0.0)
+        symbol = rng.choice(symbols)
+        instance = _db.FamilyInstance(doc, symbol.Name, facing=rng.choice(_FACINGS),
+                                      category=host_category, type_id=symbol.Id)
+        instance.Location = _db.LocationPoint(point)
+        instance._bbox = _bbox(point.X - 1.5, point.Y - 1.5, 3.0, 3.0)     # inkl. slagretning
+        doc.add(instance)
+        doc.show_in_view(instance, view)
+        if rng.random() < untagged_share:
+            continue
+        tag_scale = rng.choice((50, 100, 200))
+        name = u"{} 1-{}{}".format(label, tag_scale, u" ok" if rng.random() < ok_share else u"")
+        text = u"\n".join(u"L{}".format(k) for k in range(rng.randint(1, 4)))
+        head = point + XYZ(rng.uniform(-3, 3), rng.uniform(-3, 3), 0.0)
+        tag = _db.IndependentTag(doc, name, tagged_ids=[instance.Id], head=head, text=text,
+                                 category=tag_category)
+        doc.add(tag, view)
+    return _done(doc, view)
+
+
+def level_project(n_elements, n_levels=4, views_per_level=3, seed=1, tagged_share=0.3):
+    """Dører fordelt på etasjer, med flere plan-views per etasje (navn inneholder etasjenavnet).
+
+    Hver dør er synlig i alle views for sin etasje, og tagged_share av dem har
+    allerede en tag (av familien 'Dørtag') i det første viewet.
+    Returnerer (doc, views, doors, tag_type).
+    """
+    rng = random.Random(seed)
+    doc, first = new_document(view_name=u"Etasje 01 - byggemelding")
+    door_category = doc.category(BIC.OST_Doors)
+    tag_category = doc.category(BIC.OST_DoorTags)
+    symbol = doc.add(_db.FamilySymbol(doc, u"Dør 09", category=door_category))
+    tag_type = doc.add(_db.FamilySymbol(doc, u"Dør 1-100", category=tag_category))
+    tag_type._family_name = u"Dørtag"
+
+    views = []
+    levels = []
+    for k in range(n_levels):
+        name = u"Etasje {:02d}".format(k + 1)
+        levels.append(doc.add(_db.Level(doc, name, elevation=k * 10.0)))
+        level_views = []
+        for j, suffix in enumerate((u"byggemelding", u"møblering", u"rømning", u"el", u"vvs")[:views_per_level]):
+            if k == 0 and j == 0:
+                view = first
+            else:
+                view = doc.add(_db.ViewPlan(doc, u"{} - {}".format(name, suffix), _db.ViewType.FloorPlan, 100,
+                                            category=doc.category(BIC.OST_Views)))
+            level_views.append(view)
+        views.extend(level_views)
+        levels[-1]._views = level_views
+
+    doors = []
+    per_level = max(1, n_elements // n_levels)
+    grid = max(1, int(per_level ** 0.5))
+    for i in range(n_elements):
+        level = levels[min(i // per_level, n_levels - 1)]
+        n = i % per_level
+        door = _db.FamilyInstance(doc, symbol.Name, facing=rng.choice(_FACINGS), level_id=level.Id,
+                                  category=door_category, type_id=symbol.Id)
+        door.Location = _db.LocationPoint(XYZ((n % grid) * 6.0, (n // grid) * 6.0, level.Elevation))
+        doors.append(doc.add(door))
+        for view in level._views:
+            doc.show_in_view(door, view)
+        if rng.random() < tagged_share:
+            doc.add(_db.IndependentTag(doc, tag_type.Name, tagged_ids=[door.Id], head=door.Location.Point,
+                                       category=tag_category, type_id=tag_type.Id), level._views[0])
+    doc.reset_counters()
+    return doc, views, doors, tag_type
+
+
+def type_mark_project(n_types, seed=1, new_share=0.05, instances_per_type=3):
+    """Dør- og vindustyper (halvparten av hver) med Type Mark fra en tidligere nummerering.
+
+    new_share av typene er nye (uten Type Mark), som etter å ha lastet inn
+    noen familier siden forrige kjøring.
+    """
+    rng = random.Random(seed)
+    doc, view = new_document()
+    families = [(BIC.OST_Doors, u"{}_Dør {:02d}".format(p, k), p)
+                for k, p in enumerate((u"BD", u"ID", u"YD", u"SD", u"GD"))]
+    families.append((BIC.OST_Windows, u"Vindu", u"V"))
+    counters = {}
+    for i in range(n_types):
+        host = BIC.OST_Doors if i % 2 == 0 else BIC.OST_Windows
+        bic, family, prefix = rng.choice([f for f in families if f[0] == host])
+        category = doc.category(bic)
+        symbol = _db.FamilySymbol(doc, u"Type {:05d}".format(i), category=category)
+        symbol._family_name = family
+        mark = None
+        if rng.random() >= new_share:
+            counters[prefix] = counters.get(prefix, 0) + 1
+            mark = u"{}-{:02d}".format(prefix, counters[prefix])
+        symbol.add_parameter(u"Type Mark", StorageType.String, mark, bip=BIP.ALL_MODEL_TYPE_MARK)
+        symbol.add_parameter(u"Type Name", StorageType.String, symbol.Name, bip=BIP.SYMBOL_NAME_PARAM)
+        doc.add(symbol)
+        for _ in range(instances_per_type):
+            instance = _db.FamilyInstance(doc, symbol.Name, category=category, type_id=symbol.Id)
+            instance.Location = _db.LocationPoint(XYZ(rng.uniform(0, 500), rng.uniform(0, 500), 0.0))
+            doc.add(instance)
+            doc.show_in_view(instance, view)
+    return _done(doc, view)
+
+
+def framing_project(n_elements, seed=1, n_types=40, n_levels=4):
+    """Bjelker (Structural Framing) med Cut Length, Mark, materiale og referansenivå.
+
+    Annenhver type bruker den lokaliserte 'Pre-cut Lengde' i stedet for 'Cut Length',
+    og 2 % av bjelkene mangler lengde.
+    """
+    rng = random.Random(seed)
+    doc, view = new_document()
+    category = doc.category(BIC.OST_StructuralFraming)
+    levels = [doc.add(_db.Level(doc, u"Etasje {:02d}".format(k + 1), elevation=k * 10.0)) for k in range(n_levels)]
+    materials = [doc.add(_db.Element(doc, name)) for name in (u"Stål S355", u"Limtre GL30c", u"Betong B35")]
+    types = []
+    for k in range(n_types):
+        symbol = doc.add(_db.FamilySymbol(doc, u"HEB {:03d}".format(100 + 20 * k), category=category))
+        types.append(symbol)
+    for i in range(n_elements):
+        k = rng.randrange(n_types)
+        beam = _db.FamilyInstance(doc, types[k].Name, category=category, type_id=types[k].Id)
+        length = None if rng.random() < 0.02 else round(rng.uniform(1.0, 12.0), 1) / 0.3048
+        name = u"Pre-cut Lengde" if k % 2 else u"Cut Length"
+        beam.add_parameter(name, StorageType.Double, length, bip=BIP.STRUCTURAL_FRAME_CUT_LENGTH)
+        beam.add_parameter(u"Mark", StorageType.String, None, bip=BIP.ALL_MODEL_MARK)
+        beam.add_parameter(u"Structural Material", StorageType.ElementId, rng.choice(materials).Id,
+                           bip=BIP.STRUCTURAL_MATERIAL_PARAM)
+        beam.add_parameter(u"Reference Level", StorageType.ElementId, rng.choice(levels).Id,
+                           bip=BIP.INSTANCE_REFERENCE_LEVEL_PARAM)
+        doc.add(beam)
+    return _done(doc, view)
+
+
+#------------------------------------- FILLED REGIONS -------------------------------------#
+
+_COMMENTS = (u"MUA 1", u"MUA 2", u"MUA 3", u"Uteareal", u"demo", u"")
+
+
+def filled_region_view(n_elements, seed=1, scale=200, n_types=12, params_share=0.9):
+    """Filled regions med Comments, Areal og Omkrets (SetMUA-oppsett).
+
+    Hver region har 1-3 rektangulære løkker. HOST_AREA_COMPUTED er skrivebeskyttet
+    og står i interne enheter (fot²), som i Revit. Areal/Omkrets finnes på
+    params_share av typene (alle regioner av en type har de samme parametrene).
+    """
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    types, with_params = _filled_region_types(doc, n_types, params_share)
+    _add_filled_regions(doc, view, n_elements, rng, types, with_params)
+    return _done(doc, view)
+
+
+def mua_project(n_elements, seed=1, scale=100, n_levels=12, views_per_level=3, n_types=12, params_share=0.9):
+    """SetMUA i prosjektmodus: n_levels etasjar med views_per_level plan-views kvar,
+    eitt teikningsview og eitt snitt (skal hoppast over). n_elements regionar totalt."""
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    types, with_params = _filled_region_types(doc, n_types, params_share)
+    views_category = doc.category(BIC.OST_Views)
+
+    views = []
+    for i in range(n_levels):
+        level = doc.add(_db.Level(doc, u"{:02d} etasje".format(i + 1), elevation=i * 10.0))
+        for k in range(views_per_level):
+            plan = view if not views else doc.add(_db.ViewPlan(
+                doc, u"{:02d} etasje - MUA {}".format(i + 1, k + 1), _db.ViewType.FloorPlan, scale,
+                category=views_category))
+            plan.GenLevel = level
+            views.append(plan)
+    views.append(doc.add(_db.ViewDrafting(doc, u"MUA utomhus", _db.ViewType.DraftingView, scale,
+                                          category=views_category)))
+    section = doc.add(_db.View(doc, u"Snitt A", _db.ViewType.Section, scale, category=views_category))
+
+    per_view = max(1, n_elements // len(views))
+    for v in views:
+        _add_filled_regions(doc, v, per_view, rng, types, with_params)
+    _add_filled_regions(doc, section, per_view, rng, types, with_params)
+    return _done(doc, view)
+
+
+def seksjon_view(n_elements, seed=1, scale=200, n_seksjoner=6, seksjon_share=0.6, colored_share=0.2):
+    """SetColorSeksjonering: filled regions der seksjon_share er av ein 'Seksjonering'-type
+    (med Seksjon), resten andre typar. colored_share av seksjoneringsregionane har alt
+    rett Color Override. Dokumentet har eit solid og eit skravert fyllmønster."""
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale)
+    category = doc.category(BIC.OST_DetailComponents)
+    doc.add(_db.FillPatternElement(doc, u"Diagonal up"))
+    doc.add(_db.FillPatternElement(doc, u"<Solid fill>", is_solid=True))
+
+    types = []
+    for name in (u"Seksjonering", u"Seksjonering stipla", u"Asfalt", u"Plen", u"MUA"):
+        fr_type = _db.FilledRegionType(doc, name, category=category)
+        fr_type.add_parameter(u"Type Name", StorageType.String, name, bip=BIP.SYMBOL_NAME_PARAM)
+        types.append(doc.add(fr_type))
+    seksjoner = [u"Seksjon {}".format(chr(ord("A") + i)) for i in range(n_seksjoner)]
+    colors = ["0,186,196,140", "0,249,226,127", "0,249,137,114", "0,168,206,226",
+              "0,237,160,79", "0,200,140,100", "0,200,200,200"]
+
+    for i in range(n_elements):
+        seksjonering = rng.random() < seksjon_share
+        fr_type = rng.choice(types[:2] if seksjonering else types[2:])
+        region = _db.FilledRegion(doc, fr_type.Name, category=category, type_id=fr_type.Id)
+        region._bbox = _bbox(rng.uniform(-2000, 2000), rng.uniform(-2000, 2000), 40, 40)
+        if seksjonering:
+            index = rng.randrange(n_seksjoner)
+            region.add_parameter(u"Seksjon", StorageType.String, seksjoner[index])
+            color = colors[index] if rng.random() < colored_share else u""
+            region.add_parameter(u"Color Override", StorageType.String, color)
+        doc.add(region, view)
+    return _done(doc, view)
+
+
+def _filled_region_types(doc, n_types, params_share):
+    category = doc.category(BIC.OST_DetailComponents)
+    types = []
+    with_params = set()
+    for i in range(n_types):
+        fr_type = _db.FilledRegionType(doc, u"MUA type {:02d}".format(i), category=category)
+        if (i + 1) <= round(params_share * n_types):
+            with_params.add(fr_type.Name)
+        fr_type.add_parameter(u"Description", StorageType.String, u"Type {:02d}".format(i),
+                              bip=BIP.ALL_MODEL_DESCRIPTION)
+        types.append(doc.add(fr_type))
+    return types, with_params
+
+
+def _add_filled_regions(doc, view, n_elements, rng, types, with_params):
+    category = doc.category(BIC.OST_DetailComponents)
+    for i in range(n_elements):
+        x, y = rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)
+        loops, area = [], 0.0
+        for k in range(rng.randint(1, 3)):
+            w, h = rng.uniform(1, 40), rng.uniform(1, 40)
+            loops.append(CurveLoop.rectangle(x + k * 50, y, w, h))
+            area += w * h
+        fr_type = rng.choice(types)
+        region = _db.FilledRegion(doc, fr_type.Name, loops=loops, category=category, type_id=fr_type.Id)
+        region._bbox = _bbox(x, y, 150, 40)
+        region.add_parameter(u"Comments", StorageType.String, rng.choice(_COMMENTS),
+                             bip=BIP.ALL_MODEL_INSTANCE_COMMENTS)
+        region.add_parameter(u"Area", StorageType.Double, area, bip=BIP.HOST_AREA_COMPUTED, read_only=True)
+        if fr_type.Name in with_params:
+            region.add_parameter(u"Areal", StorageType.Double, 0.0)
+            region.add_parameter(u"Omkrets", StorageType.Double, 0.0)
+        doc.add(region, view)
+
+
+#----------------------------------------- SITE -----------------------------------------#
+
+def site_view(n_elements, seed=1, scale=200, n_types=40, topo_share=0.05, n_filters=12):
+    """Situasjonsplan for Lag tegnforklaring.
+
+    Filled region-typer og toposolid-typer har 'View Filter'; viewet har
+    n_filters parameterfiltre der navnet matcher 'View Filter' på en type.
+    n_elements er antall filled regions + toposolids.
+    """
+    rng = random.Random(seed)
+    doc, view = new_document(scale=scale, view_name=u"Situasjonsplan")
+    view.CropBoxActive = True
+    view.CropBox = _bbox(-1000, -1000, 2000, 2000)
+
+    fr_category = doc.category(BIC.OST_DetailComponents)
+    topo_category = doc.category(BIC.OST_Toposolid)
+    filter_names = [u"Asfalt – vei {}".format(i) for i in range(n_types)]
+
+    fr_types = []
+    for i, name in enumerate(filter_names):
+        fr_type = _db.FilledRegionType(doc, u"Område {:02d}".format(i), category=fr_category)
+        fr_type.add_parameter(u"View Filter", StorageType.String, name if i % 5 else u"  " + name.upper())
+        fr_type.add_parameter(u"Description", StorageType.String, u"Beskrivelse {:02d}".format(i),
+                              bip=BIP.ALL_MODEL_DESCRIPTION)
+        fr_types.append(doc.add(fr_type))
+
+    topo_types = []
+    for i in range(max(1, n_types // 4)):
+        topo_type = _db.ElementType(doc, u"Topo {:02d}".format(i), category=topo_category)
+        topo_type.add_parameter(u"View Filter", StorageType.String, rng.choice(filter_names))
+        topo_types.append(doc.add(topo_type))
+
+    n_topo = int(n_elements * topo_share)
+    for i in range(n_elements - n_topo):
+        x, y = rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)
+        fr_type = rng.choice(fr_types)
+        region = _db.FilledRegion(doc, fr_type.Name, loops=[CurveLoop.rectangle(x, y, 10, 10)],
+                                  category=fr_category, type_id=fr_type.Id)
+        region._bbox = _bbox(x, y, 10, 10)
+        doc.add(region, view)
+
+    for i in range(n_topo):
+        x, y = rng.uniform(-1500, 1500), rng.uniform(-1500, 1500)
+        subs = []
+        for _ in range(rng.randint(0, 3)):
+            sub = _db.Toposolid(doc, u"Subdivision", category=topo_category,
+                                type_id=rng.choice(topo_types).Id)
+            sub._bbox = _bbox(x + 5, y + 5, 5, 5)
+            doc.add(sub, view)
+            subs.append(sub.Id)
+        topo = _db.Toposolid(doc, u"Toposolid", subdivision_ids=subs, category=topo_category,
+                             type_id=rng.choice(topo_types).Id)
+        topo._bbox = _bbox(x, y, 30, 30)
+        doc.add(topo, view)
+
+    for name in rng.sample(filter_names, min(n_filters, len(filter_names))):
+        pf = _db.ParameterFilterElement(doc, name, category_ids=[fr_category.Id],
+                                        element_filter=None)
+        doc.add(pf)
+        view._filters.append(pf.Id)
+    return _done(doc, view)
+
+
+#----------------------------------------- SHEETS -----------------------------------------#
+
+def sheet_document(n_elements, seed=1, n_sets=10):
+    """Ark med firmaets kodeparametre og noen sheet sets (ExportDWG)."""
+    rng = random.Random(seed)
+    doc, view = new_document()
+    category = doc.category(BIC.OST_Sheets)
+    sheets = []
+    for i in range(n_elements):
+        sheet = _db.ViewSheet(doc, u"Plan {}".format(i), number=u"A{:05d}".format(rng.randint(0, 99999)),
+                              category=category)
+        sheet.add_parameter(u"Kode Organisasjon", StorageType.String, u"MGA")
+        sheet.add_parameter(u"Kode Etasje/løpenummer", StorageType.String, u"{:02d}".format(i % 12))
+        sheet.add_parameter(u"Kode Disiplin", StorageType.String, rng.choice((u"ARK", u"LARK", u"RIB", None)))
+        sheet.add_parameter(u"Sheet Number", StorageType.String, sheet.SheetNumber, bip=BIP.SHEET_NUMBER)
+        sheets.append(doc.add(sheet))
+    for i in range(n_sets):
+        doc.add(_db.ViewSheetSet(doc, u"Sett {}".format(i), views=rng.sample(sheets, min(len(sheets), 20))))
+    return _done(doc, view)
@@ -0,0 +1,196 @@
+# encoding: utf-8
+"""
+Import-tid for lib og for hver knapp (kald start), målt med `python -X importtime`.
+
+Revit/pyRevit stubbes med fake_revit, så tallene viser kostnaden i vår egen kode
+og i tredjeparts-moduler (requests, csv, json ...), ikke Revit API-et.
+
+    python benchmarks/import_time.py                 # lib + alle knapper
+    python benchmarks/import_time.py --filter Dimension
+    python benchmarks/import_time.py --json import_time.json
+    python benchmarks/import_time.py --filter SetMUA --baseline HEAD~1
+
+Hver måling kjøres i en ny prosess (--repeat ganger), og median brukes.
+Knappene importerer lib-modulene direkte (tools._export, muaUtils._mua ...),
+ikke pakken lib; kolonnen "lib" viser om lib likevel ble lastet. Med
+--baseline måles de samme knappene også mot MGA.extension fra en annen
+git-revisjon, så før/etter kan sammenlignes på knappens egen importsti.
+"""
+import argparse
+import compileall
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+TAB_DIR = os.path.join(ROOT, "MGA.extension", "MGA_tools.tab")
+LIB_DIR = os.path.join(TAB_DIR, "lib")
+
+_BOOTSTRAP = """
+import sys
+sys.path[:0] = [{here!r}, {lib!r}, {tab!r}]
+import fake_revit
+fake_revit.install()
+import Autodesk.Revit.DB, Autodesk.Revit.UI, pyrevit, pyrevit.framework   # fakes teller ikke med
+import time
+sys.stderr.write("--- body ---\\n")
+_t0 = time.perf_counter()
+{body}
+sys.stdout.write("WALL_US=%d\\n" % ((time.perf_counter() - _t0) * 1e6))
+sys.stdout.write("LIB=%d\\n" % ("lib" in sys.modules))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+_LIB_IMPORT = re.compile(r"^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w.]+))", re.M)
+
+
+def lib_packages():
+    """Mappene i lib som er pakker (tools, formsWindow, parameterUtils ...)."""
+    return sorted(name for name in os.listdir(LIB_DIR)
+                  if os.path.isfile(os.path.join(LIB_DIR, name, "__init__.py")))
+
+
+def button_imports(script_path, packages):
+    """lib-moduler som et knappe-skript importerer på toppnivå."""
+    with open(script_path, "rb") as f:
+        source = f.read().decode("utf-8", "replace")
+    modules = []
+    for match in _LIB_IMPORT.finditer(source):
+        module = match.group(1) or match.group(2)
+        if module.split(".")[0] in packages and module not in modules:
+            modules.append(module)
+    return modules
+
+
+def find_buttons(packages, name_filter=None):
+    """(knappenavn, [lib-moduler]) for alle script.py under MGA.extension."""
+    buttons = []
+    for dirpath, dirnames, filenames in os.walk(TAB_DIR):
+        dirnames.sort()
+        if dirpath.startswith(LIB_DIR) or "script.py" not in filenames:
+            continue
+        name = os.path.relpath(dirpath, TAB_DIR).replace(os.sep, "/")
+        if name_filter and name_filter.lower() not in name.lower():
+            continue
+        modules = button_imports(os.path.join(dirpath, "script.py"), packages)
+        if modules:
+            buttons.append((name, modules))
+    return buttons
+
+
+def _parse(stderr, packages):
+    """Summer self-tid (us) for egne moduler og finn største enkeltmoduler."""
+    own_us = 0
+    heaviest = []
+    # alt før markøren er bootstrap (fake_revit, time ...)
+    stderr = stderr.split("--- body ---", 1)[-1]
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        if module.split(".")[0] in packages or module == "lib" or module.startswith("lib."):
+            own_us += int(self_us)
+        heaviest.append((int(self_us), module))
+    heaviest.sort(reverse=True)
+    return own_us, [m for _, m in heaviest[:3]]
+
+
+def measure(body, packages, repeat=3, tab_dir=TAB_DIR):
+    """Kjør body i en ny prosess repeat ganger. Returnerer dict med median-tider i ms."""
+    code = _BOOTSTRAP.format(here=HERE, lib=os.path.join(tab_dir, "lib"), tab=tab_dir, body=body)
+    walls, owns, heaviest, error, lib_loaded = [], [], [], None, False
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              capture_output=True, text=True, cwd=ROOT)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "exit %d" % proc.returncode
+            break
+        wall = re.search(r"WALL_US=(\d+)", proc.stdout)
+        walls.append(int(wall.group(1)) if wall else 0)
+        lib_loaded = "LIB=1" in proc.stdout
+        own_us, heaviest = _parse(proc.stderr, packages)
+        owns.append(own_us)
+    if error:
+        return {"error": error}
+    return {"wall_ms": _median(walls) / 1000.0, "own_ms": _median(owns) / 1000.0,
+            "heaviest": heaviest, "lib_loaded": lib_loaded}
+
+
+def export_tab(revision, target):
+    """Pakk ut MGA.extension fra git-revisjonen til target. Returnerer tab-mappa."""
+    archive = subprocess.run(["git", "archive", revision, "MGA.extension"],
+                             capture_output=True, cwd=ROOT, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    tab_dir = os.path.join(target, "MGA.extension", "MGA_tools.tab")
+    # kompiler på forhånd, ellers måles kompilering mot arbeidstreets .pyc-filer
+    compileall.compile_dir(os.path.join(tab_dir, "lib"), quiet=1)
+    return tab_dir
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2.0
+
+
+def _run_cases(cases, packages, repeat, baseline_tab=None):
+    results = []
+    width = max(len(name) for name, _ in cases)
+    header = "{:<{w}}  {:>9}  {:>9}  {:>3}".format("case", "wall ms", "lib ms", "lib", w=width)
+    if baseline_tab:
+        header += "  {:>9}".format("base ms")
+    print(header + "  heaviest modules")
+    for name, body in cases:
+        result = measure(body, packages, repeat)
+        result["case"] = name
+        if baseline_tab:
+            result["baseline"] = measure(body, packages, repeat, baseline_tab)
+        results.append(result)
+        if "error" in result:
+            print("{:<{w}}  ERROR: {}".format(name, result["error"], w=width))
+            continue
+        line = "{:<{w}}  {:>9.2f}  {:>9.2f}  {:>3}".format(
+            name, result["wall_ms"], result["own_ms"], "ja" if result["lib_loaded"] else "nei", w=width)
+        if baseline_tab:
+            base = result["baseline"]
+            line += "  {:>9}".format("ERROR" if "error" in base else "%.2f" % base["wall_ms"])
+        print(line + "  " + ", ".join(result["heaviest"]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", help="Bare knapper der stien inneholder teksten")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Skriv resultatene til denne fila")
+    parser.add_argument("--baseline", help="Git-revisjon å sammenligne knappene med (f.eks. HEAD~1)")
+    args = parser.parse_args(argv)
+
+    packages = lib_packages()
+    cases = [("lib (import only)", "import lib"),
+             ("lib (all names)", "import lib\nfor _n in lib.__all__: getattr(lib, _n)")]
+    for name, modules in find_buttons(packages, args.filter):
+        cases.append((name, "\n".join("import " + m for m in modules)))
+
+    baseline_dir = tempfile.mkdtemp(prefix="mga_baseline_") if args.baseline else None
+    try:
+        baseline_tab = export_tab(args.baseline, baseline_dir) if args.baseline else None
+        results = _run_cases(cases, packages, args.repeat, baseline_tab)
+    finally:
+        if baseline_dir:
+            shutil.rmtree(baseline_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,441 @@
+# encoding: utf-8
+"""
+Skalerings-benchmarks for knappene, kjørt mot fake_revit (uten Revit).
+
+    python benchmarks/run_benchmarks.py                         # 1k og 10k
+    python benchmarks/run_benchmarks.py --sizes 1000,100000 --only dimension
+    python benchmarks/run_benchmarks.py --json results.json --compare baseline.json
+
+Hvert skript lastes som modul (ikke '__main__', så main() kjøres ikke ved import)
+etter at et syntetisk dokument er gjort aktivt. Tid per steg måles ved å pakke
+inn skriptets egne funksjoner (kumulativ tid, som cProfile 'cumtime'), og
+doc.counters viser antall transaksjoner, collectors, LookupParameter osv.
+"""
+import argparse
+import datetime
+import functools
+import importlib.util
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+TAB_DIR = os.path.join(ROOT, "MGA.extension", "MGA_tools.tab")
+LIB_DIR = os.path.join(TAB_DIR, "lib")
+
+for _path in (LIB_DIR, TAB_DIR, HERE):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import fake_revit  # noqa: E402
+from fake_revit import _db, documents  # noqa: E402
+
+fake_revit.install()
+
+_now = time.perf_counter
+
+SCRIPTS = {
+    "dimension": "Modify.panel/Tools.stack/Dimension.pulldown/Dimensionline_clean.pushbutton/script.py",
+    "reset_dimension": "Modify.panel/Tools.stack/Dimension.pulldown/Reset_dimmension.pushbutton/script.py",
+    "door_id": "Element ID.panel/Tools.stack/Mark.splitpushbutton/DoorID.pushbutton/script.py",
+    "window_id": "Element ID.panel/Tools.stack/Mark.splitpushbutton/WindowID.pushbutton/script.py",
+    "set_type_mark": "Element ID.panel/Tools.stack/Mark.splitpushbutton/SetTypeMark.pushbutton/script.py",
+    "structural_id": "Element ID.panel/Tools.stack/StructuralID.pushbutton/script.py",
+    "door_tags": "Modify.panel/Tools.stack/TagTools.splitpushbutton/MoveDoorTags.pushbutton/script.py",
+    "mua": "Calculate.panel/SetMUA.pushbutton/script.py",
+    "legend": "Site.panel/Lag tegnforklaring.pushbutton/script.py",
+    "seksjon_color": "Site.panel/SetColorSeksjonering.pushbutton/script.py",
+    "export_dwg": "Export.panel/ExportDWG.pushbutton/script.py",
+}
+
+
+#  _____ _     _      ____  _____  _  ____  _      ____
+# /    // \ /\/ \  /|/   _\/__ __\/ \/  _ \/ \  /|/ ___\
+# |  __\| | ||| |\ |||  /    / \  | || / \|| |\ |||    \
+# | |   | \_/|| | \|||  \__  | |  | || \_/|| | \||\___ |
+# \_/   \____/\_/  \|\____/  \_/  \_/\____/\_/  \|\____/ FUNCTIONS
+#===========================================================================================================#
+
+def load_script(key, doc, view, **activate_kwargs):
+    """Aktiver doc/view og last knappe-skriptet som en vanlig modul."""
+    fake_revit.activate(doc, view, **activate_kwargs)
+    path = os.path.join(TAB_DIR, *SCRIPTS[key].split("/"))
+    spec = importlib.util.spec_from_file_location("bench_" + key, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StageTimer(object):
+    """Samler kumulativ tid og antall kall per steg."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.calls = {}
+        self.total = 0.0    # sum av stage()-steg, uten import og dokumentbygging
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def stage(self, name, func, *args, **kwargs):
+        t0 = _now()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = _now() - t0
+            self.add(name, seconds)
+            if name != "import":
+                self.total += seconds
+
+    def wrap(self, module, names):
+        """Bytt ut module.<name> med en tidtaker-versjon (kall går via modulens globals)."""
+        for name in names:
+            setattr(module, name, self._timed(name, getattr(module, name)))
+
+    def _timed(self, name, func):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            t0 = _now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, _now() - t0)
+        return timed
+
+    def as_dict(self):
+        return dict((k, {"seconds": round(v, 6), "calls": self.calls[k]})
+                    for k, v in sorted(self.seconds.items()))
+
+
+def _format_number_py(value, decimals):
+    """float.ToString("F<n>", CultureInfo) finnes bare i .NET."""
+    if decimals is None:
+        return str(int(round(float(value))))
+    return u"{:.{}f}".format(float(value), int(decimals))
+
+
+#-------------------------------------- BENCHMARKS --------------------------------------#
+
+def bench_dimension(size, timer):
+    doc, view = documents.dimension_view(size)
+    module = timer.stage("import", load_script, "dimension", doc, view)
+    module._format_number = _format_number_py
+    timer.wrap(module, ("get_element", "get_dim_units", "build_text_items", "plan_multiseg_moves",
+                        "get_stable_p_line_for_seg", "is_single_dim_manually_moved",
+                        "collect_overlap_items", "resolve_overlaps", "move_text"))
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    return doc
+
+
+def bench_dimension_project(size, timer):
+    """Shift-click-modus: alle views på ark (20 views), éin TransactionGroup."""
+    doc, view = documents.dimension_project(size)
+    module = timer.stage("import", load_script, "dimension", doc, view)
+    module._format_number = _format_number_py
+    timer.wrap(module, ("get_view_dimensions", "plan_view", "apply_view"))
+    from tools._views import views_on_sheets
+    views = timer.stage("views_on_sheets", views_on_sheets, doc)
+    doc.reset_counters()
+    timer.stage("main", module.main, views)
+    return doc
+
+
+def bench_dimension_rerun(size, timer):
+    """Andre køyring etter at 1 % av mållinjene er endra (fingeravtrykk i sidecar)."""
+    doc, view = documents.dimension_view(size)
+    module = timer.stage("import", load_script, "dimension", doc, view)
+    module._format_number = _format_number_py
+    timer.stage("first_run", module.main)
+    timer.seconds.pop("first_run")
+    timer.total = 0.0
+
+    dims = module.get_view_dimensions(doc, view)
+    edited = random.Random(2).sample(list(dims), max(1, len(dims) // 100))
+    tx = _db.Transaction(doc, "Edit")
+    tx.Start()
+    for dim in edited:
+        for seg in list(dim.Segments) or [dim]:
+            seg.ResetTextPosition()
+    tx.Commit()
+
+    timer.wrap(module, ("plan_view", "apply_view", "dimension_fingerprint"))
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    return doc
+
+
+def bench_reset_dimension(size, timer):
+    doc, view = documents.dimension_view(size)
+    module = timer.stage("import", load_script, "reset_dimension", doc, view)
+    timer.wrap(module, ("get_element", "plan_resets"))
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    return doc
+
+
+def bench_door_tags(size, timer):
+    doc, view = documents.tag_view(size, host=u"door")
+    module = timer.stage("import", load_script, "door_tags", doc, view)
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    return doc
+
+
+def bench_tag_layout(size, timer):
+    """Plassering av nye dør-tags med TagLayout (som add_tags i TagDoors), uten Create."""
+    from tagUtils._spatial_grid import TagLayout
+    doc, view = documents.tag_view(size, host=u"door", untagged_share=1.0)
+    doors = list(_db.FilteredElementCollector(doc, view.Id).OfCategory(_db.BuiltInCategory.OST_Doors))
+    doc.reset_counters()
+    layout = timer.stage("collect", TagLayout, doc, view)
+
+    def place():
+        for door in doors:
+            layout.place(door.Location.Point.Add(door.FacingOrientation.Multiply(1.2)), exclude=door.Id)
+
+    timer.stage("place", place)
+    doc.count("overlapping_tags", layout.overlapping)
+    return doc
+
+
+def bench_batch_tagger(size, timer):
+    """TagDoors: tag alle dører i alle views for etasjen (BatchTagger), éin transaksjon."""
+    from tagUtils._batch_tagger import BatchTagger
+    doc, views, doors, tag_type = documents.level_project(size)
+    tagger = BatchTagger(doc, views)
+
+    def queue():
+        for door in doors:
+            tagger.add(door, tag_type, door.FacingOrientation)
+
+    timer.stage("queue", queue)
+    timer.stage("create", tagger.create)
+    for key in ("already_tagged", "created", "failed"):
+        doc.count(key, tagger.report[key])
+    return doc
+
+
+def bench_type_marks(size, timer):
+    """DoorID og WindowID (size = antall typer): bare nye typer får merke."""
+    doc, view = documents.type_mark_project(size)
+    for key in ("door_id", "window_id"):
+        module = timer.stage("import_" + key, load_script, key, doc, view)
+        if key == "door_id":
+            doc.reset_counters()
+        timer.stage(key, module.main)
+    return doc
+
+
+def bench_set_type_mark(size, timer):
+    """SetTypeMark: dører og vinduer i éin collector og éin transaksjon."""
+    doc, view = documents.type_mark_project(size)
+    module = timer.stage("import", load_script, "set_type_mark", doc, view)
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    return doc
+
+
+def bench_structural_id(size, timer):
+    """StructuralID: første nummerering og en ny kjøring uten endringer."""
+    doc, view = documents.framing_project(size)
+    module = timer.stage("import", load_script, "structural_id", doc, view)
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    timer.stage("rerun", module.main)
+    return doc
+
+
+def bench_mua(size, timer):
+    doc, view = documents.filled_region_view(size)
+    report = os.path.join(tempfile.mkdtemp(prefix="mga_bench_"), "MUA.xlsx")
+    module = timer.stage("import", load_script, "mua", doc, view,
+                         answers={"ask_for_string": u"Alle", "save_file": report})
+    doc.reset_counters()
+    timer.stage("main", module.main)
+    timer.stage("rerun", module.main)
+    return doc
+
+
+def bench_mua_project(size, timer):
+    """Shift-klikk-modus: 12 etasjar x 3 plan-views + eitt teikningsview, éi TransactionGroup."""
+    doc, view = documents.mua_project(size)
+    report = os.path.join(tempfile.mkdtemp(prefix="mga_bench_"), "MUA.xlsx")
+    module = timer.stage("import", load_script, "mua", doc, view,
+                         answers={"ask_for_string": u"Alle", "save_file": report})
+    doc.reset_counters()
+    timer.stage("main", module.main, True)
+    timer.stage("rerun", module.main, True)
+    return doc
+
+
+def bench_seksjon_color(size, timer):
+    """SetColorSeksjonering utan dialogen: alle seksjonar valde."""
+    doc, view = documents.seksjon_view(size)
+    module = timer.stage("import", load_script, "seksjon_color", doc, view)
+    doc.reset_counters()
+    from parameterUtils._bulk_writer import ParameterHandleCache
+    handles = ParameterHandleCache()
+    regions = (_db.FilteredElementCollector(doc, view.Id).OfClass(_db.FilledRegion)
+               .WhereElementIsNotElementType().ToElements())
+    classified = timer.stage("classify", module.classify, regions, handles)
+    seksjoner = sorted(set(seksjon for fr, seksjon in classified))
+    planned = timer.stage("plan_colors", module.plan_colors, classified,
+                          dict(zip(seksjoner, module.colors)), handles)
+    timer.stage("apply_colors", module.apply_colors, planned, view, module.get_solid_fill_pattern_id(doc))
+    return doc
+
+
+def bench_legend(size, timer):
+    """Planleggingen i Lag tegnforklaring (steg 1-5 i main), uten tegning."""
+    doc, view = documents.site_view(size)
+    module = timer.stage("import", load_script, "legend", doc, view)
+    timer.wrap(module, ("key", "view_in_crop_2d"))
+    doc.reset_counters()
+
+    crop_on, crop_bb = bool(view.CropBoxActive), view.CropBox
+    enabled = [fid for fid in view.GetFilters() if module._is_filter_enabled(view, fid)]
+    hits = timer.stage("effective_filters", module.get_effective_filters, doc, enabled, view)
+    vf_to_frt = timer.stage("vf_to_frt_map", module.build_vf_to_frt_map, doc)
+    type_ids = timer.stage("fr_types_in_view", module.collect_fr_type_ids_in_view, view, crop_on, crop_bb)
+    topo_keys = timer.stage("topo_keys", module.collect_topo_vf_keys, view, crop_on, crop_bb)
+    for k in [module.key(n) for n in hits] + list(topo_keys):
+        for frt in vf_to_frt.get(k, ()):
+            type_ids.add(frt.Id)
+    matched = [doc.GetElement(tid) for tid in type_ids]
+    timer.stage("sort_types", sorted, matched, key=module._description_type_param)
+    return doc
+
+
+def bench_export_dwg(size, timer):
+    """Filnavn-planlegging i ExportDWG: hent ark, sorter og lag basisnavn."""
+    doc, view = documents.sheet_document(size)
+    module = timer.stage("import", load_script, "export_dwg", doc, view)
+    window = module.DwgExportWindow.__new__(module.DwgExportWindow)
+    doc.reset_counters()
+
+    def collect():
+        sheets = (module.FilteredElementCollector(doc)
+                  .OfCategory(module.BuiltInCategory.OST_Sheets)
+                  .WhereElementIsNotElementType()
+                  .ToElements())
+        return sorted(sheets, key=lambda s: (s.SheetNumber, s.Name))
+
+    sheets = timer.stage("collect_sheets", collect)
+    timer.stage("basenames", lambda: [window._sheet_basename(s) for s in sheets])
+    return doc
+
+
+BENCHMARKS = [
+    ("dimension", bench_dimension),
+    ("dimension_project", bench_dimension_project),
+    ("dimension_rerun", bench_dimension_rerun),
+    ("reset_dimension", bench_reset_dimension),
+    ("door_tags", bench_door_tags),
+    ("tag_layout", bench_tag_layout),
+    ("batch_tagger", bench_batch_tagger),
+    ("type_marks", bench_type_marks),
+    ("set_type_mark", bench_set_type_mark),
+    ("structural_id", bench_structural_id),
+    ("mua", bench_mua),
+    ("mua_project", bench_mua_project),
+    ("seksjon_color", bench_seksjon_color),
+    ("legend", bench_legend),
+    ("export_dwg", bench_export_dwg),
+]
+
+
+def run(name, func, size):
+    timer = StageTimer()
+    # Eiga TEMP-mappe per køyring: logg, sidecar og cache frå tidlegare køyringar skal ikkje påverke
+    temp = tempfile.mkdtemp(prefix="mga_bench_")
+    old_temp = os.environ.get("TEMP")
+    os.environ["TEMP"] = temp
+    try:
+        doc = func(size, timer)
+    finally:
+        if old_temp is None:
+            os.environ.pop("TEMP", None)
+        else:
+            os.environ["TEMP"] = old_temp
+        shutil.rmtree(temp, ignore_errors=True)
+    return {
+        "benchmark": name,
+        "size": size,
+        "seconds": round(timer.total, 6),
+        "stages": timer.as_dict(),
+        "counters": dict(sorted(doc.counters.items())),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Skriv ut endring mot en tidligere JSON-fil. Returnerer antall regresjoner."""
+    with open(baseline_path) as f:
+        baseline = dict(((r["benchmark"], r["size"]), r) for r in json.load(f)["results"])
+    regressions = 0
+    print("\n{:<12} {:>8} {:>10} {:>10} {:>8}".format("benchmark", "size", "base s", "now s", "ratio"))
+    for result in results:
+        old = baseline.get((result["benchmark"], result["size"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        regressions += bool(flag)
+        print("{:<12} {:>8} {:>10.3f} {:>10.3f} {:>8.2f}{}".format(
+            result["benchmark"], result["size"], old["seconds"], result["seconds"], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MGA-knappene mot fake_revit.")
+    parser.add_argument("--sizes", default="1000,10000", help="Kommaseparerte dokumentstørrelser")
+    parser.add_argument("--only", help="Bare benchmarks der navnet inneholder teksten")
+    parser.add_argument("--json", help="Skriv resultatene til denne fila")
+    parser.add_argument("--compare", help="Sammenlign med en tidligere --json fil")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Ratio mot baseline som regnes som regresjon (default 1.25)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = []
+    print("{:<12} {:>8} {:>10}  {}".format("benchmark", "size", "seconds", "counters"))
+    for name, func in BENCHMARKS:
+        if args.only and args.only not in name:
+            continue
+        for size in sizes:
+            result = run(name, func, size)
+            results.append(result)
+            counters = ", ".join("{}={}".format(k, v) for k, v in result["counters"].items()
+                                 if k in ("transactions", "rollbacks", "collectors", "lookup_parameter",
+                                          "parameter_sets", "move_element"))
+            print("{:<12} {:>8} {:>10.3f}  {}".format(name, size, result["seconds"], counters))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0],
+                       "commit": _git_commit(),
+                       "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "results": results}, f, indent=2)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# encoding: utf-8
+"""
+DimFrame/DimFrames i dimensionUtils._frame mot fake_revit: mm-faktor, along/up og batch-projeksjon.
+
+    python -m pytest benchmarks
+"""
+import math
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(HERE), "MGA.extension", "MGA_tools.tab", "lib")
+for _path in (LIB_DIR, HERE):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import fake_revit  # noqa: E402
+fake_revit.install()
+
+import pytest  # noqa: E402
+from fake_revit import _db, documents  # noqa: E402
+from dimensionUtils._frame import MM_PER_FOOT, DimFrame, DimFrames, feet_to_mm, mm_to_feet  # noqa: E402
+
+XYZ = _db.XYZ
+ANGLE = math.radians(30.0)
+
+
+def _rotated_dimension(n_segments=4):
+    """Mållinje 30 grader på X-aksen, med origo i (10, 5, 0) ft."""
+    doc, view = documents.new_document()
+    along = XYZ(math.cos(ANGLE), math.sin(ANGLE), 0.0)
+    origin = XYZ(10.0, 5.0, 0.0)
+    dim = doc.add(_db.Dimension(doc, u"", curve=_db.Line.CreateUnbound(origin, along),
+                                category=doc.category(_db.BuiltInCategory.OST_Dimensions)), view)
+    up = view.ViewDirection.CrossProduct(along)
+    for i in range(n_segments):
+        mid = origin + along * (2.0 * i + 1.0)
+        dim.add_segment(mid, 2.0, mid + up * (0.1 * i), mid)
+    return dim, view, origin, along, up
+
+
+def test_feet_to_mm_factor():
+    assert MM_PER_FOOT == 304.8
+    assert feet_to_mm(1.0) == pytest.approx(304.8)
+    assert mm_to_feet(304.8) == pytest.approx(1.0)
+
+
+def test_along_and_up_for_rotated_dimension():
+    dim, view, origin, along, up = _rotated_dimension()
+    frame = DimFrame.from_dimension(dim, view)
+
+    # up = view direction x along, i planet og vinkelrett på lina
+    assert frame.up == pytest.approx((-math.sin(ANGLE), math.cos(ANGLE), 0.0))
+
+    p = origin + along * 2.0 + up * 0.5
+    x_mm, u_mm = frame.project(p)
+    assert x_mm == pytest.approx(2.0 * MM_PER_FOOT)
+    assert u_mm == pytest.approx(0.5 * MM_PER_FOOT)
+    assert frame.along_mm(p) == pytest.approx(x_mm)
+    assert frame.up_mm(p) == pytest.approx(u_mm)
+
+
+def test_project_many_matches_project():
+    dim, view, origin, along, up = _rotated_dimension(6)
+    frame = DimFrames(view).get(dim)
+    points = [seg.TextPosition for seg in dim.Segments] + [None]
+
+    batched = frame.project_many(points)
+    assert batched[-1] is None
+    for p, xu in zip(points[:-1], batched[:-1]):
+        assert xu == pytest.approx(frame.project(p))
+    # tuplar og XYZ gir same svar
+    from_tuples = frame.project_many([(p.X, p.Y, p.Z) for p in points[:-1]])
+    for xu_tuple, xu in zip(from_tuples, batched):
+        assert xu_tuple == pytest.approx(xu)
+
+
+def test_frames_are_cached_per_dimension():
+    dim, view, origin, along, up = _rotated_dimension()
+    frames = DimFrames(view)
+    assert frames.get(dim) is frames.get(dim)
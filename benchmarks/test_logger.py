@@ -0,0 +1,50 @@
+# encoding: utf-8
+"""
+ScriptLogger: JSON-lines med og utan kø, og at close() slepp loggaren.
+
+    python -m pytest benchmarks
+"""
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(HERE), "MGA.extension", "MGA_tools.tab", "lib")
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+import pytest  # noqa: E402
+from tools import _logger  # noqa: E402
+from tools._logger import ScriptLogger  # noqa: E402
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_json_lines_file_is_json(tmp_path, queued):
+    path = str(tmp_path / "run.jsonl")
+    logger = ScriptLogger(name="test_json_{}".format(queued), log_to_file=True, log_file_path=path,
+                          queued=queued, json_lines=True)
+    logger.count("transactions", 2)
+    logger.info("hei", data={"n": 1})
+    logger.emit_summary()
+    logger.close()
+    for handler in list(logger.logger.handlers):     # synkron modus: lukk fila før lesing
+        handler.close()
+        logger.logger.removeHandler(handler)
+
+    lines = _lines(path)
+    assert lines[0]["message"] == "hei" and lines[0]["data"] == {"n": 1}
+    assert lines[-1]["data"]["counters"] == {"transactions": 2}
+
+
+def test_close_releases_queued_logger(tmp_path):
+    logger = ScriptLogger(name="test_close", log_to_file=True, log_file_path=str(tmp_path / "run.log"),
+                          queued=True)
+    assert logger in _logger._open_loggers
+    logger.close()
+    assert logger not in _logger._open_loggers
+    assert len(_logger._atexit_registered) == 1
@@ -0,0 +1,104 @@
+# encoding: utf-8
+"""
+OverlapLayout og nivå-tildelinga i dimensionUtils._overlap (rein Python, ingen Revit).
+
+    python -m pytest benchmarks
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(HERE), "MGA.extension", "MGA_tools.tab", "lib")
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from dimensionUtils._overlap import OverlapLayout, assign_levels, assign_levels_banded  # noqa: E402
+
+ROW = (1.0, 0.0, 0.0)
+
+
+def test_disjoint_spans_stay_on_level_0():
+    layout = OverlapLayout()
+    for i in range(5):
+        layout.add(i, ROW, i * 10.0, i * 10.0 + 8.0)
+    assert layout.solve() == dict((i, 0) for i in range(5))
+    assert layout.moved == 0
+
+
+def test_touching_spans_do_not_overlap():
+    assert assign_levels([(0.0, 10.0), (10.0, 20.0)]) == [0, 0]
+
+
+def test_overlapping_spans_on_same_band_stack():
+    layout = OverlapLayout()
+    for i in range(3):
+        layout.add(i, ROW, 0.0 + i, 10.0 + i, 0.0, 5.0)
+    assert sorted(layout.solve().values()) == [0, 1, 2]
+
+
+def test_overlapping_spans_on_disjoint_bands_share_a_level():
+    layout = OverlapLayout()
+    layout.add("a", ROW, 0.0, 10.0, 0.0, 5.0)
+    layout.add("b", ROW, 2.0, 12.0, 100.0, 105.0)
+    layout.add("c", ROW, 4.0, 14.0, 200.0, 205.0)
+    assert layout.solve() == {"a": 0, "b": 0, "c": 0}
+
+
+def test_rows_are_laid_out_separately():
+    layout = OverlapLayout()
+    layout.add("a", ROW, 0.0, 10.0)
+    layout.add("b", (0.0, 1.0, 0.0), 0.0, 10.0)
+    assert layout.solve() == {"a": 0, "b": 0}
+
+
+def test_moved_counts_labels_above_level_0():
+    layout = OverlapLayout()
+    for i in range(4):
+        layout.add(i, ROW, 0.0, 10.0)           # fire oppå kvarandre
+    layout.add("alone", ROW, 50.0, 60.0)
+    levels = layout.solve()
+    assert layout.moved == 3
+    assert layout.moved == sum(1 for lvl in levels.values() if lvl > 0)
+
+
+def test_fixed_text_keeps_its_place_and_pushes():
+    layout = OverlapLayout()
+    layout.add_fixed(ROW, 0.0, 10.0, 0.0, 5.0)          # tekst som ikkje skal flyttast
+    layout.add("moved", ROW, 5.0, 15.0, 0.0, 5.0)
+    layout.add("free", ROW, 20.0, 30.0, 0.0, 5.0)
+    layout.add("other band", ROW, 5.0, 15.0, 50.0, 55.0)
+    assert layout.solve() == {"moved": 1, "free": 0, "other band": 0}
+    assert len(layout) == 3
+
+
+def test_fixed_text_that_starts_later_still_blocks():
+    # sweepen ser den flytta teksten før hinderet; hinderet må likevel reknast med
+    levels = assign_levels([(0.0, 20.0)], fixed=[(15.0, 30.0, 0), (0.0, 5.0, 1)])
+    assert levels == [2]
+
+
+def test_banded_matches_plain_sweep_on_one_band():
+    spans = [((i * 7) % 50 * 1.0, (i * 7) % 50 + 12.0) for i in range(200)]
+    assert assign_levels_banded(spans, [(0.0, 3.0)] * len(spans)) == assign_levels(spans)
+
+
+def test_scaling_many_parallel_strings():
+    # 20 000 tekstar som alle overlappar langs lina, på kvar sitt band (lange fasadar)
+    n = 20000
+    spans = [(i * 0.1, i * 0.1 + 1000.0) for i in range(n)]
+    bands = [(i * 10.0, i * 10.0 + 5.0) for i in range(n)]
+    t0 = time.time()
+    levels = assign_levels_banded(spans, bands)
+    elapsed = time.time() - t0
+    assert levels == [0] * n
+    assert elapsed < 2.0, "assign_levels_banded tok {:.2f} s for {} tekstar".format(elapsed, n)
+
+
+def test_scaling_one_band():
+    n = 20000
+    spans = [(i * 0.1, i * 0.1 + 1000.0) for i in range(n)]
+    t0 = time.time()
+    levels = assign_levels_banded(spans, [(0.0, 5.0)] * n)
+    assert max(levels) == 9999
+    assert time.time() - t0 < 2.0
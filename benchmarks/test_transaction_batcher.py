@@ -0,0 +1,124 @@
+# encoding: utf-8
+"""
+TransactionBatcher mot fake_revit: tal på transaksjonar, tilbakerulling og rapportar.
+
+    python -m pytest benchmarks
+"""
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(os.path.dirname(HERE), "MGA.extension", "MGA_tools.tab", "lib")
+for _path in (LIB_DIR, HERE):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import fake_revit  # noqa: E402
+fake_revit.install()
+
+import pytest  # noqa: E402
+from fake_revit import _db, documents  # noqa: E402
+from tools._transactions import TransactionBatcher  # noqa: E402
+
+
+def _walls(n):
+    doc, view = documents.new_document()
+    category = doc.category(_db.BuiltInCategory.OST_Walls)
+    walls = []
+    for i in range(n):
+        wall = _db.Element(doc, u"Wall {}".format(i), category=category)
+        wall.add_parameter(u"Comments", _db.StorageType.String, u"")
+        walls.append(doc.add(wall))
+    doc.reset_counters()
+    return doc, walls
+
+
+class _FalseParameter(object):
+    """Parameter der Set() returnerer False (som Revit for ugyldige verdiar)."""
+    IsReadOnly = False
+
+    class Definition(object):
+        Name = u"Broken"
+
+    def Set(self, value):
+        return False
+
+
+def test_one_transaction_per_chunk_in_one_group():
+    doc, walls = _walls(1200)
+    with TransactionBatcher(doc, "Comments", chunk_size=500) as batch:
+        for wall in walls:
+            batch.add((wall, u"Comments", u"x"))
+
+    assert doc.counters["transaction_groups"] == 1
+    assert doc.counters["transactions"] == 3
+    assert doc.counters["commits"] == 3
+    assert doc.counters.get("rollbacks", 0) == 0
+    assert batch.applied == 1200
+    assert [r["edits"] for r in batch.chunk_reports] == [500, 500, 200]
+
+
+def test_chunk_size_none_is_one_transaction():
+    doc, walls = _walls(300)
+    with TransactionBatcher(doc, "Comments", chunk_size=None) as batch:
+        batch.extend((wall, u"Comments", u"x") for wall in walls)
+
+    assert doc.counters["transactions"] == 1
+    assert len(batch.chunk_reports) == 1
+
+
+def test_counters_are_per_flush():
+    doc, walls = _walls(10)
+    batch = TransactionBatcher(doc, "Comments", chunk_size=4)
+    batch.extend((wall, u"Comments", u"a") for wall in walls)
+    batch.flush()
+    batch.extend((wall, u"Comments", u"b") for wall in walls[:3])
+    batch.flush()
+
+    assert batch.applied == 3
+    assert len(batch.chunk_reports) == 1
+    assert "3 edits in 1 chunk(s)" in batch.summary()
+
+
+def test_failed_chunk_rolls_back_group_and_clears_counts():
+    doc, walls = _walls(10)
+
+    def boom():
+        raise RuntimeError("commit kan ikkje gjerast")
+
+    batch = TransactionBatcher(doc, "Comments", chunk_size=4)
+    batch.extend((wall, u"Comments", u"x") for wall in walls)
+    # Feil utanfor sjølve redigeringa (som Commit) rullar tilbake heile gruppa
+    batch._transaction_cls = _failing_on_chunk(3, boom)
+    with pytest.raises(RuntimeError):
+        batch.flush()
+
+    assert all(wall.LookupParameter(u"Comments").AsString() == u"" for wall in walls)
+    assert batch.applied == 0
+    assert batch.chunk_reports == []
+    assert batch.failed == []
+
+
+def test_set_returning_false_is_a_failure():
+    doc, walls = _walls(2)
+    with TransactionBatcher(doc, "Comments", chunk_size=None) as batch:
+        batch.add((walls[0], u"Comments", u"x"))
+        batch.add((walls[1], _FalseParameter(), u"x"))
+
+    assert batch.applied == 1
+    assert len(batch.failed) == 1
+
+
+def _failing_on_chunk(number, action):
+    """Transaction-klasse der Commit i chunk nummer 'number' feilar."""
+    calls = [0]
+
+    class FailingTransaction(_db.Transaction):
+
+        def Commit(self):
+            calls[0] += 1
+            if calls[0] == number:
+                action()
+            return _db.Transaction.Commit(self)
+
+    return FailingTransaction